@@ -10,19 +10,24 @@ It implements a scalable, canonical parameter registry with:
 - SQLite storage with schema aligned to the ER model
 - Import/export JSON для одного определения параметра
 
-Single-file program, no third-party dependencies.
+No third-party dependencies. Storage and registry logic live in registry_core.py
+(usable without Tk, see registry_cli.py); this module is the Tkinter GUI on top of it.
 Press F1 anywhere to open built-in Help (Справка).
 """
 
 #
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, simpledialog
-import sqlite3
 import json
-import re
-import uuid
-from datetime import datetime
-from typing import Optional, Dict, Any, List, Tuple
+import queue
+import sqlite3
+import threading
+from typing import Optional, Dict, List
+
+from registry_core import (
+    PAGE_SIZE, Database, ParameterRegistry, SHORT_CODE_RE,
+    fetch_page, gen_uuid, param_from_json, param_to_json, safe_json_loads, slugify,
+)
 
 APP_NAME = "Parameter Registry Manager"
 APP_VERSION = "1.8.0"
@@ -41,6 +46,8 @@ HELP_TEXT = """
 
 3) Поиск и навигация (левая панель)
 - Поле “Поиск” ищет по long code, short code, labels, tags, quantityKind и методике.
+  Поиск пословный и по префиксу: “temp inl” найдёт “temperature.gas.inlet...”;
+  наиболее релевантные параметры (совпадение в long/short code) выводятся первыми.
 - Кнопки:
   • “Найти” — выполнить поиск. Нажатие Enter в поле Поиск также обновляет список.
   • “Сброс” — очистить фильтр.
@@ -136,710 +143,14 @@ HELP_TEXT = """
 13) Ограничения текущей версии
 - Нет конвертации единиц.
 - Валидация long code выполняет синтаксические и базовые семантические проверки.
-- Отсутствует параллельный доступ и синхронизация (SQLite для одиночного пользователя).
+- Один писатель: БД в режиме WAL, поэтому читатели (расчётные воркеры, CLI) работают
+  параллельно с GUI, но одновременная правка из нескольких окон не синхронизируется.
 - Нет сетевого API (REST/GraphQL) — только локальный GUI и локальная БД.
 
 Удачной работы!
 """.strip()
 
 
-# ------------------------- Helpers -------------------------
-
-def now_iso() -> str:
-    return datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
-
-
-def gen_uuid() -> str:
-    return str(uuid.uuid4())
-
-
-def safe_json_loads(s: Optional[str], default):
-    try:
-        if s is None:
-            return default
-        return json.loads(s)
-    except Exception:
-        return default
-
-
-def safe_json_dumps(obj) -> str:
-    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
-
-
-def slugify(s: str) -> str:
-    s = (s or "").strip().lower()
-    s = re.sub(r"\s+", "-", s)
-    s = re.sub(r"[^a-z0-9\-]", "-", s)
-    s = re.sub(r"-{2,}", "-", s).strip("-")
-    return s
-
-
-SHORT_CODE_RE = re.compile(r"^[A-Za-z][A-Za-z0-9_]{0,31}$")
-
-
-# ------------------------- Seed dictionaries (for initial DB fill) -------------------------
-
-SEED_QUANTITIES = {
-    "temperature", "pressure", "mass-flow", "density", "enthalpy",
-    "efficiency", "power", "speed", "volume",
-}
-
-SEED_MEDIUMS = {
-    "air", "gas", "water", "steam"
-}
-
-SEED_LOCATIONS = {
-    "inlet", "outlet", "ambient"
-    # plus node-*, section-*, station-*
-}
-
-SEED_COMPONENTS = {
-    "compressor", "turbine", "pipe", "valve",
-}
-
-SEED_STATES = {"static", "total", "wet", "dry"}
-SEED_STATISTICS = {"mean", "min", "max", "std", "instant", "integral"}
-
-SEED_METHODS = {"poly", "mapfit", "default"}
-
-SEED_DATA_TYPES = {"float64", "int64", "int32", "string", "bool"}
-SEED_SHAPES = {"scalar", "vector", "matrix", "timeseries"}
-
-SEED_QUANTITY_KINDS = {
-    "thermodynamic parameter", "geometry",
-    "thermodynamic-temperature", "pressure", "mass-flow"
-}
-
-
-# ------------------------- Database -------------------------
-
-class Database:
-    def __init__(self, path: str = "registry.db"):
-        self.conn = sqlite3.connect(path)
-        self.conn.row_factory = sqlite3.Row
-        self._init_schema()
-        self._seed_units()
-        self._seed_sequences()
-        self._seed_segments()
-        self._seed_data_dicts()
-        self._seed_examples()
-
-    def _execute(self, sql: str, params: tuple = ()):
-        cur = self.conn.cursor()
-        cur.execute(sql, params)
-        self.conn.commit()
-        return cur
-
-    def _init_schema(self):
-        self._execute("PRAGMA foreign_keys = ON;")
-        # PARAMETER
-        self._execute("""
-        CREATE TABLE IF NOT EXISTS PARAMETER (
-            id TEXT PRIMARY KEY,
-            long_code TEXT UNIQUE COLLATE NOCASE,
-            quantity_kind TEXT,
-            data_type TEXT,
-            shape TEXT,
-            system_unit TEXT,
-            method_name TEXT,
-            short_code TEXT,
-            labels TEXT, -- json
-            description TEXT, -- json
-            tags TEXT, -- json
-            constraints TEXT, -- json
-            version_major INTEGER,
-            version_minor INTEGER,
-            version_patch INTEGER
-        );
-        """)
-        # MIGRATION: ensure columns exist in old DBs
-        try:
-            cur = self._execute("PRAGMA table_info(PARAMETER)")
-            cols = {r["name"] for r in cur.fetchall()}
-            if "method_name" not in cols:
-                self._execute("ALTER TABLE PARAMETER ADD COLUMN method_name TEXT;")
-            if "short_code" not in cols:
-                self._execute("ALTER TABLE PARAMETER ADD COLUMN short_code TEXT;")
-        except Exception:
-            pass
-        # Unique index for (method_name, short_code)
-        self._execute("""
-        CREATE UNIQUE INDEX IF NOT EXISTS idx_param_method_short
-        ON PARAMETER(method_name, short_code);
-        """)
-
-        # UNIT
-        self._execute("""
-        CREATE TABLE IF NOT EXISTS UNIT (
-            code TEXT PRIMARY KEY,
-            dimension TEXT
-        );
-        """)
-        # PARAMETER_ALLOWED_UNIT
-        self._execute("""
-        CREATE TABLE IF NOT EXISTS PARAMETER_ALLOWED_UNIT (
-            parameter_id TEXT,
-            unit_code TEXT,
-            PRIMARY KEY (parameter_id, unit_code),
-            FOREIGN KEY(parameter_id) REFERENCES PARAMETER(id) ON DELETE CASCADE,
-            FOREIGN KEY(unit_code) REFERENCES UNIT(code) ON DELETE CASCADE
-        );
-        """)
-        # Справочник сегментов long code
-        self._execute("""
-        CREATE TABLE IF NOT EXISTS CODE_SEGMENT (
-            kind TEXT NOT NULL,    -- quantity | medium | location | component | state | statistic | method
-            value TEXT NOT NULL,
-            label TEXT,
-            notes TEXT,
-            PRIMARY KEY (kind, value)
-        );
-        """)
-        # Универсальный справочник значений для quantityKind/dataType/shape
-        self._execute("""
-        CREATE TABLE IF NOT EXISTS DATA_DICT (
-            kind TEXT NOT NULL,    -- quantity_kind | data_type | shape
-            value TEXT NOT NULL,
-            label TEXT,
-            notes TEXT,
-            PRIMARY KEY (kind, value)
-        );
-        """)
-        # Последовательности
-        self._execute("""
-        CREATE TABLE IF NOT EXISTS SEQ (
-            name TEXT PRIMARY KEY,
-            value INTEGER
-        );
-        """)
-
-    def _seed_sequences(self):
-        cur = self._execute("SELECT value FROM SEQ WHERE name='param_seq'")
-        row = cur.fetchone()
-        if row is None:
-            self._execute("INSERT INTO SEQ(name, value) VALUES (?, ?)", ("param_seq", 0))
-
-    def _seed_units(self):
-        # Minimal unit set
-        units = [
-            ("К", "temperature"),
-            ("°С", "temperature"),
-            ("F", "temperature"),
-            ("Па", "pressure"),
-            ("кПа", "pressure"),
-            ("бар", "pressure"),
-            ("МПа", "pressure"),
-            ("кг/с", "mass-flow"),
-            ("кг/ч", "mass-flow"),
-            ("гр/с", "mass-flow")
-        ]
-        for code, dim in units:
-            cur = self._execute("SELECT code FROM UNIT WHERE code=?", (code,))
-            if cur.fetchone() is None:
-                self._execute("INSERT INTO UNIT(code, dimension) VALUES (?, ?)", (code, dim))
-
-    def next_param_pid(self) -> str:
-        self._execute("UPDATE SEQ SET value = value + 1 WHERE name='param_seq'")
-        cur = self._execute("SELECT value FROM SEQ WHERE name='param_seq'")
-        v = cur.fetchone()["value"]
-        return f"PRM-{v:08d}"
-
-    def _seed_segments(self):
-        # Seed only if empty
-        cur = self._execute("SELECT COUNT(*) AS cnt FROM CODE_SEGMENT")
-        if cur.fetchone()["cnt"] > 0:
-            # ensure method kind exists and seeded minimally
-            for m in sorted(SEED_METHODS):
-                self._execute(
-                    "INSERT OR IGNORE INTO CODE_SEGMENT(kind, value, label, notes) VALUES (?, ?, ?, ?)",
-                    ("method", m, "", "")
-                )
-            return
-
-        def ins(kind: str, items: set):
-            for v in sorted(items):
-                self._execute(
-                    "INSERT OR IGNORE INTO CODE_SEGMENT(kind, value, label, notes) VALUES (?, ?, ?, ?)",
-                    (kind, v, "", "")
-                )
-
-        ins("quantity", SEED_QUANTITIES)
-        ins("medium", SEED_MEDIUMS)
-        ins("location", SEED_LOCATIONS)
-        ins("component", SEED_COMPONENTS)
-        ins("state", SEED_STATES)
-        ins("statistic", SEED_STATISTICS)
-        ins("method", SEED_METHODS)
-
-    # DATA_DICT helpers
-    def _seed_data_dicts(self):
-        # quantity_kind
-        for v in sorted(SEED_QUANTITY_KINDS):
-            self._execute("INSERT OR IGNORE INTO DATA_DICT(kind, value, label, notes) VALUES (?, ?, ?, ?)",
-                          ("quantity_kind", v, "", ""))
-        # data_type
-        for v in sorted(SEED_DATA_TYPES):
-            self._execute("INSERT OR IGNORE INTO DATA_DICT(kind, value, label, notes) VALUES (?, ?, ?, ?)",
-                          ("data_type", v, "", ""))
-        # shape
-        for v in sorted(SEED_SHAPES):
-            self._execute("INSERT OR IGNORE INTO DATA_DICT(kind, value, label, notes) VALUES (?, ?, ?, ?)",
-                          ("shape", v, "", ""))
-
-    def list_segment_values(self, kind: str) -> List[str]:
-        cur = self._execute("SELECT value FROM CODE_SEGMENT WHERE kind=? ORDER BY value", (kind,))
-        return [r["value"] for r in cur.fetchall()]
-
-    def list_segments(self, kind: str) -> List[sqlite3.Row]:
-        cur = self._execute("SELECT kind, value, label, notes FROM CODE_SEGMENT WHERE kind=? ORDER BY value", (kind,))
-        return cur.fetchall()
-
-    def add_segment(self, kind: str, value: str, label: str = "", notes: str = ""):
-        self._execute(
-            "INSERT INTO CODE_SEGMENT(kind, value, label, notes) VALUES (?, ?, ?, ?)",
-            (kind, value, label, notes)
-        )
-
-    def update_segment(self, kind: str, old_value: str, new_value: str, label: str = "", notes: str = ""):
-        self._execute(
-            "UPDATE CODE_SEGMENT SET value=?, label=?, notes=? WHERE kind=? AND value=?",
-            (new_value, label, notes, kind, old_value)
-        )
-
-    def delete_segment(self, kind: str, value: str):
-        self._execute("DELETE FROM CODE_SEGMENT WHERE kind=? AND value=?", (kind, value))
-
-    # DATA_DICT methods
-    def list_data_dict_values(self, kind: str) -> List[str]:
-        cur = self._execute("SELECT value FROM DATA_DICT WHERE kind=? ORDER BY value", (kind,))
-        return [r["value"] for r in cur.fetchall()]
-
-    def list_data_dict(self, kind: str) -> List[sqlite3.Row]:
-        cur = self._execute("SELECT kind, value, label, notes FROM DATA_DICT WHERE kind=? ORDER BY value", (kind,))
-        return cur.fetchall()
-
-    def add_data_dict(self, kind: str, value: str, label: str = "", notes: str = ""):
-        self._execute("INSERT INTO DATA_DICT(kind, value, label, notes) VALUES (?, ?, ?, ?)", (kind, value, label, notes))
-
-    def update_data_dict(self, kind: str, old_value: str, new_value: str, label: str = "", notes: str = ""):
-        self._execute("UPDATE DATA_DICT SET value=?, label=?, notes=? WHERE kind=? AND value=?",
-                      (new_value, label, notes, kind, old_value))
-
-    def delete_data_dict(self, kind: str, value: str):
-        self._execute("DELETE FROM DATA_DICT WHERE kind=? AND value=?", (kind, value))
-
-    def rename_unit_with_dimension(self, old_code: str, new_code: str, dimension: str):
-        if old_code == new_code:
-            self._execute("UPDATE UNIT SET dimension=? WHERE code=?", (dimension, old_code))
-            return
-        cur_old = self._execute("SELECT code FROM UNIT WHERE code=?", (old_code,))
-        if not cur_old.fetchone():
-            raise ValueError(f"Единица '{old_code}' не найдена")
-        cur_new = self._execute("SELECT code FROM UNIT WHERE code=?", (new_code,))
-        if cur_new.fetchone():
-            raise ValueError(f"Единица с кодом '{new_code}' уже существует")
-
-        self._execute("INSERT INTO UNIT(code, dimension) VALUES (?, ?)", (new_code, dimension))
-        # Update references
-        self._execute("UPDATE PARAMETER SET system_unit=? WHERE system_unit=?", (new_code, old_code))
-        self._execute("UPDATE PARAMETER_ALLOWED_UNIT SET unit_code=? WHERE unit_code=?", (new_code, old_code))
-        # Remove old
-        self._execute("DELETE FROM UNIT WHERE code=?", (old_code,))
-
-    def _seed_examples(self):
-        # Seed example parameters if DB is empty
-        cur = self._execute("SELECT COUNT(*) AS cnt FROM PARAMETER")
-        if cur.fetchone()["cnt"] > 0:
-            return
-
-        # Example 1: Inlet temperature
-        pid1 = self.next_param_pid()
-        self._execute("""
-        INSERT INTO PARAMETER(id, long_code, quantity_kind, data_type, shape, system_unit, method_name, short_code, labels, description,
-                              tags, constraints, version_major, version_minor, version_patch)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            pid1,
-            "temperature.gas.inlet.compressor.k-101.total.mean.poly",
-            "thermodynamic-temperature",
-            "float64",
-            "scalar",
-            "K",
-            "poly",
-            "T_in",
-            safe_json_dumps({"en": "Inlet total temperature K-101", "ru": "Температура на входе (полная) K-101"}),
-            safe_json_dumps({"en": "", "ru": "Полная температура газа на входе компрессора K-101"}),
-            safe_json_dumps(["thermo", "compressor", "inlet"]),
-            safe_json_dumps({"min": 0, "max": 2000}),
-            1, 0, 0
-        ))
-        for u in ["K", "Cel", "degF"]:
-            self._execute("INSERT INTO PARAMETER_ALLOWED_UNIT(parameter_id, unit_code) VALUES (?, ?)", (pid1, u))
-
-        # Example 2: Outlet pressure
-        pid2 = self.next_param_pid()
-        self._execute("""
-        INSERT INTO PARAMETER(id, long_code, quantity_kind, data_type, shape, system_unit, method_name, short_code, labels, description,
-                              tags, constraints, version_major, version_minor, version_patch)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            pid2,
-            "pressure.gas.outlet.compressor.k-101.static.mean.mapfit",
-            "pressure",
-            "float64",
-            "scalar",
-            "Pa",
-            "mapfit",
-            "P_out",
-            safe_json_dumps({"en": "Outlet static pressure K-101", "ru": "Давление на выходе (статическое) K-101"}),
-            safe_json_dumps({"en": "", "ru": ""}),
-            safe_json_dumps(["compressor", "outlet"]),
-            safe_json_dumps({"min": 0, "max": 1e9}),
-            1, 0, 0
-        ))
-        for u in ["Pa", "kPa", "bar", "MPa"]:
-            self._execute("INSERT INTO PARAMETER_ALLOWED_UNIT(parameter_id, unit_code) VALUES (?, ?)", (pid2, u))
-
-        # Example 3: Mass-flow
-        pid3 = self.next_param_pid()
-        self._execute("""
-        INSERT INTO PARAMETER(id, long_code, quantity_kind, data_type, shape, system_unit, method_name, short_code, labels, description,
-                              tags, constraints, version_major, version_minor, version_patch)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            pid3,
-            "mass-flow.gas.inlet.compressor.k-101.mean.poly",
-            "mass-flow",
-            "float64",
-            "scalar",
-            "kg/s",
-            "poly",
-            "mdot_in",
-            safe_json_dumps({"en": "Inlet mass flow K-101", "ru": "Массовый расход на входе K-101"}),
-            safe_json_dumps({"en": "", "ru": ""}),
-            safe_json_dumps(["compressor", "inlet"]),
-            safe_json_dumps({"min": 0, "max": 1e5}),
-            1, 0, 0
-        ))
-        for u in ["kg/s", "kg/h", "g/s", "lb/s"]:
-            self._execute("INSERT INTO PARAMETER_ALLOWED_UNIT(parameter_id, unit_code) VALUES (?, ?)", (pid3, u))
-
-
-# ------------------------- Parameter Registry -------------------------
-
-class ParameterRegistry:
-    LONG_CODE_RE = re.compile(r"^[a-z0-9-]+(\.[a-z0-9-]+)*$")
-
-    def __init__(self, db: Database):
-        self.db = db
-        self._cache = {"long2pid": {}, "pid2meta": {}}
-        self.refresh_cache()
-
-    def refresh_cache(self):
-        # long -> pid
-        cur = self.db._execute("SELECT id, long_code, system_unit FROM PARAMETER")
-        self._cache["long2pid"] = {}
-        self._cache["pid2meta"] = {}
-        for row in cur.fetchall():
-            self._cache["long2pid"][row["long_code"]] = row["id"]
-            self._cache["pid2meta"][row["id"]] = {"systemUnit": row["system_unit"], "longCode": row["long_code"]}
-
-    def getById(self, pid: str) -> Optional[sqlite3.Row]:
-        cur = self.db._execute("SELECT * FROM PARAMETER WHERE id=?", (pid,))
-        return cur.fetchone()
-
-    def getByLongCode(self, code: str) -> Optional[sqlite3.Row]:
-        cur = self.db._execute("SELECT * FROM PARAMETER WHERE long_code=?", (code,))
-        return cur.fetchone()
-
-    def list(self, search: str = "") -> List[sqlite3.Row]:
-        search = (search or "").strip()
-        if not search:
-            cur = self.db._execute("SELECT * FROM PARAMETER ORDER BY long_code")
-            return cur.fetchall()
-        like = f"%{search.lower()}%"
-        cur = self.db._execute("""
-            SELECT * FROM PARAMETER
-            WHERE LOWER(long_code) LIKE ?
-               OR LOWER(IFNULL(short_code,'')) LIKE ?
-               OR LOWER(labels) LIKE ?
-               OR LOWER(tags) LIKE ?
-               OR LOWER(quantity_kind) LIKE ?
-               OR LOWER(IFNULL(method_name,'')) LIKE ?
-            ORDER BY long_code
-        """, (like, like, like, like, like, like))
-        return cur.fetchall()
-
-    def allowedUnits(self, pid: str) -> List[str]:
-        cur = self.db._execute("SELECT unit_code FROM PARAMETER_ALLOWED_UNIT WHERE parameter_id=? ORDER BY unit_code", (pid,))
-        return [r["unit_code"] for r in cur.fetchall()]
-
-    def systemUnit(self, pid: str) -> str:
-        cur = self.db._execute("SELECT system_unit FROM PARAMETER WHERE id=?", (pid,))
-        row = cur.fetchone()
-        if not row:
-            raise KeyError("Параметр не найден")
-        return row["system_unit"]
-
-    def is_short_code_unique(self, method: Optional[str], short_code: Optional[str], exclude_pid: Optional[str] = None) -> bool:
-        sc = (short_code or "").strip()
-        m = (method or "").strip()
-        if sc == "" or m == "":
-            # Uniqueness not enforced when method or short code is empty
-            return True
-        if exclude_pid:
-            cur = self.db._execute(
-                "SELECT id FROM PARAMETER WHERE method_name=? AND short_code=? AND id<>?",
-                (m, sc, exclude_pid)
-            )
-        else:
-            cur = self.db._execute(
-                "SELECT id FROM PARAMETER WHERE method_name=? AND short_code=?",
-                (m, sc)
-            )
-        return cur.fetchone() is None
-
-    def create_parameter(self, param: Dict[str, Any]) -> str:
-        # pre-check short code uniqueness when provided
-        if not self.is_short_code_unique(param.get("method"), param.get("shortCode")):
-            raise ValueError("Короткий код уже используется в этой методике")
-
-        pid = self.db.next_param_pid()
-        # Начинаем всегда с 1.0.0 (автоматическая регистрация версий)
-        vmaj, vmin, vpat = 1, 0, 0
-        self.db._execute("""
-        INSERT INTO PARAMETER(id, long_code, quantity_kind, data_type, shape, system_unit, method_name, short_code, labels, description,
-                              tags, constraints, version_major, version_minor, version_patch)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            pid,
-            param["longCode"],
-            param.get("quantityKind") or "",
-            param.get("dataType") or "float64",
-            param.get("shape") or "scalar",
-            param["systemUnit"],
-            param.get("method") or None,
-            (param.get("shortCode") or None),
-            safe_json_dumps(param.get("labels") or {}),
-            safe_json_dumps(param.get("description") or {}),
-            safe_json_dumps(param.get("tags") or []),
-            safe_json_dumps(param.get("constraints") or {}),
-            vmaj, vmin, vpat
-        ))
-        for u in param.get("allowedUnits", []):
-            self.db._execute("INSERT INTO PARAMETER_ALLOWED_UNIT(parameter_id, unit_code) VALUES (?, ?)", (pid, u))
-        self.refresh_cache()
-        return pid
-
-    def update_parameter(self, pid: str, param: Dict[str, Any]) -> None:
-        row = self.getById(pid)
-        if not row:
-            raise KeyError("Параметр не найден")
-
-        # pre-check short code uniqueness when provided
-        if not self.is_short_code_unique(param.get("method"), param.get("shortCode"), exclude_pid=pid):
-            raise ValueError("Короткий код уже используется в этой методике")
-
-        allowed_old = sorted(self.allowedUnits(pid))
-
-        def norm_labels(x):
-            return safe_json_loads(x, {}) if isinstance(x, str) else (x or {})
-
-        def norm_descr(x):
-            return safe_json_loads(x, {}) if isinstance(x, str) else (x or {})
-
-        def norm_tags(x):
-            t = safe_json_loads(x, []) if isinstance(x, str) else (x or [])
-            return sorted(set(map(str, t)))
-
-        def norm_constraints(x):
-            return safe_json_loads(x, {}) if isinstance(x, str) else (x or {})
-
-        old_snap = {
-            "longCode": row["long_code"],
-            "quantityKind": row["quantity_kind"],
-            "dataType": row["data_type"],
-            "shape": row["shape"],
-            "systemUnit": row["system_unit"],
-            "method": row["method_name"] or "",
-            "shortCode": row["short_code"] or "",
-            "labels": norm_labels(row["labels"]),
-            "description": norm_descr(row["description"]),
-            "tags": norm_tags(row["tags"]),
-            "constraints": norm_constraints(row["constraints"]),
-            "allowedUnits": allowed_old,
-        }
-
-        new_snap = {
-            "longCode": param["longCode"],
-            "quantityKind": param.get("quantityKind") or "",
-            "dataType": param.get("dataType") or "float64",
-            "shape": param.get("shape") or "scalar",
-            "systemUnit": param["systemUnit"],
-            "method": param.get("method") or "",
-            "shortCode": param.get("shortCode") or "",
-            "labels": param.get("labels") or {},
-            "description": param.get("description") or {},
-            "tags": sorted(set(map(str, param.get("tags") or []))),
-            "constraints": param.get("constraints") or {},
-            "allowedUnits": sorted(param.get("allowedUnits") or []),
-        }
-
-        changed = safe_json_dumps(old_snap) != safe_json_dumps(new_snap)
-
-        # Авто‑версионирование: +0.1 при изменениях, patch = 0
-        vmaj = int(row["version_major"] or 1)
-        vmin = int(row["version_minor"] or 0)
-        vpat = 0
-        if changed:
-            vmin += 1
-
-        self.db._execute("""
-        UPDATE PARAMETER SET 
-            long_code=?, quantity_kind=?, data_type=?, shape=?, system_unit=?, method_name=?, short_code=?, labels=?, description=?,
-            tags=?, constraints=?, version_major=?, version_minor=?, version_patch=?
-        WHERE id=?
-        """, (
-            param["longCode"],
-            param.get("quantityKind") or "",
-            param.get("dataType") or "float64",
-            param.get("shape") or "scalar",
-            param["systemUnit"],
-            param.get("method") or None,
-            (param.get("shortCode") or None),
-            safe_json_dumps(param.get("labels") or {}),
-            safe_json_dumps(param.get("description") or {}),
-            safe_json_dumps(param.get("tags") or []),
-            safe_json_dumps(param.get("constraints") or {}),
-            vmaj, vmin, vpat,
-            pid
-        ))
-        self.db._execute("DELETE FROM PARAMETER_ALLOWED_UNIT WHERE parameter_id=?", (pid,))
-        for u in param.get("allowedUnits", []):
-            self.db._execute("INSERT INTO PARAMETER_ALLOWED_UNIT(parameter_id, unit_code) VALUES (?, ?)", (pid, u))
-        self.refresh_cache()
-
-    def delete_parameter(self, pid: str):
-        self.db._execute("DELETE FROM PARAMETER WHERE id=?", (pid,))
-        self.refresh_cache()
-
-    def validate_long_code(self, code: str) -> Tuple[List[str], List[str]]:
-        errors = []
-        warnings = []
-        code = (code or "").strip()
-        if not code:
-            errors.append("longCode пуст")
-            return errors, warnings
-
-        if len(code) > 200:
-            errors.append("longCode превышает максимальную длину 200")
-
-        if not self.LONG_CODE_RE.match(code):
-            errors.append("longCode должен содержать только сегменты [a-z0-9-], разделённые точками '.'")
-
-        segments = code.split(".")
-        for s in segments:
-            if len(s) > 32:
-                errors.append(f"Сегмент '{s}' длинее 32 символов")
-
-        if len(segments) < 3:
-            errors.append("longCode должен иметь минимум 3 сегмента (quantity.medium.[location|component]...)")
-
-        # DB-driven vocabularies
-        quantities = set(self.db.list_segment_values("quantity"))
-        mediums = set(self.db.list_segment_values("medium"))
-        locations = set(self.db.list_segment_values("location"))
-        components = set(self.db.list_segment_values("component"))
-        methods = set(self.db.list_segment_values("method"))
-
-        quantity = segments[0] if segments else ""
-        if quantity not in quantities:
-            warnings.append(f"Неизвестная величина '{quantity}' (рассмотрите использование контролируемого словаря)")
-
-        if len(segments) >= 2:
-            medium = segments[1]
-            if not (medium in mediums or medium.startswith("mixture-")):
-                warnings.append(f"Среда '{medium}' не распознана (при необходимости отредактируйте через 'Справочник сегментов...')")
-        else:
-            errors.append("Второй сегмент (medium) обязателен")
-
-        has_location = any(
-            s in locations or s.startswith("node-") or s.startswith("section-") or s.startswith("station-") for s in segments[2:]
-        )
-        has_component = any(
-            s in components for s in segments[2:]
-        )
-        if not (has_location or has_component):
-            errors.append("longCode должен включать сегмент 'location' (inlet/outlet/...) или 'component' (compressor/pipe/...)")
-
-        # Method optional — предупреждение даётся в validate_parameter
-        _ = methods  # placeholder
-
-        return errors, warnings
-
-    def validate_parameter(self, pid: str) -> Dict[str, Any]:
-        cur = self.db._execute("SELECT * FROM PARAMETER WHERE id=?", (pid,))
-        p = cur.fetchone()
-        if not p:
-            return {"ok": False, "errors": ["Параметр не найден"], "warnings": []}
-
-        errors, warnings = self.validate_long_code(p["long_code"])
-
-        # Units existence
-        cur = self.db._execute("SELECT 1 FROM UNIT WHERE code=?", (p["system_unit"],))
-        if not cur.fetchone():
-            errors.append(f"Системная единица '{p['system_unit']}' не найдена в справочнике UNIT")
-
-        cur = self.db._execute("SELECT unit_code FROM PARAMETER_ALLOWED_UNIT WHERE parameter_id=?", (pid,))
-        allowed = [r["unit_code"] for r in cur.fetchall()]
-        if not allowed:
-            errors.append("Список allowedUnits не должен быть пустым")
-        if allowed and p["system_unit"] not in allowed:
-            warnings.append(f"systemUnit '{p['system_unit']}' отсутствует в allowedUnits")
-
-        for u in allowed:
-            c = self.db._execute("SELECT 1 FROM UNIT WHERE code=?", (u,))
-            if not c.fetchone():
-                errors.append(f"Разрешённая единица '{u}' отсутствует в справочнике UNIT")
-
-        # Справочники dataType/shape/quantityKind
-        types = set(self.db.list_data_dict_values("data_type"))
-        shapes = set(self.db.list_data_dict_values("shape"))
-        qkinds = set(self.db.list_data_dict_values("quantity_kind"))
-        if p["data_type"] not in types:
-            warnings.append(f"Нетипичный dataType '{p['data_type']}' (справочник: {sorted(types)})")
-        if p["shape"] not in shapes:
-            warnings.append(f"Нетипичная форма '{p['shape']}' (справочник: {sorted(shapes)})")
-        if p["quantity_kind"] and p["quantity_kind"] not in qkinds:
-            warnings.append(f"Нетипичный quantityKind '{p['quantity_kind']}' (справочник: {sorted(qkinds)})")
-
-        # Предупреждение по методике
-        methods = set(self.db.list_segment_values("method"))
-        if (p["method_name"] or "") and p["method_name"] not in methods:
-            warnings.append(f"Нетипичная методика '{p['method_name']}' (справочник: {sorted(methods)})")
-
-        # Валидация short code
-        sc = (p["short_code"] or "").strip()
-        mn = (p["method_name"] or "").strip()
-        if sc:
-            if not SHORT_CODE_RE.match(sc):
-                errors.append("shortCode должен начинаться с буквы и содержать до 32 символов [A-Za-z0-9_]")
-            elif mn and not self.is_short_code_unique(mn, sc, exclude_pid=pid):
-                errors.append(f"shortCode '{sc}' уже используется в методике '{mn}'")
-
-        constraints = safe_json_loads(p["constraints"], {})
-        try:
-            mnv = constraints.get("min", None)
-            mxv = constraints.get("max", None)
-            if mnv is not None and mxv is not None:
-                if float(mnv) > float(mxv):
-                    errors.append("constraints.min > constraints.max")
-        except Exception:
-            warnings.append("constraints min/max — не числа")
-
-        return {"ok": len(errors) == 0, "errors": errors, "warnings": warnings}
-
-
 # ------------------------- GUI Components -------------------------
 
 class MethodChoiceDialog(tk.Toplevel):
@@ -874,12 +185,31 @@ class MethodChoiceDialog(tk.Toplevel):
 
 
 class ParameterListFrame(ttk.Frame):
+    """
+    Список параметров. Строки подгружаются страницами по PAGE_SIZE (keyset по long_code)
+    при прокрутке к концу списка. Запросы выполняет фоновый поток со своим соединением
+    SQLite; результаты передаются в поток Tk через очередь, которую опрашивает after().
+    """
+    SEARCH_DEBOUNCE_MS = 300
+    POLL_MS = 30
+
     def __init__(self, master, registry: ParameterRegistry, on_select):
         super().__init__(master)
         self.registry = registry
         self.on_select = on_select
 
         self.search_var = tk.StringVar()
+        # Поколение запроса: ответы на устаревший поиск отбрасываются
+        self._generation = 0
+        self._after_cursor: Optional[tuple] = None
+        self._exhausted = False
+        self._loading = False
+        self._polling = False
+        self._pending_select: Optional[str] = None
+        self._debounce_id = None
+        self._requests: "queue.Queue" = queue.Queue()
+        self._results: "queue.Queue" = queue.Queue()
+        threading.Thread(target=self._page_worker, name="registry-list", daemon=True).start()
         self._build()
 
     def _build(self):
@@ -890,6 +220,7 @@ class ParameterListFrame(ttk.Frame):
         ent = ttk.Entry(top, textvariable=self.search_var, width=30)
         ent.pack(side="left", padx=4)
         ent.bind("<Return>", lambda e: self.refresh())
+        self.search_var.trace_add("write", lambda *_: self._schedule_search())
 
         ttk.Button(top, text="Найти", command=self.refresh).pack(side="left")
         ttk.Button(top, text="Сброс", command=self._clear_search).pack(side="left", padx=2)
@@ -923,7 +254,8 @@ class ParameterListFrame(ttk.Frame):
         # Scrollbars
         yscroll = ttk.Scrollbar(tree_container, orient="vertical", command=self.tree.yview)
         xscroll = ttk.Scrollbar(tree_container, orient="horizontal", command=self.tree.xview)
-        self.tree.configure(yscrollcommand=yscroll.set, xscrollcommand=xscroll.set)
+        self.tree.configure(yscrollcommand=lambda first, last: self._on_yscroll(yscroll, first, last),
+                            xscrollcommand=xscroll.set)
 
         # Layout
         self.tree.grid(row=0, column=0, sticky="nsew")
@@ -957,25 +289,108 @@ class ParameterListFrame(ttk.Frame):
         self.search_var.set("")
         self.refresh()
 
-    def refresh(self):
+    def refresh(self, select: Optional[str] = None):
+        """Перезапускает загрузку списка с первой страницы; select — PID, который выделить после загрузки."""
+        if self._debounce_id is not None:
+            self.after_cancel(self._debounce_id)
+            self._debounce_id = None
+        self._generation += 1
+        self._after_cursor = None
+        self._exhausted = False
+        self._loading = False
+        self._pending_select = select
         for i in self.tree.get_children():
             self.tree.delete(i)
-        rows = self.registry.list(self.search_var.get())
+        self._request_page()
+
+    def _schedule_search(self):
+        if self._debounce_id is not None:
+            self.after_cancel(self._debounce_id)
+        self._debounce_id = self.after(self.SEARCH_DEBOUNCE_MS, self.refresh)
+
+    def _on_yscroll(self, scrollbar: ttk.Scrollbar, first, last):
+        scrollbar.set(first, last)
+        if float(last) >= 0.9:
+            self._request_page()
+
+    def _request_page(self):
+        if self._loading or self._exhausted:
+            return
+        self._loading = True
+        self._requests.put((self._generation, self.search_var.get(), self._after_cursor, self.registry.db.has_fts))
+        if not self._polling:
+            self._polling = True
+            self.after(self.POLL_MS, self._poll_results)
+
+    def _page_worker(self):
+        """Фоновый поток: своё read-only соединение (объекты sqlite3 нельзя делить между потоками)."""
+        conn = None
+        while True:
+            generation, search, after, use_fts = self._requests.get()
+            try:
+                if conn is None:
+                    conn = self.registry.db.open_reader()
+                rows, next_after = fetch_page(conn, search, after, PAGE_SIZE, use_fts=use_fts)
+                self._results.put((generation, rows, next_after, None))
+            except Exception as ex:
+                self._results.put((generation, [], None, ex))
+
+    def _poll_results(self):
+        while True:
+            try:
+                generation, rows, next_after, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            # Ответы на устаревший запрос (поиск изменился) отбрасываются
+            if generation == self._generation:
+                self._apply_page(rows, next_after, error)
+        if self._loading:
+            self.after(self.POLL_MS, self._poll_results)
+        else:
+            self._polling = False
+
+    def _apply_page(self, rows: List[sqlite3.Row], next_after: Optional[tuple], error: Optional[Exception]):
+        self._loading = False
+        if error is not None:
+            self._exhausted = True
+            messagebox.showerror("Ошибка", f"Не удалось загрузить список:\n{error}")
+            return
         for r in rows:
-            constr = safe_json_loads(r["constraints"], {})
-            mn = constr.get("min", "")
-            mx = constr.get("max", "")
-            rng = f"{'' if mn is None else mn} - {'' if mx is None else mx}"
-            self.tree.insert("", "end", iid=r["id"], values=(
-                r["id"],
-                r["method_name"] or "",
-                r["quantity_kind"],
-                r["long_code"],
-                r["short_code"] or "",
-                r["system_unit"],
-                rng,
-                r["data_type"],
-            ))
+            if not self.tree.exists(r["id"]):
+                self.tree.insert("", "end", iid=r["id"], values=self._row_values(r))
+        self._after_cursor = next_after
+        self._exhausted = next_after is None
+
+        if self._pending_select:
+            if self.tree.exists(self._pending_select):
+                self.tree.selection_set(self._pending_select)
+                self.tree.see(self._pending_select)
+                self._pending_select = None
+            elif self._exhausted:
+                self._pending_select = None
+            else:
+                self._request_page()
+                return
+        # Список ещё не заполняет видимую область — догружаем
+        if self.tree.yview()[1] >= 0.9:
+            self._request_page()
+
+    @staticmethod
+    def _row_values(r) -> tuple:
+        constr = safe_json_loads(r["constraints"], {})
+        mn = constr.get("min", "")
+        mx = constr.get("max", "")
+        rng = f"{'' if mn is None else mn} - {'' if mx is None else mx}"
+        return (
+            r["id"],
+            r["method_name"] or "",
+            r["quantity_kind"],
+            r["long_code"],
+            r["short_code"] or "",
+            r["system_unit"],
+            rng,
+            r["data_type"],
+        )
 
     def _on_select(self, event=None):
         sel = self.tree.selection()
@@ -1007,8 +422,7 @@ class ParameterListFrame(ttk.Frame):
         try:
             new_pid = self.registry.create_parameter(param)
             messagebox.showinfo("OK", f"Создан черновик параметра {new_pid}")
-            self.refresh()
-            self.tree.selection_set(new_pid)
+            self.refresh(select=new_pid)
             self.on_select(new_pid)
         except Exception as ex:
             messagebox.showerror("Ошибка", f"Не удалось создать параметр:\n{ex}")
@@ -1041,8 +455,7 @@ class ParameterListFrame(ttk.Frame):
         try:
             new_pid = self.registry.create_parameter(param)
             messagebox.showinfo("OK", f"Создан дубликат {new_pid}")
-            self.refresh()
-            self.tree.selection_set(new_pid)
+            self.refresh(select=new_pid)
             self.on_select(new_pid)
         except Exception as ex:
             messagebox.showerror("Ошибка", f"Не удалось создать дубликат:\n{ex}")
@@ -1073,27 +486,7 @@ class ParameterListFrame(ttk.Frame):
         allowed = self.registry.allowedUnits(pid)
 
         # Экспортируем только RU-поля названия/описания
-        labels_all = safe_json_loads(row["labels"], {})
-        descr_all = safe_json_loads(row["description"], {})
-        labels_ru = {"ru": labels_all.get("ru", "")}
-        descr_ru = {"ru": descr_all.get("ru", "")}
-
-        param_json = {
-            "id": row["id"],
-            "longCode": row["long_code"],
-            "labels": labels_ru,
-            "description": descr_ru,
-            "quantityKind": row["quantity_kind"],
-            "dataType": row["data_type"],
-            "shape": row["shape"],
-            "systemUnit": row["system_unit"],
-            "method": row["method_name"] or "",
-            "shortCode": row["short_code"] or "",
-            "allowedUnits": allowed,
-            "tags": safe_json_loads(row["tags"], []),
-            "constraints": safe_json_loads(row["constraints"], {}),
-            "version": f"{row['version_major']}.{row['version_minor']}.{row['version_patch']}",
-        }
+        param_json = param_to_json(row, allowed)
         path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON", "*.json")], title="Сохранить параметр в JSON")
         if not path:
             return
@@ -1112,40 +505,22 @@ class ParameterListFrame(ttk.Frame):
             with open(path, "r", encoding="utf-8") as f:
                 param_json = json.load(f)
             # Версия игнорируется при создании (автоверсионирование начнёт с 1.0)
-            method = param_json.get("method") or ""
-            short_code = param_json.get("shortCode") or ""
+            param = param_from_json(param_json)
+            method = param["method"]
+            short_code = param["shortCode"]
             # Предварительная проверка уникальности (если метод и shortCode заданы)
             if short_code and method and not self.registry.is_short_code_unique(method, short_code):
                 messagebox.showerror("Ошибка импорта", f"shortCode '{short_code}' уже используется в методике '{method}'")
                 return
-            param = {
-                "longCode": param_json["longCode"],
-                "quantityKind": param_json.get("quantityKind") or "",
-                "dataType": param_json.get("dataType") or "float64",
-                "shape": param_json.get("shape") or "scalar",
-                "systemUnit": param_json["systemUnit"],
-                "method": method,
-                "shortCode": short_code,
-                "labels": {"ru": (param_json.get("labels") or {}).get("ru", "")},
-                "description": {"ru": (param_json.get("description") or {}).get("ru", "")},
-                "tags": param_json.get("tags") or [],
-                "constraints": param_json.get("constraints") or {},
-                "allowedUnits": param_json.get("allowedUnits") or [param_json["systemUnit"]],
-            }
             new_pid = self.registry.create_parameter(param)
             messagebox.showinfo("OK", f"Импортирован параметр {new_pid}")
-            self.refresh()
-            self.tree.selection_set(new_pid)
+            self.refresh(select=new_pid)
             self.on_select(new_pid)
         except Exception as ex:
             messagebox.showerror("Ошибка", f"Не удалось импортировать:\n{ex}")
 
     def _export_md(self):
-        # Build list of methods from dictionary; if empty, also scan existing parameters
-        methods = sorted(set(self.registry.db.list_segment_values("method")))
-        if not methods:
-            cur = self.registry.db._execute("SELECT DISTINCT method_name FROM PARAMETER WHERE method_name IS NOT NULL ORDER BY method_name")
-            methods = [r["method_name"] for r in cur.fetchall()]
+        methods = self.registry.list_methods()
         if not methods:
             messagebox.showwarning("Внимание", "Список методик пуст")
             return
@@ -1161,43 +536,9 @@ class ParameterListFrame(ttk.Frame):
             return
 
         try:
-            cur = self.registry.db._execute(
-                "SELECT * FROM PARAMETER WHERE method_name=? ORDER BY long_code", (method,)
-            )
-            rows = cur.fetchall()
-            if not rows:
+            if not self.registry.export_markdown(path, method):
                 messagebox.showinfo("Экспорт в MD", f"Нет данных для методики '{method}'")
                 return
-
-            def md_escape(s: Any) -> str:
-                t = str(s if s is not None else "")
-                t = t.replace("|", "\\|").replace("\n", " ").replace("\r", " ")
-                return t
-
-            headers = ["Название", "Системная ед.", "Короткий код", "Длинный код"]
-            lines = []
-            lines.append("| " + " | ".join(headers) + " |")
-            lines.append("| " + " | ".join([":---:"] * len(headers)) + " |")
-
-            for r in rows:
-                labels = safe_json_loads(r["labels"], {})
-                descr = safe_json_loads(r["description"], {})
-                constr = safe_json_loads(r["constraints"], {})
-                mn = constr.get("min", "")
-                mx = constr.get("max", "")
-                rng = f"{'' if mn is None else mn} - {'' if mx is None else mx}"
-
-                row_vals = [
-                    md_escape(labels.get("ru", "")),
-                    md_escape(r["system_unit"]),
-                    md_escape(r["short_code"] or ""),
-                    md_escape(r["long_code"])
-                ]
-                lines.append("| " + " | ".join(row_vals) + " |")
-
-            with open(path, "w", encoding="utf-8") as f:
-                f.write("\n".join(lines) + "\n")
-
             messagebox.showinfo("Экспорт в MD", f"Сохранено: {path}")
         except Exception as ex:
             messagebox.showerror("Ошибка", f"Не удалось экспортировать:\n{ex}")
@@ -1241,7 +582,7 @@ class AllowedUnitsFrame(ttk.Frame):
         self.save_btn.pack(side="right")
 
     def _open_unit_manager(self):
-        UnitManagerDialog(self, self.db).wait_window()
+        UnitManagerDialog(self, self.registry).wait_window()
         # После закрытия — перечитать список
         if self.pid:
             self.load(self.pid)
@@ -1306,9 +647,10 @@ class AllowedUnitsFrame(ttk.Frame):
 
 
 class UnitManagerDialog(tk.Toplevel):
-    def __init__(self, master, db: Database):
+    def __init__(self, master, registry: ParameterRegistry):
         super().__init__(master)
-        self.db = db
+        self.registry = registry
+        self.db = registry.db
         self.title("Справочник единиц")
         self.geometry("640x480")
         self.transient(master)
@@ -1342,8 +684,7 @@ class UnitManagerDialog(tk.Toplevel):
     def _refresh(self):
         for i in self.tree.get_children():
             self.tree.delete(i)
-        cur = self.db._execute("SELECT code, dimension FROM UNIT ORDER BY code")
-        for r in cur.fetchall():
+        for r in self.db.list_units():
             self.tree.insert("", "end", iid=r["code"], values=(r["code"], r["dimension"] or ""))
 
     def _add(self):
@@ -1353,12 +694,11 @@ class UnitManagerDialog(tk.Toplevel):
         code = code.strip()
         if not code:
             return
-        cur = self.db._execute("SELECT 1 FROM UNIT WHERE code=?", (code,))
-        if cur.fetchone():
+        if self.db.get_unit(code):
             messagebox.showerror("Ошибка", f"Единица '{code}' уже существует")
             return
         dim = simpledialog.askstring("Новая единица", "Размерность (напр., pressure):", parent=self) or ""
-        self.db._execute("INSERT INTO UNIT(code, dimension) VALUES (?, ?)", (code, dim.strip()))
+        self.db.add_unit(code, dim.strip())
         self._refresh()
 
     def _edit(self):
@@ -1367,15 +707,14 @@ class UnitManagerDialog(tk.Toplevel):
             messagebox.showwarning("Внимание", "Выберите единицу")
             return
         old_code = sel[0]
-        cur = self.db._execute("SELECT code, dimension FROM UNIT WHERE code=?", (old_code,))
-        row = cur.fetchone()
+        row = self.db.get_unit(old_code)
         if not row:
             return
         new_code = simpledialog.askstring("Правка единицы", "Код единицы (можно изменить):", initialvalue=row["code"], parent=self) or row["code"]
         new_code = new_code.strip()
         dim = simpledialog.askstring("Правка единицы", "Размерность:", initialvalue=row["dimension"] or "", parent=self) or ""
         try:
-            self.db.rename_unit_with_dimension(old_code, new_code, dim.strip())
+            self.registry.rename_unit(old_code, new_code, dim.strip())
             self._refresh()
         except Exception as ex:
             messagebox.showerror("Ошибка", f"Не удалось сохранить:\n{ex}")
@@ -1394,7 +733,7 @@ class UnitManagerDialog(tk.Toplevel):
         ):
             return
         try:
-            self.db._execute("DELETE FROM UNIT WHERE code=?", (code,))
+            self.db.delete_unit(code)
             self._refresh()
         except Exception as ex:
             messagebox.showerror("Ошибка", f"Не удалось удалить:\n{ex}")
@@ -2077,12 +1416,8 @@ class App(tk.Tk):
         # Обновить список слева и перезагрузить детали текущего параметра
         sel = self.list_frame.tree.selection()
         pid = sel[0] if sel else None
-        self.list_frame.refresh()
+        self.list_frame.refresh(select=pid)
         if pid:
-            try:
-                self.list_frame.tree.selection_set(pid)
-            except Exception:
-                pass
             self.detail.load(pid)
 
     def _on_select_param(self, pid: Optional[str]):
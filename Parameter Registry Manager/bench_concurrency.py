@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк конкурентного доступа к реестру: читатели-процессы во время пакетной записи.
+
+Строит синтетический реестр во временной БД. Писатель (основной процесс) обновляет
+параметры транзакциями по --batch строк, одновременно --readers процессов ищут
+параметры по long_code (как расчётные воркеры при разрешении кодов).
+Сравниваются два режима:
+- "rollback-журнал" — прежнее поведение: journal_mode=DELETE, обычный sqlite3.connect;
+- "WAL + read-only" — connect(): WAL, synchronous=NORMAL, читатели через mode=ro.
+
+Запуск:  python "Parameter Registry Manager/bench_concurrency.py" [-n 20000] [--readers 4] [-t 3]
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_search import populate  # noqa: E402
+from registry_core import Database, connect, safe_json_dumps  # noqa: E402
+
+
+def reader(path: str, wal: bool, long_codes, start, stop, out) -> None:
+    if wal:
+        conn = connect(path, readonly=True)
+    else:
+        conn = sqlite3.connect(path)
+    rnd = random.Random(os.getpid())
+    latencies, errors = [], 0
+    start.wait()
+    while not stop.is_set():
+        code = rnd.choice(long_codes)
+        t0 = time.perf_counter()
+        try:
+            conn.execute("SELECT id, system_unit FROM PARAMETER WHERE long_code=?", (code,)).fetchone()
+        except sqlite3.OperationalError:
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - t0)
+    conn.close()
+    out.put((latencies, errors))
+
+
+def run(n: int, readers: int, duration: float, batch: int, wal: bool) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        db = Database(path)
+        populate(db, n)
+        if not wal:
+            db.conn.execute("PRAGMA journal_mode=DELETE")
+            db.conn.execute("PRAGMA synchronous=FULL")
+        rows = db._execute("SELECT id, long_code FROM PARAMETER").fetchall()
+        pids = [r["id"] for r in rows]
+        long_codes = [r["long_code"] for r in rows]
+
+        ctx = mp.get_context("spawn")
+        start, stop, out = ctx.Event(), ctx.Event(), ctx.Queue()
+        procs = [ctx.Process(target=reader, args=(path, wal, long_codes, start, stop, out)) for _ in range(readers)]
+        for p in procs:
+            p.start()
+
+        start.set()
+        t_end = time.perf_counter() + duration
+        commits, written, i = 0, 0, 0
+        while time.perf_counter() < t_end:
+            chunk = [(safe_json_dumps({"ru": f"правка {i}"}), pid) for pid in pids[i % n:i % n + batch]]
+            with db.transaction():
+                db.executemany("UPDATE PARAMETER SET description=? WHERE id=?", chunk)
+            commits += 1
+            written += len(chunk)
+            i += batch
+        stop.set()
+
+        latencies, errors = [], 0
+        for _ in procs:
+            lat, err = out.get()
+            latencies.extend(lat)
+            errors += err
+        for p in procs:
+            p.join()
+        db.conn.close()
+
+    latencies.sort()
+    return {
+        "reads": len(latencies) / duration,
+        "p50": statistics.median(latencies) if latencies else float("nan"),
+        "p99": latencies[int(len(latencies) * 0.99)] if latencies else float("nan"),
+        "max": latencies[-1] if latencies else float("nan"),
+        "errors": errors,
+        "writes": written / duration,
+        "commits": commits,
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("-n", type=int, default=20000, help="число параметров (по умолчанию 20000)")
+    ap.add_argument("--readers", type=int, default=4, help="процессов-читателей (по умолчанию 4)")
+    ap.add_argument("-t", type=float, default=3.0, help="длительность замера, с")
+    ap.add_argument("--batch", type=int, default=500, help="строк в транзакции писателя")
+    args = ap.parse_args()
+
+    print(f"{args.n} параметров, {args.readers} читателей, {args.t:.0f} с, транзакции по {args.batch} строк")
+    print(f"{'Режим':<18} | {'чтений/с':<9} | {'p50, мкс':<9} | {'p99, мкс':<9} | {'max, мс':<8} | "
+          f"{'ошибок':<6} | {'записей/с':<9}")
+    print("=" * 85)
+    for name, wal in (("rollback-журнал", False), ("WAL + read-only", True)):
+        r = run(args.n, args.readers, args.t, args.batch, wal)
+        print(f"{name:<18} | {r['reads']:<9.0f} | {r['p50'] * 1e6:<9.1f} | {r['p99'] * 1e6:<9.1f} | "
+              f"{r['max'] * 1e3:<8.1f} | {r['errors']:<6} | {r['writes']:<9.0f}")
+
+
+if __name__ == "__main__":
+    main()
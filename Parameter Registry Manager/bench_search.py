@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк поиска в реестре: полнотекстовый индекс FTS5 против LIKE по шести столбцам.
+
+Строит синтетический реестр (по умолчанию 100 000 параметров) во временной БД
+и замеряет ParameterRegistry.list(search) и прежний поиск _list_like(search)
+на наборе типичных запросов, а также первую страницу list_page (то, что ждёт
+список в GUI) против полного list().
+
+Запуск:  python "Parameter Registry Manager/bench_search.py" [-n 100000] [-r 5]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from registry_core import (Database, ParameterRegistry, SEED_COMPONENTS, SEED_LOCATIONS,  # noqa: E402
+                           SEED_MEDIUMS, SEED_METHODS, SEED_QUANTITIES, SEED_STATISTICS, safe_json_dumps)
+
+QUERIES = ["temperature", "inlet compr", "T_12345", "Давление", "mapfit", "nosuchword"]
+
+LABELS_RU = {
+    "temperature": "Температура", "pressure": "Давление", "mass-flow": "Массовый расход",
+    "density": "Плотность", "enthalpy": "Энтальпия", "efficiency": "КПД",
+    "power": "Мощность", "speed": "Скорость", "volume": "Объём",
+}
+
+
+def populate(db: Database, n: int, seed: int = 42) -> None:
+    rnd = random.Random(seed)
+    quantities, mediums = sorted(SEED_QUANTITIES), sorted(SEED_MEDIUMS)
+    locations, components = sorted(SEED_LOCATIONS), sorted(SEED_COMPONENTS)
+    statistics, methods = sorted(SEED_STATISTICS), sorted(SEED_METHODS)
+    rows = []
+    for i in range(n):
+        q = rnd.choice(quantities)
+        method = rnd.choice(methods)
+        long_code = ".".join([q, rnd.choice(mediums), rnd.choice(locations), rnd.choice(components),
+                              f"u-{i}", rnd.choice(statistics), method])
+        rows.append((
+            f"PRM-B{i:08d}", long_code, q, "float64", "scalar", "К", method, f"T_{i}",
+            safe_json_dumps({"ru": f"{LABELS_RU[q]} {i}"}), safe_json_dumps({}),
+            safe_json_dumps([q, rnd.choice(components)]), safe_json_dumps({}), 1, 0, 0,
+        ))
+    with db.transaction():
+        db.executemany("""
+        INSERT INTO PARAMETER(id, long_code, quantity_kind, data_type, shape, system_unit, method_name, short_code, labels,
+                              description, tags, constraints, version_major, version_minor, version_patch)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+
+
+def timeit(func, query: str, repeats: int):
+    best, found = float("inf"), 0
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        found = len(func(query))
+        best = min(best, time.perf_counter() - t0)
+    return best, found
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("-n", type=int, default=100000, help="число параметров (по умолчанию 100000)")
+    ap.add_argument("-r", type=int, default=5, help="повторов на запрос (берётся лучшее время)")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "bench.db"))
+        t0 = time.perf_counter()
+        populate(db, args.n)
+        print(f"Заполнение {args.n} параметров (с индексацией FTS5): {time.perf_counter() - t0:.2f} с\n")
+        reg = ParameterRegistry(db)
+
+        print(f"{'Запрос':<14} | {'FTS5, мс':<10} | {'найдено':<8} | {'LIKE, мс':<10} | {'найдено':<8} | {'ускорение':<9}")
+        print("=" * 75)
+        for q in QUERIES:
+            t_fts, n_fts = timeit(reg.list, q, args.r)
+            t_like, n_like = timeit(reg._list_like, q, args.r)
+            print(f"{q:<14} | {t_fts * 1e3:<10.2f} | {n_fts:<8} | {t_like * 1e3:<10.2f} | {n_like:<8} | x{t_like / t_fts:<8.1f}")
+
+        print(f"\n{'Запрос':<14} | {'list(), мс':<10} | {'1-я страница, мс':<16}")
+        print("=" * 46)
+        for q in ["", *QUERIES[:2]]:
+            t_all, _ = timeit(reg.list, q, args.r)
+            t_page, _ = timeit(lambda s: reg.list_page(s)[0], q, args.r)
+            print(f"{q or '(все)':<14} | {t_all * 1e3:<10.2f} | {t_page * 1e3:<16.2f}")
+        db.conn.close()
+
+    print("\nРазличия в числе найденных записей ожидаемы: FTS5 ищет по словам и префиксам,")
+    print("регистр кириллицы учитывается корректно, а LIKE ищет подстроку и не понижает регистр кириллицы.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк пакетной фиксации транзакций в Database/ParameterRegistry.
+
+Сравнивает два режима на одинаковой нагрузке (создание и обновление N параметров):
+- "commit на оператор" — прежнее поведение: transaction() не группирует операторы,
+  executemany фиксирует каждую строку отдельно;
+- "транзакции" — текущее поведение: одна фиксация на логическую операцию.
+
+Запуск:  python "Parameter Registry Manager/bench_transactions.py" [-n 10000]
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from registry_core import Database, ParameterRegistry  # noqa: E402
+
+
+def _legacy(db: Database) -> None:
+    """Возвращает экземпляру поведение «commit после каждого оператора»."""
+    db.transaction = contextlib.nullcontext
+
+    def executemany(sql, seq_of_params):
+        cur = None
+        for params in seq_of_params:
+            cur = db._execute(sql, params)
+        return cur
+
+    db.executemany = executemany
+
+
+def _param(i: int, minor: int = 0) -> dict:
+    return {
+        "longCode": f"temperature.water.inlet.condenser.bench-{i}",
+        "quantityKind": "thermodynamic-temperature",
+        "systemUnit": "К",
+        "allowedUnits": ["К", "°С", "F"] if minor == 0 else ["К", "°С"],
+        "method": "poly",
+        "shortCode": f"T_{i}",
+        "labels": {"ru": f"Температура {i}"},
+        "tags": ["bench"],
+        "constraints": {"min": 0, "max": 1000 + minor},
+    }
+
+
+def run(n: int, legacy: bool) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "bench.db"))
+        if legacy:
+            _legacy(db)
+        reg = ParameterRegistry(db)
+
+        t0 = time.perf_counter()
+        pids = [reg.create_parameter(_param(i)) for i in range(n)]
+        t_create = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        for i, pid in enumerate(pids):
+            reg.update_parameter(pid, _param(i, minor=1))
+        t_update = time.perf_counter() - t0
+        db.conn.close()
+    return {"create": t_create, "update": t_update}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("-n", type=int, default=10000, help="число параметров (по умолчанию 10000)")
+    args = ap.parse_args()
+
+    results = {
+        "commit на оператор": run(args.n, legacy=True),
+        "транзакции": run(args.n, legacy=False),
+    }
+
+    print(f"Создание и обновление {args.n} параметров (SQLite-файл на диске)")
+    print(f"{'Режим':<22} | {'Создание, с':<12} | {'Обновление, с':<14} | {'мкс/операцию':<12}")
+    print("=" * 70)
+    for name, r in results.items():
+        per_op = (r["create"] + r["update"]) / (2 * args.n) * 1e6
+        print(f"{name:<22} | {r['create']:<12.3f} | {r['update']:<14.3f} | {per_op:<12.1f}")
+    base, new = results["commit на оператор"], results["транзакции"]
+    speedup = (base["create"] + base["update"]) / (new["create"] + new["update"])
+    print(f"\nУскорение: x{speedup:.1f}")
+
+
+if __name__ == "__main__":
+    main()
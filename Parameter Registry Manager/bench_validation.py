@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк валидации реестра: кэш словарей и пакетный validate_all.
+
+Строит синтетический реестр (по умолчанию 50 000 параметров) во временной БД
+и сравнивает три режима:
+- "без кэша" — validate_parameter для каждой строки со сбросом кэша словарей
+  перед каждым вызовом (прежнее поведение: словари читаются из БД заново);
+- "кэш" — validate_parameter для каждой строки, словари из кэша Database;
+- "validate_all" — все параметры за несколько запросов.
+
+Запуск:  python "Parameter Registry Manager/bench_validation.py" [-n 50000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_search import populate  # noqa: E402
+from registry_core import Database, ParameterRegistry  # noqa: E402
+
+
+def run_per_row(reg: ParameterRegistry, pids, cached: bool) -> dict:
+    results = {}
+    for pid in pids:
+        if not cached:
+            reg.db.invalidate_vocab()
+        results[pid] = reg.validate_parameter(pid)
+    return results
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("-n", type=int, default=50000, help="число параметров (по умолчанию 50000)")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "bench.db"))
+        populate(db, args.n)
+        synthetic = [r["id"] for r in db._execute("SELECT id FROM PARAMETER WHERE id LIKE 'PRM-B%'")]
+        db.executemany("INSERT INTO PARAMETER_ALLOWED_UNIT(parameter_id, unit_code) VALUES (?, ?)",
+                       [(pid, u) for pid in synthetic for u in ("К", "°С")])
+        reg = ParameterRegistry(db)
+        pids = [r["id"] for r in reg.list()]
+
+        timings = {}
+        t0 = time.perf_counter()
+        uncached = run_per_row(reg, pids, cached=False)
+        timings["без кэша"] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        cached = run_per_row(reg, pids, cached=True)
+        timings["кэш"] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        batch = reg.validate_all()
+        timings["validate_all"] = time.perf_counter() - t0
+        db.conn.close()
+
+    assert uncached == cached == batch, "результаты режимов различаются"
+    print(f"Валидация {len(pids)} параметров")
+    print(f"{'Режим':<14} | {'Время, с':<9} | {'мкс/параметр':<12} | {'ускорение':<9}")
+    print("=" * 54)
+    base = timings["без кэша"]
+    for name, t in timings.items():
+        print(f"{name:<14} | {t:<9.3f} | {t / len(pids) * 1e6:<12.1f} | x{base / t:<8.1f}")
+
+
+if __name__ == "__main__":
+    main()
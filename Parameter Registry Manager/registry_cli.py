@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Командная строка Parameter Registry Manager (без GUI и без заполнения справочников).
+
+Команды чтения (search, validate-all, export, export-md) открывают БД только для
+чтения; import — соединением-писателем. Несуществующая БД создаётся только с --seed,
+иначе код возврата 2.
+
+Примеры:
+    python registry_cli.py search "temperature inlet"
+    python registry_cli.py --db other.db validate-all --errors-only
+    python registry_cli.py import catalog.jsonl
+    python registry_cli.py export catalog.jsonl --method poly
+    python registry_cli.py export-md poly.md --method poly
+    python registry_cli.py export-md all.md --units
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import List, Optional
+
+from registry_core import Database, ParameterRegistry
+
+DEFAULT_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "registry.db")
+
+
+def cmd_search(reg: ParameterRegistry, args) -> int:
+    rows = reg.list(args.query)
+    if args.limit:
+        rows = rows[:args.limit]
+    for r in rows:
+        if args.json:
+            print(json.dumps({"id": r["id"], "longCode": r["long_code"], "shortCode": r["short_code"] or "",
+                              "method": r["method_name"] or "", "systemUnit": r["system_unit"]},
+                             ensure_ascii=False))
+        else:
+            print("\t".join([r["id"], r["long_code"], r["short_code"] or "", r["system_unit"] or ""]))
+    return 0
+
+
+def cmd_validate_all(reg: ParameterRegistry, args) -> int:
+    n_errors = n_warnings = 0
+    long_codes = {r["id"]: r["long_code"] for r in reg.list()}
+    for pid, res in reg.validate_all().items():
+        n_errors += len(res["errors"])
+        n_warnings += len(res["warnings"])
+        for e in res["errors"]:
+            print(f"ERROR\t{pid}\t{long_codes.get(pid, '')}\t{e}")
+        if not args.errors_only:
+            for w in res["warnings"]:
+                print(f"WARN\t{pid}\t{long_codes.get(pid, '')}\t{w}")
+    print(f"Ошибок: {n_errors}, предупреждений: {n_warnings}", file=sys.stderr)
+    return 1 if n_errors else 0
+
+
+def cmd_import(reg: ParameterRegistry, args) -> int:
+    report = reg.import_jsonl(args.file, batch_size=args.batch_size)
+    for line_no, msg in report["errors"]:
+        print(f"{args.file}:{line_no}: {msg}", file=sys.stderr)
+    print(f"Импортировано {len(report['imported'])} из {report['total']}")
+    return 1 if report["errors"] else 0
+
+
+def cmd_export(reg: ParameterRegistry, args) -> int:
+    n = reg.export_jsonl(args.file, method=args.method)
+    print(f"Выгружено {n} параметров в {args.file}")
+    return 0
+
+
+def cmd_export_md(reg: ParameterRegistry, args) -> int:
+    n = reg.export_markdown(args.file, args.method, with_units=args.units)
+    if not n:
+        print(f"Нет данных для методики '{args.method}'" if args.method else "Реестр пуст", file=sys.stderr)
+        return 1
+    print(f"Сохранено {n} строк в {args.file}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(prog="registry_cli", description="Parameter Registry Manager — командная строка")
+    ap.add_argument("--db", default=DEFAULT_DB, help=f"путь к БД SQLite (по умолчанию {DEFAULT_DB})")
+    ap.add_argument("--seed", action="store_true", help="заполнить справочники и примеры (для новой БД)")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("search", help="поиск параметров")
+    p.add_argument("query", help="строка поиска (слова/префиксы)")
+    p.add_argument("--limit", type=int, default=0, help="не более N результатов")
+    p.add_argument("--json", action="store_true", help="вывод в JSON Lines")
+    p.set_defaults(func=cmd_search, readonly=True)
+
+    p = sub.add_parser("validate-all", help="валидация всех параметров; код возврата 1 при ошибках")
+    p.add_argument("--errors-only", action="store_true", help="не выводить предупреждения")
+    p.set_defaults(func=cmd_validate_all, readonly=True)
+
+    p = sub.add_parser("import", help="импорт определений из JSON Lines")
+    p.add_argument("file")
+    p.add_argument("--batch-size", type=int, default=500)
+    p.set_defaults(func=cmd_import, readonly=False)
+
+    p = sub.add_parser("export", help="экспорт определений в JSON Lines")
+    p.add_argument("file")
+    p.add_argument("--method", default=None, help="только параметры методики")
+    p.set_defaults(func=cmd_export, readonly=True)
+
+    p = sub.add_parser("export-md", help="Markdown-таблица параметров методики")
+    p.add_argument("file")
+    p.add_argument("--method", default=None, help="только параметры методики (по умолчанию все, с колонкой методики)")
+    p.add_argument("--units", action="store_true", help="добавить колонку допустимых единиц")
+    p.set_defaults(func=cmd_export_md, readonly=True)
+    return ap
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if not args.seed and not os.path.isfile(args.db):
+        # Опечатка в --db не должна молча создавать пустой реестр
+        print(f"БД реестра не найдена: {args.db} (новая БД создаётся только с --seed)", file=sys.stderr)
+        return 2
+    # Команды чтения открывают БД только для чтения; seed требует записи
+    db = Database(args.db, seed=args.seed, readonly=args.readonly and not args.seed)
+    try:
+        return args.func(ParameterRegistry(db), args)
+    finally:
+        db.conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
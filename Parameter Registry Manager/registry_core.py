@@ -0,0 +1,1350 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ядро Parameter Registry Manager без графического интерфейса.
+
+Содержит слой хранения (Database), реестр параметров (ParameterRegistry),
+вспомогательные функции и seed-справочники. Модуль не импортирует Tkinter,
+поэтому его можно использовать в пакетных заданиях, CI и расчётных воркерах
+(см. registry_cli.py). Графическое приложение app.py строится поверх него.
+"""
+
+import itertools
+import sqlite3
+import json
+import re
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple
+
+
+# ------------------------- Helpers -------------------------
+
+def now_iso() -> str:
+    return datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def gen_uuid() -> str:
+    return str(uuid.uuid4())
+
+
+def safe_json_loads(s: Optional[str], default):
+    try:
+        if s is None:
+            return default
+        return json.loads(s)
+    except Exception:
+        return default
+
+
+def safe_json_dumps(obj) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def slugify(s: str) -> str:
+    s = (s or "").strip().lower()
+    s = re.sub(r"\s+", "-", s)
+    s = re.sub(r"[^a-z0-9\-]", "-", s)
+    s = re.sub(r"-{2,}", "-", s).strip("-")
+    return s
+
+
+SHORT_CODE_RE = re.compile(r"^[A-Za-z][A-Za-z0-9_]{0,31}$")
+
+
+def param_to_json(row: sqlite3.Row, allowed: List[str]) -> Dict[str, Any]:
+    """Определение параметра для экспорта (JSON/JSONL); названия и описания — только RU."""
+    labels_all = safe_json_loads(row["labels"], {})
+    descr_all = safe_json_loads(row["description"], {})
+    return {
+        "id": row["id"],
+        "longCode": row["long_code"],
+        "labels": {"ru": labels_all.get("ru", "")},
+        "description": {"ru": descr_all.get("ru", "")},
+        "quantityKind": row["quantity_kind"],
+        "dataType": row["data_type"],
+        "shape": row["shape"],
+        "systemUnit": row["system_unit"],
+        "method": row["method_name"] or "",
+        "shortCode": row["short_code"] or "",
+        "allowedUnits": allowed,
+        "tags": safe_json_loads(row["tags"], []),
+        "constraints": safe_json_loads(row["constraints"], {}),
+        "version": f"{row['version_major']}.{row['version_minor']}.{row['version_patch']}",
+    }
+
+
+def md_escape(s: Any) -> str:
+    t = str(s if s is not None else "")
+    t = t.replace("|", "\\|").replace("\n", " ").replace("\r", " ")
+    return t
+
+
+def param_from_json(param_json: Dict[str, Any]) -> Dict[str, Any]:
+    """Экспортированное определение -> словарь для create_parameter (id и версия игнорируются)."""
+    return {
+        "longCode": param_json["longCode"],
+        "quantityKind": param_json.get("quantityKind") or "",
+        "dataType": param_json.get("dataType") or "float64",
+        "shape": param_json.get("shape") or "scalar",
+        "systemUnit": param_json["systemUnit"],
+        "method": param_json.get("method") or "",
+        "shortCode": param_json.get("shortCode") or "",
+        "labels": {"ru": (param_json.get("labels") or {}).get("ru", "")},
+        "description": {"ru": (param_json.get("description") or {}).get("ru", "")},
+        "tags": param_json.get("tags") or [],
+        "constraints": param_json.get("constraints") or {},
+        "allowedUnits": param_json.get("allowedUnits") or [param_json["systemUnit"]],
+    }
+
+
+SEARCH_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Полнотекстовый индекс: столбцы PARAMETER и веса для ранжирования bm25
+FTS_COLUMNS = ("long_code", "short_code", "labels", "tags", "quantity_kind", "method_name")
+FTS_WEIGHTS = (10.0, 8.0, 4.0, 2.0, 1.0, 1.0)
+FTS_JSON_COLUMNS = {"labels", "tags"}
+
+
+def fts_values_sql(ref: str) -> str:
+    """Выражения значений для PARAMETER_FTS; из JSON (labels, tags) индексируются только значения."""
+    exprs = []
+    for col in FTS_COLUMNS:
+        if col in FTS_JSON_COLUMNS:
+            exprs.append(
+                f"CASE WHEN json_valid({ref}.{col}) "
+                f"THEN (SELECT group_concat(value, ' ') FROM json_each({ref}.{col})) "
+                f"ELSE {ref}.{col} END"
+            )
+        else:
+            exprs.append(f"{ref}.{col}")
+    return ", ".join(exprs)
+
+
+# ------------------------- Seed dictionaries (for initial DB fill) -------------------------
+
+SEED_QUANTITIES = {
+    "temperature", "pressure", "mass-flow", "density", "enthalpy",
+    "efficiency", "power", "speed", "volume",
+}
+
+SEED_MEDIUMS = {
+    "air", "gas", "water", "steam"
+}
+
+SEED_LOCATIONS = {
+    "inlet", "outlet", "ambient"
+    # plus node-*, section-*, station-*
+}
+
+SEED_COMPONENTS = {
+    "compressor", "turbine", "pipe", "valve",
+}
+
+SEED_STATES = {"static", "total", "wet", "dry"}
+SEED_STATISTICS = {"mean", "min", "max", "std", "instant", "integral"}
+
+SEED_METHODS = {"poly", "mapfit", "default"}
+
+SEED_DATA_TYPES = {"float64", "int64", "int32", "string", "bool"}
+SEED_SHAPES = {"scalar", "vector", "matrix", "timeseries"}
+
+SEED_QUANTITY_KINDS = {
+    "thermodynamic parameter", "geometry",
+    "thermodynamic-temperature", "pressure", "mass-flow"
+}
+
+
+PAGE_SIZE = 200
+
+
+def fts_query(search: str) -> str:
+    """Строка поиска -> запрос FTS5: все слова обязательны, каждое как префикс."""
+    tokens = SEARCH_TOKEN_RE.findall(search.lower())
+    return " AND ".join(f'"{t}"*' for t in tokens)
+
+
+def fetch_page(conn: sqlite3.Connection, search: str = "", after: Optional[tuple] = None,
+               limit: int = PAGE_SIZE, use_fts: bool = True) -> Tuple[List[sqlite3.Row], Optional[tuple]]:
+    """
+    Страница списка параметров с курсором (keyset pagination) вместо OFFSET.
+
+    Без поиска строки идут по long_code, курсор — (long_code,) последней строки;
+    с поиском FTS5 — по (bm25, long_code), курсор — эта пара. Функция принимает
+    соединение, чтобы её можно было вызывать из фонового потока со своим соединением.
+
+    :return: (строки, курсор следующей страницы или None, если страница последняя).
+    """
+    search = (search or "").strip()
+    query = fts_query(search) if search and use_fts else ""
+    if query:
+        weights = ", ".join(str(w) for w in FTS_WEIGHTS)
+        where, args = ("WHERE (rank, long_code) > (?, ?)", tuple(after)) if after else ("", ())
+        rows = conn.execute(f"""
+            SELECT * FROM (
+                SELECT p.*, bm25(PARAMETER_FTS, {weights}) AS rank FROM PARAMETER_FTS f
+                JOIN PARAMETER p ON p.rowid = f.rowid
+                WHERE PARAMETER_FTS MATCH ?
+            ) {where}
+            ORDER BY rank, long_code LIMIT ?
+        """, (query, *args, limit)).fetchall()
+        next_after = (rows[-1]["rank"], rows[-1]["long_code"]) if len(rows) == limit else None
+        return rows, next_after
+
+    conds, args = [], []
+    if search:
+        like = f"%{search.lower()}%"
+        conds.append("(LOWER(long_code) LIKE ? OR LOWER(IFNULL(short_code,'')) LIKE ? OR LOWER(labels) LIKE ?"
+                     " OR LOWER(tags) LIKE ? OR LOWER(quantity_kind) LIKE ? OR LOWER(IFNULL(method_name,'')) LIKE ?)")
+        args.extend([like] * 6)
+    if after:
+        conds.append("long_code > ?")
+        args.append(after[0])
+    where = ("WHERE " + " AND ".join(conds)) if conds else ""
+    rows = conn.execute(f"SELECT * FROM PARAMETER {where} ORDER BY long_code LIMIT ?", (*args, limit)).fetchall()
+    next_after = (rows[-1]["long_code"],) if len(rows) == limit else None
+    return rows, next_after
+
+
+# ------------------------- Connections -------------------------
+
+# Прагмы каждого соединения. WAL (включается писателем и сохраняется в файле БД)
+# позволяет читателям работать параллельно с записью; synchronous=NORMAL в WAL
+# безопасен для целостности и не делает fsync на каждую фиксацию.
+CONNECTION_PRAGMAS = {
+    "synchronous": "NORMAL",
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -16000,  # КиБ (отрицательное значение), т.е. ~16 МБ
+    "busy_timeout": 5000,  # мс ожидания блокировки вместо немедленного "database is locked"
+    "foreign_keys": "ON",
+}
+
+
+def connect(path: str, readonly: bool = False, check_same_thread: bool = True) -> sqlite3.Connection:
+    """
+    Открывает соединение с БД реестра с настроенными прагмами.
+
+    :param readonly: открыть через URI mode=ro (для расчётных воркеров и фоновых читателей):
+        запись невозможна, режим журнала не меняется. Соединение в режиме autocommit,
+        чтобы неявный BEGIN модуля sqlite3 не удерживал старый снимок БД между запросами.
+    :return: соединение с row_factory = sqlite3.Row.
+    """
+    if readonly:
+        uri = Path(path).absolute().as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, isolation_level=None, check_same_thread=check_same_thread)
+    else:
+        conn = sqlite3.connect(path, check_same_thread=check_same_thread)
+        conn.execute("PRAGMA journal_mode=WAL")
+    conn.row_factory = sqlite3.Row
+    for name, value in CONNECTION_PRAGMAS.items():
+        conn.execute(f"PRAGMA {name}={value}")
+    if readonly:
+        conn.execute("PRAGMA query_only=ON")
+    return conn
+
+
+# ------------------------- Database -------------------------
+
+class Database:
+    def __init__(self, path: str = "registry.db", seed: bool = True, readonly: bool = False):
+        """
+        :param path: путь к файлу SQLite.
+        :param seed: заполнять справочники и примеры при открытии. Для пакетных
+            заданий и CLI передаётся False — открывается только схема.
+        :param readonly: только чтение существующей БД (connect(readonly=True)): схема,
+            режим журнала и индекс FTS не создаются и не меняются, seed игнорируется.
+        """
+        self.path = path
+        self.conn = connect(path, readonly=readonly)
+        self._tx_depth = 0
+        # Кэш контролируемых словарей: ("segment", kind) | ("data_dict", kind) | ("unit", "") -> frozenset
+        self._vocab: Dict[Tuple[str, str], frozenset] = {}
+        if readonly:
+            # Поиск через FTS5, только если индекс уже построен писателем
+            self.has_fts = self._execute(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name='PARAMETER_FTS'").fetchone() is not None
+            return
+        self._init_schema()
+        if not seed:
+            # SEQ нужен для выдачи PID даже в незаполненной БД
+            with self.transaction():
+                self._seed_sequences()
+            return
+        with self.transaction():
+            self._seed_units()
+            self._seed_sequences()
+            self._seed_segments()
+            self._seed_data_dicts()
+            self._seed_examples()
+
+    def open_reader(self, check_same_thread: bool = True) -> sqlite3.Connection:
+        """Отдельное read-only соединение с той же БД (для фоновых потоков и воркеров)."""
+        return connect(self.path, readonly=True, check_same_thread=check_same_thread)
+
+    def _execute(self, sql: str, params: tuple = ()):
+        cur = self.conn.cursor()
+        cur.execute(sql, params)
+        # Внутри transaction() фиксация откладывается до выхода из внешнего блока
+        if self._tx_depth == 0:
+            self.conn.commit()
+        return cur
+
+    def executemany(self, sql: str, seq_of_params):
+        cur = self.conn.cursor()
+        cur.executemany(sql, seq_of_params)
+        if self._tx_depth == 0:
+            self.conn.commit()
+        return cur
+
+    @contextmanager
+    def transaction(self):
+        """
+        Группирует несколько операторов в одну транзакцию (один commit).
+
+        Вложенные блоки оформляются как SAVEPOINT: ошибка внутри вложенного
+        блока откатывает только его изменения, внешняя транзакция продолжается.
+        При исключении во внешнем блоке выполняется полный ROLLBACK, а кэш
+        словарей сбрасывается: он мог запомнить откатываемые изменения.
+
+        Внешний блок открывает транзакцию явным BEGIN: неявный BEGIN модуля
+        sqlite3 выдаётся только перед первым DML, и без него SAVEPOINT
+        вложенного блока, выполненного раньше, стал бы внешней транзакцией —
+        его RELEASE зафиксировал бы изменения до конца внешнего блока.
+        """
+        depth = self._tx_depth
+        savepoint = f"sp_{depth}"
+        if depth > 0:
+            self.conn.execute(f"SAVEPOINT {savepoint}")
+        elif not self.conn.in_transaction:
+            self.conn.execute("BEGIN")
+        self._tx_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._tx_depth -= 1
+            if depth > 0:
+                self.conn.execute(f"ROLLBACK TO {savepoint}")
+                self.conn.execute(f"RELEASE {savepoint}")
+            else:
+                self.conn.rollback()
+            self.invalidate_vocab()
+            raise
+        self._tx_depth -= 1
+        if depth > 0:
+            self.conn.execute(f"RELEASE {savepoint}")
+        else:
+            self.conn.commit()
+
+    def _init_schema(self):
+        self._execute("PRAGMA foreign_keys = ON;")
+        # PARAMETER
+        self._execute("""
+        CREATE TABLE IF NOT EXISTS PARAMETER (
+            id TEXT PRIMARY KEY,
+            long_code TEXT UNIQUE COLLATE NOCASE,
+            quantity_kind TEXT,
+            data_type TEXT,
+            shape TEXT,
+            system_unit TEXT,
+            method_name TEXT,
+            short_code TEXT,
+            labels TEXT, -- json
+            description TEXT, -- json
+            tags TEXT, -- json
+            constraints TEXT, -- json
+            version_major INTEGER,
+            version_minor INTEGER,
+            version_patch INTEGER
+        );
+        """)
+        # MIGRATION: ensure columns exist in old DBs
+        try:
+            cur = self._execute("PRAGMA table_info(PARAMETER)")
+            cols = {r["name"] for r in cur.fetchall()}
+            if "method_name" not in cols:
+                self._execute("ALTER TABLE PARAMETER ADD COLUMN method_name TEXT;")
+            if "short_code" not in cols:
+                self._execute("ALTER TABLE PARAMETER ADD COLUMN short_code TEXT;")
+        except Exception:
+            pass
+        # Unique index for (method_name, short_code)
+        self._execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_param_method_short
+        ON PARAMETER(method_name, short_code);
+        """)
+
+        # UNIT
+        self._execute("""
+        CREATE TABLE IF NOT EXISTS UNIT (
+            code TEXT PRIMARY KEY,
+            dimension TEXT
+        );
+        """)
+        # PARAMETER_ALLOWED_UNIT
+        self._execute("""
+        CREATE TABLE IF NOT EXISTS PARAMETER_ALLOWED_UNIT (
+            parameter_id TEXT,
+            unit_code TEXT,
+            PRIMARY KEY (parameter_id, unit_code),
+            FOREIGN KEY(parameter_id) REFERENCES PARAMETER(id) ON DELETE CASCADE,
+            FOREIGN KEY(unit_code) REFERENCES UNIT(code) ON DELETE CASCADE
+        );
+        """)
+        # Справочник сегментов long code
+        self._execute("""
+        CREATE TABLE IF NOT EXISTS CODE_SEGMENT (
+            kind TEXT NOT NULL,    -- quantity | medium | location | component | state | statistic | method
+            value TEXT NOT NULL,
+            label TEXT,
+            notes TEXT,
+            PRIMARY KEY (kind, value)
+        );
+        """)
+        # Универсальный справочник значений для quantityKind/dataType/shape
+        self._execute("""
+        CREATE TABLE IF NOT EXISTS DATA_DICT (
+            kind TEXT NOT NULL,    -- quantity_kind | data_type | shape
+            value TEXT NOT NULL,
+            label TEXT,
+            notes TEXT,
+            PRIMARY KEY (kind, value)
+        );
+        """)
+        # Последовательности
+        self._execute("""
+        CREATE TABLE IF NOT EXISTS SEQ (
+            name TEXT PRIMARY KEY,
+            value INTEGER
+        );
+        """)
+        self.has_fts = self._init_fts()
+
+    def _init_fts(self) -> bool:
+        """
+        Полнотекстовый индекс PARAMETER_FTS (FTS5, external content) и триггеры синхронизации.
+        Возвращает False, если SQLite собран без FTS5/JSON1 — тогда поиск работает через LIKE.
+        """
+        cur = self._execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='PARAMETER_FTS'")
+        exists = cur.fetchone() is not None
+        cols = ", ".join(FTS_COLUMNS)
+        try:
+            with self.transaction():
+                self._execute(f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS PARAMETER_FTS USING fts5(
+                    {cols}, content='PARAMETER', content_rowid='rowid',
+                    tokenize='unicode61 remove_diacritics 2'
+                );
+                """)
+                self._execute(f"""
+                CREATE TRIGGER IF NOT EXISTS param_fts_ai AFTER INSERT ON PARAMETER BEGIN
+                    INSERT INTO PARAMETER_FTS(rowid, {cols}) VALUES (new.rowid, {fts_values_sql('new')});
+                END;
+                """)
+                self._execute(f"""
+                CREATE TRIGGER IF NOT EXISTS param_fts_ad AFTER DELETE ON PARAMETER BEGIN
+                    INSERT INTO PARAMETER_FTS(PARAMETER_FTS, rowid, {cols}) VALUES ('delete', old.rowid, {fts_values_sql('old')});
+                END;
+                """)
+                self._execute(f"""
+                CREATE TRIGGER IF NOT EXISTS param_fts_au AFTER UPDATE ON PARAMETER BEGIN
+                    INSERT INTO PARAMETER_FTS(PARAMETER_FTS, rowid, {cols}) VALUES ('delete', old.rowid, {fts_values_sql('old')});
+                    INSERT INTO PARAMETER_FTS(rowid, {cols}) VALUES (new.rowid, {fts_values_sql('new')});
+                END;
+                """)
+                # MIGRATION: индекс для уже существующих параметров
+                if not exists:
+                    self.rebuild_search_index()
+        except sqlite3.OperationalError:
+            return False
+        return True
+
+    def rebuild_search_index(self):
+        """Полностью перестраивает PARAMETER_FTS по таблице PARAMETER (например, после VACUUM)."""
+        cols = ", ".join(FTS_COLUMNS)
+        with self.transaction():
+            self._execute("INSERT INTO PARAMETER_FTS(PARAMETER_FTS) VALUES ('delete-all')")
+            self._execute(f"INSERT INTO PARAMETER_FTS(rowid, {cols}) SELECT p.rowid, {fts_values_sql('p')} FROM PARAMETER p")
+
+    def _seed_sequences(self):
+        cur = self._execute("SELECT value FROM SEQ WHERE name='param_seq'")
+        row = cur.fetchone()
+        if row is None:
+            self._execute("INSERT INTO SEQ(name, value) VALUES (?, ?)", ("param_seq", 0))
+
+    def _seed_units(self):
+        # Minimal unit set
+        units = [
+            ("К", "temperature"),
+            ("°С", "temperature"),
+            ("F", "temperature"),
+            ("Па", "pressure"),
+            ("кПа", "pressure"),
+            ("бар", "pressure"),
+            ("МПа", "pressure"),
+            ("кг/с", "mass-flow"),
+            ("кг/ч", "mass-flow"),
+            ("гр/с", "mass-flow")
+        ]
+        self.executemany("INSERT OR IGNORE INTO UNIT(code, dimension) VALUES (?, ?)", units)
+
+    def next_param_pid(self) -> str:
+        self._execute("UPDATE SEQ SET value = value + 1 WHERE name='param_seq'")
+        cur = self._execute("SELECT value FROM SEQ WHERE name='param_seq'")
+        v = cur.fetchone()["value"]
+        return f"PRM-{v:08d}"
+
+    def reserve_param_pids(self, count: int) -> List[str]:
+        """Резервирует сразу count идентификаторов PID (одно обновление SEQ)."""
+        if count <= 0:
+            return []
+        with self.transaction():
+            self._execute("UPDATE SEQ SET value = value + ? WHERE name='param_seq'", (count,))
+            last = self._execute("SELECT value FROM SEQ WHERE name='param_seq'").fetchone()["value"]
+        return [f"PRM-{v:08d}" for v in range(last - count + 1, last + 1)]
+
+    def _seed_segments(self):
+        # Seed only if empty
+        cur = self._execute("SELECT COUNT(*) AS cnt FROM CODE_SEGMENT")
+        if cur.fetchone()["cnt"] > 0:
+            # ensure method kind exists and seeded minimally
+            self.executemany(
+                "INSERT OR IGNORE INTO CODE_SEGMENT(kind, value, label, notes) VALUES (?, ?, ?, ?)",
+                [("method", m, "", "") for m in sorted(SEED_METHODS)]
+            )
+            return
+
+        def ins(kind: str, items: set):
+            self.executemany(
+                "INSERT OR IGNORE INTO CODE_SEGMENT(kind, value, label, notes) VALUES (?, ?, ?, ?)",
+                [(kind, v, "", "") for v in sorted(items)]
+            )
+
+        ins("quantity", SEED_QUANTITIES)
+        ins("medium", SEED_MEDIUMS)
+        ins("location", SEED_LOCATIONS)
+        ins("component", SEED_COMPONENTS)
+        ins("state", SEED_STATES)
+        ins("statistic", SEED_STATISTICS)
+        ins("method", SEED_METHODS)
+
+    # DATA_DICT helpers
+    def _seed_data_dicts(self):
+        rows = [("quantity_kind", v, "", "") for v in sorted(SEED_QUANTITY_KINDS)]
+        rows += [("data_type", v, "", "") for v in sorted(SEED_DATA_TYPES)]
+        rows += [("shape", v, "", "") for v in sorted(SEED_SHAPES)]
+        self.executemany("INSERT OR IGNORE INTO DATA_DICT(kind, value, label, notes) VALUES (?, ?, ?, ?)", rows)
+
+    def list_segment_values(self, kind: str) -> List[str]:
+        cur = self._execute("SELECT value FROM CODE_SEGMENT WHERE kind=? ORDER BY value", (kind,))
+        return [r["value"] for r in cur.fetchall()]
+
+    def list_segments(self, kind: str) -> List[sqlite3.Row]:
+        cur = self._execute("SELECT kind, value, label, notes FROM CODE_SEGMENT WHERE kind=? ORDER BY value", (kind,))
+        return cur.fetchall()
+
+    def add_segment(self, kind: str, value: str, label: str = "", notes: str = ""):
+        self._execute(
+            "INSERT INTO CODE_SEGMENT(kind, value, label, notes) VALUES (?, ?, ?, ?)",
+            (kind, value, label, notes)
+        )
+        self.invalidate_vocab()
+
+    def update_segment(self, kind: str, old_value: str, new_value: str, label: str = "", notes: str = ""):
+        self._execute(
+            "UPDATE CODE_SEGMENT SET value=?, label=?, notes=? WHERE kind=? AND value=?",
+            (new_value, label, notes, kind, old_value)
+        )
+        self.invalidate_vocab()
+
+    def delete_segment(self, kind: str, value: str):
+        self._execute("DELETE FROM CODE_SEGMENT WHERE kind=? AND value=?", (kind, value))
+        self.invalidate_vocab()
+
+    # DATA_DICT methods
+    def list_data_dict_values(self, kind: str) -> List[str]:
+        cur = self._execute("SELECT value FROM DATA_DICT WHERE kind=? ORDER BY value", (kind,))
+        return [r["value"] for r in cur.fetchall()]
+
+    def list_data_dict(self, kind: str) -> List[sqlite3.Row]:
+        cur = self._execute("SELECT kind, value, label, notes FROM DATA_DICT WHERE kind=? ORDER BY value", (kind,))
+        return cur.fetchall()
+
+    def add_data_dict(self, kind: str, value: str, label: str = "", notes: str = ""):
+        self._execute("INSERT INTO DATA_DICT(kind, value, label, notes) VALUES (?, ?, ?, ?)", (kind, value, label, notes))
+        self.invalidate_vocab()
+
+    def update_data_dict(self, kind: str, old_value: str, new_value: str, label: str = "", notes: str = ""):
+        self._execute("UPDATE DATA_DICT SET value=?, label=?, notes=? WHERE kind=? AND value=?",
+                      (new_value, label, notes, kind, old_value))
+        self.invalidate_vocab()
+
+    def delete_data_dict(self, kind: str, value: str):
+        self._execute("DELETE FROM DATA_DICT WHERE kind=? AND value=?", (kind, value))
+        self.invalidate_vocab()
+
+    # Vocabulary cache
+    def invalidate_vocab(self):
+        """Сбрасывает кэш словарей; вызывается при любом изменении сегментов, DATA_DICT и UNIT."""
+        self._vocab.clear()
+
+    def _cached_vocab(self, key: Tuple[str, str], sql: str, params: tuple = ()) -> frozenset:
+        values = self._vocab.get(key)
+        if values is None:
+            values = frozenset(r[0] for r in self._execute(sql, params).fetchall())
+            self._vocab[key] = values
+        return values
+
+    def segment_vocab(self, kind: str) -> frozenset:
+        return self._cached_vocab(("segment", kind), "SELECT value FROM CODE_SEGMENT WHERE kind=?", (kind,))
+
+    def data_dict_vocab(self, kind: str) -> frozenset:
+        return self._cached_vocab(("data_dict", kind), "SELECT value FROM DATA_DICT WHERE kind=?", (kind,))
+
+    def unit_codes(self) -> frozenset:
+        return self._cached_vocab(("unit", ""), "SELECT code FROM UNIT")
+
+    # UNIT methods
+    def list_units(self) -> List[sqlite3.Row]:
+        cur = self._execute("SELECT code, dimension FROM UNIT ORDER BY code")
+        return cur.fetchall()
+
+    def get_unit(self, code: str) -> Optional[sqlite3.Row]:
+        cur = self._execute("SELECT code, dimension FROM UNIT WHERE code=?", (code,))
+        return cur.fetchone()
+
+    def add_unit(self, code: str, dimension: str = ""):
+        if self.get_unit(code):
+            raise ValueError(f"Единица '{code}' уже существует")
+        self._execute("INSERT INTO UNIT(code, dimension) VALUES (?, ?)", (code, dimension))
+        self.invalidate_vocab()
+
+    def delete_unit(self, code: str):
+        self._execute("DELETE FROM UNIT WHERE code=?", (code,))
+        self.invalidate_vocab()
+
+    def rename_unit_with_dimension(self, old_code: str, new_code: str, dimension: str):
+        if old_code == new_code:
+            self._execute("UPDATE UNIT SET dimension=? WHERE code=?", (dimension, old_code))
+            self.invalidate_vocab()
+            return
+        cur_old = self._execute("SELECT code FROM UNIT WHERE code=?", (old_code,))
+        if not cur_old.fetchone():
+            raise ValueError(f"Единица '{old_code}' не найдена")
+        cur_new = self._execute("SELECT code FROM UNIT WHERE code=?", (new_code,))
+        if cur_new.fetchone():
+            raise ValueError(f"Единица с кодом '{new_code}' уже существует")
+
+        with self.transaction():
+            self._execute("INSERT INTO UNIT(code, dimension) VALUES (?, ?)", (new_code, dimension))
+            # Update references
+            self._execute("UPDATE PARAMETER SET system_unit=? WHERE system_unit=?", (new_code, old_code))
+            self._execute("UPDATE PARAMETER_ALLOWED_UNIT SET unit_code=? WHERE unit_code=?", (new_code, old_code))
+            # Remove old
+            self._execute("DELETE FROM UNIT WHERE code=?", (old_code,))
+        self.invalidate_vocab()
+
+    def _seed_examples(self):
+        # Seed example parameters if DB is empty
+        cur = self._execute("SELECT COUNT(*) AS cnt FROM PARAMETER")
+        if cur.fetchone()["cnt"] > 0:
+            return
+
+        # Example 1: Inlet temperature
+        pid1 = self.next_param_pid()
+        self._execute("""
+        INSERT INTO PARAMETER(id, long_code, quantity_kind, data_type, shape, system_unit, method_name, short_code, labels, description,
+                              tags, constraints, version_major, version_minor, version_patch)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            pid1,
+            "temperature.gas.inlet.compressor.k-101.total.mean.poly",
+            "thermodynamic-temperature",
+            "float64",
+            "scalar",
+            "К",
+            "poly",
+            "T_in",
+            safe_json_dumps({"en": "Inlet total temperature K-101", "ru": "Температура на входе (полная) K-101"}),
+            safe_json_dumps({"en": "", "ru": "Полная температура газа на входе компрессора K-101"}),
+            safe_json_dumps(["thermo", "compressor", "inlet"]),
+            safe_json_dumps({"min": 0, "max": 2000}),
+            1, 0, 0
+        ))
+        self.executemany("INSERT INTO PARAMETER_ALLOWED_UNIT(parameter_id, unit_code) VALUES (?, ?)",
+                         [(pid1, u) for u in ["К", "°С", "F"]])
+
+        # Example 2: Outlet pressure
+        pid2 = self.next_param_pid()
+        self._execute("""
+        INSERT INTO PARAMETER(id, long_code, quantity_kind, data_type, shape, system_unit, method_name, short_code, labels, description,
+                              tags, constraints, version_major, version_minor, version_patch)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            pid2,
+            "pressure.gas.outlet.compressor.k-101.static.mean.mapfit",
+            "pressure",
+            "float64",
+            "scalar",
+            "Па",
+            "mapfit",
+            "P_out",
+            safe_json_dumps({"en": "Outlet static pressure K-101", "ru": "Давление на выходе (статическое) K-101"}),
+            safe_json_dumps({"en": "", "ru": ""}),
+            safe_json_dumps(["compressor", "outlet"]),
+            safe_json_dumps({"min": 0, "max": 1e9}),
+            1, 0, 0
+        ))
+        self.executemany("INSERT INTO PARAMETER_ALLOWED_UNIT(parameter_id, unit_code) VALUES (?, ?)",
+                         [(pid2, u) for u in ["Па", "кПа", "бар", "МПа"]])
+
+        # Example 3: Mass-flow
+        pid3 = self.next_param_pid()
+        self._execute("""
+        INSERT INTO PARAMETER(id, long_code, quantity_kind, data_type, shape, system_unit, method_name, short_code, labels, description,
+                              tags, constraints, version_major, version_minor, version_patch)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            pid3,
+            "mass-flow.gas.inlet.compressor.k-101.mean.poly",
+            "mass-flow",
+            "float64",
+            "scalar",
+            "кг/с",
+            "poly",
+            "mdot_in",
+            safe_json_dumps({"en": "Inlet mass flow K-101", "ru": "Массовый расход на входе K-101"}),
+            safe_json_dumps({"en": "", "ru": ""}),
+            safe_json_dumps(["compressor", "inlet"]),
+            safe_json_dumps({"min": 0, "max": 1e5}),
+            1, 0, 0
+        ))
+        self.executemany("INSERT INTO PARAMETER_ALLOWED_UNIT(parameter_id, unit_code) VALUES (?, ?)",
+                         [(pid3, u) for u in ["кг/с", "кг/ч", "гр/с"]])
+
+
+# ------------------------- Parameter Registry -------------------------
+
+class ParameterRegistry:
+    LONG_CODE_RE = re.compile(r"^[a-z0-9-]+(\.[a-z0-9-]+)*$")
+
+    def __init__(self, db: Database, check_cache: bool = False):
+        """
+        :param check_cache: режим проверки для тестов — после каждого изменения кэш
+            сверяется с БД (verify_cache), расхождение -> RuntimeError.
+        """
+        self.db = db
+        self.check_cache = check_cache
+        # long2pid: long code в нижнем регистре -> pid; pid2row: pid -> строка PARAMETER.
+        # Загружается при первом обращении: поиск и выгрузки (CLI) кэш не используют
+        self._cache_data: Optional[Dict[str, Dict[str, Any]]] = None
+
+    @property
+    def _cache(self) -> Dict[str, Dict[str, Any]]:
+        if self._cache_data is None:
+            self._cache_data = {"long2pid": {}, "pid2row": {}}
+            self._cache_load("SELECT * FROM PARAMETER")
+        return self._cache_data
+
+    def refresh_cache(self):
+        """Сброс кэша (после отката внешней транзакции); перезагрузка — при следующем обращении."""
+        self._cache_data = None
+
+    def _cache_load(self, sql: str, params: tuple = ()):
+        """Добавляет/обновляет в кэше строки PARAMETER, выбранные запросом."""
+        if self._cache_data is None:
+            return  # кэш ещё не загружен — строки попадут в него при первом обращении
+        for row in self.db._execute(sql, params).fetchall():
+            self._cache_drop(row["id"])
+            self._cache["long2pid"][row["long_code"].lower()] = row["id"]
+            self._cache["pid2row"][row["id"]] = row
+
+    def _cache_drop(self, pid: str):
+        if self._cache_data is None:
+            return
+        row = self._cache["pid2row"].pop(pid, None)
+        if row is not None:
+            self._cache["long2pid"].pop(row["long_code"].lower(), None)
+
+    def _cache_changed(self):
+        if self.check_cache:
+            problems = self.verify_cache()
+            if problems:
+                raise RuntimeError("Кэш реестра расходится с БД: " + "; ".join(problems[:5]))
+
+    def verify_cache(self) -> List[str]:
+        """Сверяет кэш с таблицей PARAMETER; возвращает список расхождений (пустой — кэш согласован)."""
+        problems = []
+        rows = {r["id"]: r for r in self.db._execute("SELECT * FROM PARAMETER")}
+        cached = self._cache["pid2row"]
+        for pid in rows.keys() - cached.keys():
+            problems.append(f"{pid}: нет в кэше")
+        for pid in cached.keys() - rows.keys():
+            problems.append(f"{pid}: удалён из БД, но остался в кэше")
+        for pid in rows.keys() & cached.keys():
+            if tuple(rows[pid]) != tuple(cached[pid]):
+                problems.append(f"{pid}: устаревшая строка в кэше")
+        expected = {r["long_code"].lower(): pid for pid, r in rows.items()}
+        if expected != self._cache["long2pid"]:
+            problems.append("индекс long2pid не совпадает с БД")
+        return problems
+
+    def getById(self, pid: str) -> Optional[sqlite3.Row]:
+        cur = self.db._execute("SELECT * FROM PARAMETER WHERE id=?", (pid,))
+        return cur.fetchone()
+
+    def getByLongCode(self, code: str) -> Optional[sqlite3.Row]:
+        pid = self._cache["long2pid"].get((code or "").lower())
+        return self._cache["pid2row"][pid] if pid else None
+
+    def list(self, search: str = "") -> List[sqlite3.Row]:
+        search = (search or "").strip()
+        if not search:
+            cur = self.db._execute("SELECT * FROM PARAMETER ORDER BY long_code")
+            return cur.fetchall()
+        query = fts_query(search) if self.db.has_fts else ""
+        if not query:
+            return self._list_like(search)
+        weights = ", ".join(str(w) for w in FTS_WEIGHTS)
+        cur = self.db._execute(f"""
+            SELECT p.* FROM PARAMETER_FTS f
+            JOIN PARAMETER p ON p.rowid = f.rowid
+            WHERE PARAMETER_FTS MATCH ?
+            ORDER BY bm25(PARAMETER_FTS, {weights}), p.long_code
+        """, (query,))
+        return cur.fetchall()
+
+    def list_page(self, search: str = "", after: Optional[tuple] = None,
+                  limit: int = PAGE_SIZE) -> Tuple[List[sqlite3.Row], Optional[tuple]]:
+        """Постраничный list(): см. fetch_page."""
+        return fetch_page(self.db.conn, search, after, limit, use_fts=self.db.has_fts)
+
+    def _list_like(self, search: str) -> List[sqlite3.Row]:
+        """Поиск подстрокой (LIKE) — запасной вариант без FTS5."""
+        like = f"%{search.lower()}%"
+        cur = self.db._execute("""
+            SELECT * FROM PARAMETER
+            WHERE LOWER(long_code) LIKE ?
+               OR LOWER(IFNULL(short_code,'')) LIKE ?
+               OR LOWER(labels) LIKE ?
+               OR LOWER(tags) LIKE ?
+               OR LOWER(quantity_kind) LIKE ?
+               OR LOWER(IFNULL(method_name,'')) LIKE ?
+            ORDER BY long_code
+        """, (like, like, like, like, like, like))
+        return cur.fetchall()
+
+    def allowedUnits(self, pid: str) -> List[str]:
+        cur = self.db._execute("SELECT unit_code FROM PARAMETER_ALLOWED_UNIT WHERE parameter_id=? ORDER BY unit_code", (pid,))
+        return [r["unit_code"] for r in cur.fetchall()]
+
+    def systemUnit(self, pid: str) -> str:
+        row = self._cache["pid2row"].get(pid)
+        if not row:
+            raise KeyError("Параметр не найден")
+        return row["system_unit"]
+
+    def is_short_code_unique(self, method: Optional[str], short_code: Optional[str], exclude_pid: Optional[str] = None) -> bool:
+        sc = (short_code or "").strip()
+        m = (method or "").strip()
+        if sc == "" or m == "":
+            # Uniqueness not enforced when method or short code is empty
+            return True
+        if exclude_pid:
+            cur = self.db._execute(
+                "SELECT id FROM PARAMETER WHERE method_name=? AND short_code=? AND id<>?",
+                (m, sc, exclude_pid)
+            )
+        else:
+            cur = self.db._execute(
+                "SELECT id FROM PARAMETER WHERE method_name=? AND short_code=?",
+                (m, sc)
+            )
+        return cur.fetchone() is None
+
+    def create_parameter(self, param: Dict[str, Any]) -> str:
+        # pre-check short code uniqueness when provided
+        if not self.is_short_code_unique(param.get("method"), param.get("shortCode")):
+            raise ValueError("Короткий код уже используется в этой методике")
+
+        with self.db.transaction():
+            pid = self.db.next_param_pid()
+            # Начинаем всегда с 1.0.0 (автоматическая регистрация версий)
+            vmaj, vmin, vpat = 1, 0, 0
+            self.db._execute("""
+            INSERT INTO PARAMETER(id, long_code, quantity_kind, data_type, shape, system_unit, method_name, short_code, labels, description,
+                                  tags, constraints, version_major, version_minor, version_patch)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                pid,
+                param["longCode"],
+                param.get("quantityKind") or "",
+                param.get("dataType") or "float64",
+                param.get("shape") or "scalar",
+                param["systemUnit"],
+                param.get("method") or None,
+                (param.get("shortCode") or None),
+                safe_json_dumps(param.get("labels") or {}),
+                safe_json_dumps(param.get("description") or {}),
+                safe_json_dumps(param.get("tags") or []),
+                safe_json_dumps(param.get("constraints") or {}),
+                vmaj, vmin, vpat
+            ))
+            self.db.executemany("INSERT INTO PARAMETER_ALLOWED_UNIT(parameter_id, unit_code) VALUES (?, ?)",
+                                [(pid, u) for u in param.get("allowedUnits", [])])
+        self._cache_load("SELECT * FROM PARAMETER WHERE id=?", (pid,))
+        self._cache_changed()
+        return pid
+
+    def update_parameter(self, pid: str, param: Dict[str, Any]) -> None:
+        row = self.getById(pid)
+        if not row:
+            raise KeyError("Параметр не найден")
+
+        # pre-check short code uniqueness when provided
+        if not self.is_short_code_unique(param.get("method"), param.get("shortCode"), exclude_pid=pid):
+            raise ValueError("Короткий код уже используется в этой методике")
+
+        allowed_old = sorted(self.allowedUnits(pid))
+
+        def norm_labels(x):
+            return safe_json_loads(x, {}) if isinstance(x, str) else (x or {})
+
+        def norm_descr(x):
+            return safe_json_loads(x, {}) if isinstance(x, str) else (x or {})
+
+        def norm_tags(x):
+            t = safe_json_loads(x, []) if isinstance(x, str) else (x or [])
+            return sorted(set(map(str, t)))
+
+        def norm_constraints(x):
+            return safe_json_loads(x, {}) if isinstance(x, str) else (x or {})
+
+        old_snap = {
+            "longCode": row["long_code"],
+            "quantityKind": row["quantity_kind"],
+            "dataType": row["data_type"],
+            "shape": row["shape"],
+            "systemUnit": row["system_unit"],
+            "method": row["method_name"] or "",
+            "shortCode": row["short_code"] or "",
+            "labels": norm_labels(row["labels"]),
+            "description": norm_descr(row["description"]),
+            "tags": norm_tags(row["tags"]),
+            "constraints": norm_constraints(row["constraints"]),
+            "allowedUnits": allowed_old,
+        }
+
+        new_snap = {
+            "longCode": param["longCode"],
+            "quantityKind": param.get("quantityKind") or "",
+            "dataType": param.get("dataType") or "float64",
+            "shape": param.get("shape") or "scalar",
+            "systemUnit": param["systemUnit"],
+            "method": param.get("method") or "",
+            "shortCode": param.get("shortCode") or "",
+            "labels": param.get("labels") or {},
+            "description": param.get("description") or {},
+            "tags": sorted(set(map(str, param.get("tags") or []))),
+            "constraints": param.get("constraints") or {},
+            "allowedUnits": sorted(param.get("allowedUnits") or []),
+        }
+
+        changed = safe_json_dumps(old_snap) != safe_json_dumps(new_snap)
+
+        # Авто‑версионирование: +0.1 при изменениях, patch = 0
+        vmaj = int(row["version_major"] or 1)
+        vmin = int(row["version_minor"] or 0)
+        vpat = 0
+        if changed:
+            vmin += 1
+
+        with self.db.transaction():
+            self.db._execute("""
+            UPDATE PARAMETER SET 
+                long_code=?, quantity_kind=?, data_type=?, shape=?, system_unit=?, method_name=?, short_code=?, labels=?, description=?,
+                tags=?, constraints=?, version_major=?, version_minor=?, version_patch=?
+            WHERE id=?
+            """, (
+                param["longCode"],
+                param.get("quantityKind") or "",
+                param.get("dataType") or "float64",
+                param.get("shape") or "scalar",
+                param["systemUnit"],
+                param.get("method") or None,
+                (param.get("shortCode") or None),
+                safe_json_dumps(param.get("labels") or {}),
+                safe_json_dumps(param.get("description") or {}),
+                safe_json_dumps(param.get("tags") or []),
+                safe_json_dumps(param.get("constraints") or {}),
+                vmaj, vmin, vpat,
+                pid
+            ))
+            self.db._execute("DELETE FROM PARAMETER_ALLOWED_UNIT WHERE parameter_id=?", (pid,))
+            self.db.executemany("INSERT INTO PARAMETER_ALLOWED_UNIT(parameter_id, unit_code) VALUES (?, ?)",
+                                [(pid, u) for u in param.get("allowedUnits", [])])
+        self._cache_load("SELECT * FROM PARAMETER WHERE id=?", (pid,))
+        self._cache_changed()
+
+    def delete_parameter(self, pid: str):
+        self.db._execute("DELETE FROM PARAMETER WHERE id=?", (pid,))
+        self._cache_drop(pid)
+        self._cache_changed()
+
+    def rename_unit(self, old_code: str, new_code: str, dimension: str):
+        """Database.rename_unit_with_dimension + обновление кэша у параметров с этой системной единицей."""
+        self.db.rename_unit_with_dimension(old_code, new_code, dimension)
+        if old_code != new_code:
+            self._cache_load("SELECT * FROM PARAMETER WHERE system_unit=?", (new_code,))
+        self._cache_changed()
+
+    def list_methods(self) -> List[str]:
+        """Методики из справочника сегментов; если он пуст — встречающиеся в параметрах."""
+        methods = sorted(set(self.db.list_segment_values("method")))
+        if not methods:
+            cur = self.db._execute("SELECT DISTINCT method_name FROM PARAMETER WHERE method_name IS NOT NULL ORDER BY method_name")
+            methods = [r["method_name"] for r in cur.fetchall()]
+        return methods
+
+    def export_markdown(self, path: str, method: Optional[str], with_units: bool = False) -> int:
+        """
+        Сохраняет Markdown-таблицу параметров методики (method=None — всех методик, с колонкой
+        «Методика»). Параметры и allowedUnits выбираются одним запросом с GROUP_CONCAT,
+        строки пишутся в файл по мере чтения курсора. Возвращает число строк таблицы;
+        если параметров нет, файл не создаётся и возвращается 0.
+        """
+        where, args = ("WHERE p.method_name=?", (method,)) if method is not None else ("", ())
+        cur = self.db._execute(f"""
+            SELECT p.method_name, p.labels, p.system_unit, p.short_code, p.long_code, u.units
+            FROM PARAMETER p
+            LEFT JOIN (
+                SELECT parameter_id, GROUP_CONCAT(unit_code, ', ') AS units
+                FROM (SELECT parameter_id, unit_code FROM PARAMETER_ALLOWED_UNIT ORDER BY parameter_id, unit_code)
+                GROUP BY parameter_id
+            ) u ON u.parameter_id = p.id
+            {where}
+            ORDER BY p.long_code
+        """, args)
+        first = cur.fetchone()
+        if first is None:
+            return 0
+
+        headers = ["Название", "Системная ед.", "Короткий код", "Длинный код"]
+        if with_units:
+            headers.insert(2, "Допустимые ед.")
+        if method is None:
+            headers.insert(0, "Методика")
+
+        n = 0
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("| " + " | ".join(headers) + " |\n")
+            f.write("| " + " | ".join([":---:"] * len(headers)) + " |\n")
+            for r in itertools.chain([first], cur):
+                labels = safe_json_loads(r["labels"], {})
+                row_vals = [
+                    md_escape(labels.get("ru", "")),
+                    md_escape(r["system_unit"]),
+                    md_escape(r["short_code"] or ""),
+                    md_escape(r["long_code"])
+                ]
+                if with_units:
+                    row_vals.insert(2, md_escape(r["units"] or ""))
+                if method is None:
+                    row_vals.insert(0, md_escape(r["method_name"] or ""))
+                f.write("| " + " | ".join(row_vals) + " |\n")
+                n += 1
+        return n
+
+    # ---------------- Bulk JSON Lines import/export ----------------
+
+    def export_jsonl(self, path: str, method: Optional[str] = None) -> int:
+        """
+        Выгружает параметры (все или одной методики) в JSON Lines: одно определение на строку,
+        в том же формате, что и одиночный экспорт JSON. Возвращает число записей.
+        """
+        where, args = ("WHERE p.method_name=?", (method,)) if method else ("", ())
+        allowed: Dict[str, List[str]] = {}
+        cur = self.db._execute(f"""
+            SELECT a.parameter_id, a.unit_code FROM PARAMETER_ALLOWED_UNIT a
+            JOIN PARAMETER p ON p.id = a.parameter_id {where}
+            ORDER BY a.parameter_id, a.unit_code
+        """, args)
+        for r in cur:
+            allowed.setdefault(r["parameter_id"], []).append(r["unit_code"])
+
+        count = 0
+        cur = self.db._execute(f"SELECT p.* FROM PARAMETER p {where} ORDER BY p.long_code", args)
+        with open(path, "w", encoding="utf-8") as f:
+            for row in cur:
+                f.write(json.dumps(param_to_json(row, allowed.get(row["id"], [])), ensure_ascii=False))
+                f.write("\n")
+                count += 1
+        return count
+
+    def import_jsonl(self, path: str, batch_size: int = 500) -> Dict[str, Any]:
+        """
+        Загружает определения параметров из JSON Lines.
+
+        Строки читаются потоково и проверяются пакетами по batch_size; уникальность long code
+        и shortCode в методике проверяется по множествам, загруженным одним запросом.
+        Весь импорт идёт в одной транзакции: пакеты и построчные повторы — её точки
+        сохранения, поэтому прерванный импорт не оставляет ни строк, ни выданных PID.
+        Ошибочные строки пропускаются и попадают в отчёт.
+
+        :return: {"total": N, "imported": [pid, ...], "errors": [(номер строки, текст), ...]}
+        """
+        report = {"total": 0, "imported": [], "errors": []}
+        units = {r["code"] for r in self.db._execute("SELECT code FROM UNIT")}
+        long_codes = {r["lc"] for r in self.db._execute("SELECT LOWER(long_code) AS lc FROM PARAMETER")}
+        short_codes = {
+            (r["method_name"], r["short_code"]) for r in self.db._execute(
+                "SELECT method_name, short_code FROM PARAMETER WHERE method_name IS NOT NULL AND short_code IS NOT NULL"
+            )
+        }
+
+        try:
+            with self.db.transaction(), open(path, "r", encoding="utf-8") as f:
+                batch = []
+                for line_no, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    report["total"] += 1
+                    batch.append((line_no, line))
+                    if len(batch) >= batch_size:
+                        self._import_batch(batch, units, long_codes, short_codes, report)
+                        batch = []
+                if batch:
+                    self._import_batch(batch, units, long_codes, short_codes, report)
+        except BaseException:
+            # Транзакция откатана — строки, уже добавленные в кэш, недействительны
+            self.refresh_cache()
+            raise
+        self._cache_changed()
+        return report
+
+    def _import_batch(self, batch, units, long_codes, short_codes, report):
+        valid = []
+        for line_no, line in batch:
+            try:
+                param = param_from_json(json.loads(line))
+            except (ValueError, KeyError, TypeError, AttributeError) as ex:
+                report["errors"].append((line_no, f"Некорректное определение: {ex}"))
+                continue
+            errors = self._check_import_row(param, units, long_codes, short_codes)
+            if errors:
+                report["errors"].append((line_no, "; ".join(errors)))
+                continue
+            long_codes.add(param["longCode"].lower())
+            if param["method"] and param["shortCode"]:
+                short_codes.add((param["method"], param["shortCode"]))
+            valid.append((line_no, param))
+
+        pids = self.db.reserve_param_pids(len(valid))
+        rows = [(pid, param) for pid, (_, param) in zip(pids, valid)]
+        try:
+            with self.db.transaction():
+                self._insert_rows(rows)
+        except sqlite3.DatabaseError:
+            # Пакет целиком не прошёл — повторяем построчно, чтобы найти виновные строки
+            rows = []
+            for pid, (line_no, param) in zip(pids, valid):
+                try:
+                    with self.db.transaction():
+                        self._insert_rows([(pid, param)])
+                    rows.append((pid, param))
+                except sqlite3.DatabaseError as ex:
+                    report["errors"].append((line_no, f"Ошибка БД: {ex}"))
+        report["imported"].extend(pid for pid, _ in rows)
+        if rows:
+            first, last = min(pid for pid, _ in rows), max(pid for pid, _ in rows)
+            self._cache_load("SELECT * FROM PARAMETER WHERE id BETWEEN ? AND ?", (first, last))
+
+    def _check_import_row(self, param, units, long_codes, short_codes) -> List[str]:
+        errors, _ = self.validate_long_code(param["longCode"])
+        if param["longCode"].lower() in long_codes:
+            errors.append(f"longCode '{param['longCode']}' уже существует")
+        method, sc = param["method"], param["shortCode"]
+        if sc and not SHORT_CODE_RE.match(sc):
+            errors.append("shortCode должен начинаться с буквы и содержать до 32 символов [A-Za-z0-9_]")
+        elif sc and method and (method, sc) in short_codes:
+            errors.append(f"shortCode '{sc}' уже используется в методике '{method}'")
+        missing = [u for u in [param["systemUnit"], *param["allowedUnits"]] if u not in units]
+        if missing:
+            errors.append(f"Единицы отсутствуют в справочнике UNIT: {', '.join(sorted(set(missing)))}")
+        return errors
+
+    def _insert_rows(self, rows: List[Tuple[str, Dict[str, Any]]]):
+        self.db.executemany("""
+        INSERT INTO PARAMETER(id, long_code, quantity_kind, data_type, shape, system_unit, method_name, short_code, labels, description,
+                              tags, constraints, version_major, version_minor, version_patch)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1, 0, 0)
+        """, [(
+            pid,
+            param["longCode"],
+            param["quantityKind"],
+            param["dataType"],
+            param["shape"],
+            param["systemUnit"],
+            param["method"] or None,
+            param["shortCode"] or None,
+            safe_json_dumps(param["labels"]),
+            safe_json_dumps(param["description"]),
+            safe_json_dumps(param["tags"]),
+            safe_json_dumps(param["constraints"]),
+        ) for pid, param in rows])
+        self.db.executemany(
+            "INSERT INTO PARAMETER_ALLOWED_UNIT(parameter_id, unit_code) VALUES (?, ?)",
+            [(pid, u) for pid, param in rows for u in dict.fromkeys(param["allowedUnits"])]
+        )
+
+    def validate_long_code(self, code: str) -> Tuple[List[str], List[str]]:
+        errors = []
+        warnings = []
+        code = (code or "").strip()
+        if not code:
+            errors.append("longCode пуст")
+            return errors, warnings
+
+        if len(code) > 200:
+            errors.append("longCode превышает максимальную длину 200")
+
+        if not self.LONG_CODE_RE.match(code):
+            errors.append("longCode должен содержать только сегменты [a-z0-9-], разделённые точками '.'")
+
+        segments = code.split(".")
+        for s in segments:
+            if len(s) > 32:
+                errors.append(f"Сегмент '{s}' длинее 32 символов")
+
+        if len(segments) < 3:
+            errors.append("longCode должен иметь минимум 3 сегмента (quantity.medium.[location|component]...)")
+
+        # DB-driven vocabularies (кэшируются в Database до изменения справочников)
+        quantities = self.db.segment_vocab("quantity")
+        mediums = self.db.segment_vocab("medium")
+        locations = self.db.segment_vocab("location")
+        components = self.db.segment_vocab("component")
+        methods = self.db.segment_vocab("method")
+
+        quantity = segments[0] if segments else ""
+        if quantity not in quantities:
+            warnings.append(f"Неизвестная величина '{quantity}' (рассмотрите использование контролируемого словаря)")
+
+        if len(segments) >= 2:
+            medium = segments[1]
+            if not (medium in mediums or medium.startswith("mixture-")):
+                warnings.append(f"Среда '{medium}' не распознана (при необходимости отредактируйте через 'Справочник сегментов...')")
+        else:
+            errors.append("Второй сегмент (medium) обязателен")
+
+        has_location = any(
+            s in locations or s.startswith("node-") or s.startswith("section-") or s.startswith("station-") for s in segments[2:]
+        )
+        has_component = any(
+            s in components for s in segments[2:]
+        )
+        if not (has_location or has_component):
+            errors.append("longCode должен включать сегмент 'location' (inlet/outlet/...) или 'component' (compressor/pipe/...)")
+
+        # Method optional — предупреждение даётся в validate_parameter
+        _ = methods  # placeholder
+
+        return errors, warnings
+
+    def validate_parameter(self, pid: str) -> Dict[str, Any]:
+        cur = self.db._execute("SELECT * FROM PARAMETER WHERE id=?", (pid,))
+        p = cur.fetchone()
+        if not p:
+            return {"ok": False, "errors": ["Параметр не найден"], "warnings": []}
+
+        cur = self.db._execute("SELECT unit_code FROM PARAMETER_ALLOWED_UNIT WHERE parameter_id=?", (pid,))
+        allowed = [r["unit_code"] for r in cur.fetchall()]
+        # Дубликат — другая строка с точно такими же (method_name, short_code),
+        # как в уникальном индексе и в validate_all
+        short_code_taken = False
+        if (p["short_code"] or "").strip() and (p["method_name"] or "").strip():
+            short_code_taken = self.db._execute(
+                "SELECT 1 FROM PARAMETER WHERE method_name=? AND short_code=? AND id<>?",
+                (p["method_name"], p["short_code"], pid)
+            ).fetchone() is not None
+        return self._validate_row(p, allowed, short_code_taken)
+
+    def validate_all(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Валидирует все параметры за несколько запросов: строки PARAMETER, все allowedUnits
+        и занятые (методика, shortCode) выбираются целиком, проверки идут по множествам.
+        Результат совпадает с validate_parameter для каждого параметра; дубликаты
+        shortCode ищутся точным сравнением (method_name, short_code), как в уникальном индексе.
+
+        :return: {pid: {"ok", "errors", "warnings"}} в порядке long_code.
+        """
+        allowed: Dict[str, List[str]] = {}
+        for r in self.db._execute("SELECT parameter_id, unit_code FROM PARAMETER_ALLOWED_UNIT"):
+            allowed.setdefault(r["parameter_id"], []).append(r["unit_code"])
+        duplicated = {
+            (r["m"], r["sc"]) for r in self.db._execute("""
+                SELECT method_name AS m, short_code AS sc FROM PARAMETER
+                WHERE TRIM(IFNULL(method_name, '')) <> '' AND TRIM(IFNULL(short_code, '')) <> ''
+                GROUP BY method_name, short_code HAVING COUNT(*) > 1
+            """)
+        }
+        results = {}
+        for p in self.db._execute("SELECT * FROM PARAMETER ORDER BY long_code"):
+            key = (p["method_name"], p["short_code"])
+            results[p["id"]] = self._validate_row(p, allowed.get(p["id"], []), key in duplicated)
+        return results
+
+    def _validate_row(self, p: sqlite3.Row, allowed: List[str], short_code_taken: bool) -> Dict[str, Any]:
+        errors, warnings = self.validate_long_code(p["long_code"])
+        units = self.db.unit_codes()
+
+        # Units existence
+        if p["system_unit"] not in units:
+            errors.append(f"Системная единица '{p['system_unit']}' не найдена в справочнике UNIT")
+
+        if not allowed:
+            errors.append("Список allowedUnits не должен быть пустым")
+        if allowed and p["system_unit"] not in allowed:
+            warnings.append(f"systemUnit '{p['system_unit']}' отсутствует в allowedUnits")
+
+        for u in allowed:
+            if u not in units:
+                errors.append(f"Разрешённая единица '{u}' отсутствует в справочнике UNIT")
+
+        # Справочники dataType/shape/quantityKind
+        types = self.db.data_dict_vocab("data_type")
+        shapes = self.db.data_dict_vocab("shape")
+        qkinds = self.db.data_dict_vocab("quantity_kind")
+        if p["data_type"] not in types:
+            warnings.append(f"Нетипичный dataType '{p['data_type']}' (справочник: {sorted(types)})")
+        if p["shape"] not in shapes:
+            warnings.append(f"Нетипичная форма '{p['shape']}' (справочник: {sorted(shapes)})")
+        if p["quantity_kind"] and p["quantity_kind"] not in qkinds:
+            warnings.append(f"Нетипичный quantityKind '{p['quantity_kind']}' (справочник: {sorted(qkinds)})")
+
+        # Предупреждение по методике
+        methods = self.db.segment_vocab("method")
+        if (p["method_name"] or "") and p["method_name"] not in methods:
+            warnings.append(f"Нетипичная методика '{p['method_name']}' (справочник: {sorted(methods)})")
+
+        # Валидация short code
+        sc = (p["short_code"] or "").strip()
+        mn = (p["method_name"] or "").strip()
+        if sc:
+            if not SHORT_CODE_RE.match(sc):
+                errors.append("shortCode должен начинаться с буквы и содержать до 32 символов [A-Za-z0-9_]")
+            elif mn and short_code_taken:
+                errors.append(f"shortCode '{sc}' уже используется в методике '{mn}'")
+
+        constraints = safe_json_loads(p["constraints"], {})
+        try:
+            mnv = constraints.get("min", None)
+            mxv = constraints.get("max", None)
+            if mnv is not None and mxv is not None:
+                if float(mnv) > float(mxv):
+                    errors.append("constraints.min > constraints.max")
+        except Exception:
+            warnings.append("constraints min/max — не числа")
+
+        return {"ok": len(errors) == 0, "errors": errors, "warnings": warnings}
@@ -0,0 +1,153 @@
+"""
+Фикстура ``bench`` для замеров производительности и сравнение с базовой линией.
+
+Каждый замер — время одного вызова по нескольким раундам (число вызовов в
+раунде подбирается так, чтобы раунд длился не меньше BENCH_MIN_TIME). В отчёт
+идут медиана и лучший раунд; с базой сравнивается лучший раунд — он меньше
+всего зависит от фоновой нагрузки.
+Для пакетных замеров (batch > 1) дополнительно считается пропускная способность
+в элементах в секунду.
+
+Базовые значения хранятся в ``baselines.json`` рядом с этим файлом и снимаются
+на CI-машине, где идёт проверка. Все тесты каталога получают маркер ``benchmark``
+и в обычном прогоне ``pytest`` пропускаются: юнит-тесты не зависят от времени.
+Переменные окружения:
+
+* ``BENCH=1`` — выполнить бенчмарки; регрессия сверх порога проваливает тест;
+* ``BENCH_UPDATE=1`` — записать результаты прогона в baselines.json (без сравнения);
+* ``BENCH_SOFT=1`` — при регрессии только предупреждение (для локальных прогонов
+  на машине, отличной от той, где снята база);
+* ``BENCH_THRESHOLD`` — допустимое замедление относительно базы (по умолчанию 0.5 = +50 %);
+* ``BENCH_ROUNDS``, ``BENCH_MIN_TIME`` — число раундов (5) и длительность раунда, с (0.002).
+
+Запуск:  BENCH=1 python -m pytest tests/benchmarks -q [-s]
+"""
+
+import datetime
+import json
+import os
+import platform
+import statistics
+import time
+import warnings
+
+import pytest
+
+BASELINES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+
+ROUNDS = int(os.environ.get("BENCH_ROUNDS", "5"))
+MIN_TIME = float(os.environ.get("BENCH_MIN_TIME", "0.002"))
+THRESHOLD = float(os.environ.get("BENCH_THRESHOLD", "0.5"))
+UPDATE = os.environ.get("BENCH_UPDATE") == "1"
+SOFT = os.environ.get("BENCH_SOFT") == "1"
+ENABLED = UPDATE or os.environ.get("BENCH") == "1"
+
+_RESULTS = {}
+
+
+class BenchmarkRegression(UserWarning):
+    """Замедление относительно базовой линии сверх порога."""
+
+
+def _load_baselines():
+    if not os.path.exists(BASELINES_PATH):
+        return {}
+    with open(BASELINES_PATH, encoding="utf-8") as f:
+        return json.load(f).get("benchmarks", {})
+
+
+_BASELINES = _load_baselines()
+
+
+def measure(func, *args, rounds=ROUNDS, min_time=MIN_TIME):
+    """Времена одного вызова func(*args) по раундам, мкс."""
+    func(*args)  # прогрев: ленивые кеши, импорты
+    t0 = time.perf_counter_ns()
+    func(*args)
+    single = max(time.perf_counter_ns() - t0, 1)
+    number = max(1, int(min_time * 1e9 / single))
+    samples = []
+    for _ in range(rounds):
+        t0 = time.perf_counter_ns()
+        for _ in range(number):
+            func(*args)
+        samples.append((time.perf_counter_ns() - t0) / number / 1e3)
+    return samples
+
+
+class Bench:
+    """Замер под именем теста: bench(func, *args, batch=1, name=None) -> медиана, мкс."""
+
+    def __init__(self, nodename):
+        self._nodename = nodename
+
+    def __call__(self, func, *args, batch=1, name=None):
+        key = name or self._nodename
+        samples = measure(func, *args)
+        median = statistics.median(samples)
+        result = {"median_us": round(median, 3), "min_us": round(min(samples), 3), "batch": batch}
+        if batch > 1:
+            result["items_per_s"] = round(batch / median * 1e6, 1)
+        _RESULTS[key] = result
+
+        base = _BASELINES.get(key)
+        if base and not UPDATE:
+            best = min(samples)
+            ratio = best / base["min_us"]
+            result["ratio"] = round(ratio, 3)
+            if ratio > 1 + THRESHOLD:
+                msg = (f"{key}: {best:.1f} мкс против базовых {base['min_us']:.1f} мкс "
+                       f"(x{ratio:.2f}, порог x{1 + THRESHOLD:.2f})")
+                if not SOFT:
+                    pytest.fail(f"Регрессия производительности: {msg}")
+                warnings.warn(msg, BenchmarkRegression)
+        return median
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: замер производительности (запуск: BENCH=1)")
+
+
+def pytest_collection_modifyitems(config, items):
+    here = os.path.dirname(os.path.abspath(__file__))
+    skip = pytest.mark.skip(reason="бенчмарки выполняются только с BENCH=1")
+    for item in items:
+        if str(item.fspath).startswith(here + os.sep):
+            item.add_marker(pytest.mark.benchmark)
+            if not ENABLED:
+                item.add_marker(skip)
+
+
+@pytest.fixture
+def bench(request):
+    return Bench(request.node.name)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if not (UPDATE and _RESULTS):
+        return
+    fresh = {key: {f: r[f] for f in ("median_us", "min_us", "batch")} for key, r in _RESULTS.items()}
+    benchmarks = {**_BASELINES, **fresh}
+    data = {
+        "generated": datetime.datetime.now().isoformat(timespec="seconds"),
+        "machine": f"{platform.system()} {platform.machine()}, Python {platform.python_version()}",
+        "benchmarks": dict(sorted(benchmarks.items())),
+    }
+    with open(BASELINES_PATH, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not _RESULTS:
+        return
+    tr = terminalreporter
+    tr.section("бенчмарки")
+    tr.write_line(f"{'Замер':<36} | {'медиана, мкс':>12} | {'лучший, мкс':>11} | {'к базе':>7} | {'элем./с':>10}")
+    tr.write_line("=" * 90)
+    for key, r in sorted(_RESULTS.items()):
+        ratio = f"x{r['ratio']:.2f}" if "ratio" in r else "-"
+        rate = f"{r['items_per_s']:.0f}" if "items_per_s" in r else ""
+        tr.write_line(f"{key:<36} | {r['median_us']:>12.1f} | {r['min_us']:>11.1f} | {ratio:>7} | {rate:>10}")
+    if UPDATE:
+        tr.write_line(f"Базовые значения записаны: {BASELINES_PATH}")
@@ -0,0 +1,36 @@
+"""Бенчмарки calculation_engine: calculate_pressure и batch_calculate по сетке режимов."""
+
+from utils.calculation_engine import batch_calculate, calculate_pressure
+
+PARAMS = {
+    'diameter_inside_of_pipes': 22.4,
+    'thickness_pipe_wall': 0.8,
+    'length_cooling_tubes_of_the_main_bundle': 13910,
+    'number_cooling_tubes_of_the_main_bundle': 20904,
+    'number_cooling_tubes_of_the_built_in_bundle': 0,
+    'number_cooling_water_passes_of_the_main_bundle': 2,
+    'mass_flow_cooling_water': 45000.0,
+    'temperature_cooling_water_1': 20.0,
+    'thermal_conductivity_cooling_surface_tube_material': 16.2,
+    'coefficient_b': 1.0,
+    'mass_flow_flow_path_1': 200.0,
+    'degree_dryness_flow_path_1': 0.95,
+}
+
+VARYING = {
+    'mass_flow_cooling_water': [30000.0, 45000.0, 60000.0],
+    'temperature_cooling_water_1': [5.0, 10.0, 15.0, 20.0, 25.0, 30.0],
+    'mass_flow_flow_path_1': [100.0, 200.0, 300.0],
+}
+
+
+def test_calculate_pressure_scalar(bench):
+    bench(calculate_pressure, PARAMS)
+
+
+def test_batch_calculate(bench):
+    n = 1
+    for values in VARYING.values():
+        n *= len(values)
+    assert len(batch_calculate(PARAMS, VARYING)) == n
+    bench(batch_calculate, PARAMS, VARYING, batch=n)
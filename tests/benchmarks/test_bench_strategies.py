@@ -0,0 +1,166 @@
+"""
+Бенчмарки стратегий расчёта давления: построение, одиночный вызов и пакет режимов.
+
+Пакет — BATCH режимов: цикл calculate и, где есть, calculate_batch; диспетчер
+strategy_registry замеряется на смешанной очереди. Пропускная способность
+выводится в элементах в секунду.
+"""
+
+import numpy as np
+import pytest
+
+from utils.TPS_module import TablePressureStrategy
+from utils.VKU_strategy import VKUStrategy
+from utils.berman_strategy import BermanStrategy
+from utils.instrumentation import collect
+from utils.metrovickers_strategy import MetroVickersStrategy
+from utils.strategy_registry import dispatch
+
+BATCH = 200
+
+BERMAN_PARAMS = {
+    'length_cooling_tubes_of_the_main_bundle': 7.080,
+    'number_cooling_water_passes_of_the_main_bundle': 2,
+    'number_cooling_tubes_of_the_main_bundle': 1754,
+    'mass_flow_steam_nom': 16.0,
+    'thermal_conductivity_cooling_surface_tube_material': 37.0,
+    'diameter_inside_of_pipes': 22.0,
+    'thickness_pipe_wall': 1.0,
+    'enthalpy_flow_path_1': 520.0,
+    'BAP': 1,
+    'mass_flow_cooling_water_list': [1200],
+    'mass_flow_steam_list': [16],
+    'coefficient_R_list': [0.10e-6],
+    'temperature_cooling_water_1_list': [4, 5, 10, 15, 20, 25, 30, 35],
+    'mass_flow_air': 16.5,
+}
+
+METRO_VICKERS_PARAMS = {
+    'diameter_inside_of_pipes': 22.4,
+    'thickness_pipe_wall': 0.8,
+    'length_cooling_tubes_of_the_main_bundle': 13910,
+    'number_cooling_tubes_of_the_main_bundle': 20904,
+    'number_cooling_tubes_of_the_built_in_bundle': 0,
+    'number_cooling_water_passes_of_the_main_bundle': 2,
+    'mass_flow_cooling_water': 45000.0,
+    'temperature_cooling_water_1': 45.0,
+    'thermal_conductivity_cooling_surface_tube_material': 16.2,
+    'coefficient_b': 1.0,
+    'mass_flow_flow_path_1': 200.0,
+    'degree_dryness_flow_path_1': 0.95,
+}
+
+TPS_PARAMS = {
+    'NAMET': {'data': [[35, 33, 30, 25], [20, 50, 100, 150, 200],
+                       [[6.549, 7.211, 8.88, 10.945, 13.409], [5.9, 6.499, 8.018, 9.927, 12.214],
+                        [5.036, 5.552, 6.872, 8.572, 10.622], [3.851, 4.257, 5.299, 6.712, 8.438]]]},
+    'NAMED': {'data': [[15.3, 26.8, 38.4, 49.9, 61.5, 73], [0.157, 0.258, 0.469, 0.607, 0.763, 0.919]]},
+    'inputs': {'temperature_cooling_water_1': 30.0, 'mass_flow_flow_path_1': 112.0},
+}
+
+
+def _modes(base, key, values):
+    return [{**base, key: float(v)} for v in values]
+
+
+def _run_all(strategy, modes):
+    for params in modes:
+        strategy.calculate(params)
+
+
+# --- Берман ---
+
+def test_berman_construct(bench):
+    bench(BermanStrategy)
+
+
+def test_berman_scalar(bench):
+    # Один вызов считает все 8 температур воды списка
+    bench(BermanStrategy().calculate, BERMAN_PARAMS, batch=len(BERMAN_PARAMS['temperature_cooling_water_1_list']))
+
+
+# --- Metro-Vickers ---
+
+def test_metro_vickers_construct(bench):
+    bench(MetroVickersStrategy)
+
+
+def test_metro_vickers_scalar(bench):
+    bench(MetroVickersStrategy().calculate, METRO_VICKERS_PARAMS)
+
+
+def test_metro_vickers_scalar_instrumented(bench):
+    # Стоимость включённых поэтапных замеров (сравнить с test_metro_vickers_scalar)
+    strategy = MetroVickersStrategy()
+
+    def run():
+        with collect():
+            strategy.calculate(METRO_VICKERS_PARAMS)
+    bench(run)
+
+
+def test_metro_vickers_batch(bench):
+    modes = _modes(METRO_VICKERS_PARAMS, 'mass_flow_flow_path_1', np.linspace(100.0, 400.0, BATCH))
+    bench(_run_all, MetroVickersStrategy(), modes, batch=BATCH)
+
+
+# --- ВКУ ---
+
+def test_vku_construct(bench):
+    bench(VKUStrategy, 1250.0, 0.92)
+
+
+def test_vku_scalar(bench):
+    bench(VKUStrategy(1250.0, 0.92).calculate,
+          {'mass_flow_flow_path_1': 301.2, 'degree_dryness_flow_path_1': 0.903, 'temperature_air': 20.0})
+
+
+def test_vku_batch(bench):
+    base = {'degree_dryness_flow_path_1': 0.91, 'temperature_air': 20.0}
+    modes = _modes(base, 'mass_flow_flow_path_1', np.linspace(150.0, 350.0, BATCH))
+    bench(_run_all, VKUStrategy(1250.0, 0.92), modes, batch=BATCH)
+
+
+def test_vku_calculate_batch(bench):
+    base = {'degree_dryness_flow_path_1': 0.91, 'temperature_air': 20.0}
+    modes = _modes(base, 'mass_flow_flow_path_1', np.linspace(150.0, 350.0, BATCH))
+    bench(VKUStrategy(1250.0, 0.92).calculate_batch, modes, batch=BATCH)
+
+
+# --- Табличное давление ---
+
+def test_table_pressure_scalar(bench):
+    # Интерполяторы NAMET/NAMED строятся внутри calculate — построение входит в вызов
+    bench(TablePressureStrategy().calculate, TPS_PARAMS)
+
+
+def test_table_pressure_batch(bench):
+    modes = [{**TPS_PARAMS, 'inputs': {'temperature_cooling_water_1': 30.0, 'mass_flow_flow_path_1': float(g)}}
+             for g in np.linspace(20.0, 200.0, BATCH)]
+    bench(_run_all, TablePressureStrategy(), modes, batch=BATCH)
+
+
+def test_table_pressure_calculate_batch(bench):
+    modes = [{**TPS_PARAMS, 'inputs': {'temperature_cooling_water_1': 30.0, 'mass_flow_flow_path_1': float(g)}}
+             for g in np.linspace(20.0, 200.0, BATCH)]
+    bench(TablePressureStrategy().calculate_batch, modes, batch=BATCH)
+
+
+# --- Диспетчер ---
+
+def test_dispatch_mixed_queue(bench):
+    vku = {'mass_flow_steam_nom': 1250.0, 'degree_dryness_steam_nom': 0.92,
+           'degree_dryness_flow_path_1': 0.91, 'temperature_air': 20.0}
+    records = []
+    for i, g in enumerate(np.linspace(150.0, 350.0, BATCH // 2)):
+        records.append({'strategy': 'vku', 'params': {**vku, 'mass_flow_flow_path_1': float(g)}})
+        tps_inputs = {'temperature_cooling_water_1': 30.0, 'mass_flow_flow_path_1': float(g) / 2}
+        records.append({'strategy': 'table_pressure', 'params': {**TPS_PARAMS, 'inputs': tps_inputs}})
+    bench(dispatch, records, batch=len(records))
+
+
+def test_results_unchanged_by_benchmark():
+    """Замеры не меняют состояние стратегий: эталон Metro-Vickers сохраняется."""
+    strategy = MetroVickersStrategy()
+    _run_all(strategy, [METRO_VICKERS_PARAMS] * 3)
+    assert strategy.calculate(METRO_VICKERS_PARAMS)['pressure_flow_path_1'] == pytest.approx(0.11498207272441292)
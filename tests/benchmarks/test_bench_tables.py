@@ -0,0 +1,56 @@
+"""Бенчмарки Table1D/Table2D (построение и векторный вызов) и UnitConverter."""
+
+import logging
+
+import numpy as np
+
+from utils.table_models import Table1D, Table2D
+from utils.uniconv import UnitConverter, get_default_converter
+
+logging.disable(logging.CRITICAL)
+
+N_POINTS = 10_000
+
+X1 = np.array([15.3, 26.8, 38.4, 49.9, 61.5, 73.0])
+Y1 = np.array([0.157, 0.258, 0.469, 0.607, 0.763, 0.919])
+
+X2 = np.array([25.0, 30.0, 33.0, 35.0])
+Y2 = np.array([20.0, 50.0, 100.0, 150.0, 200.0])
+Z2 = np.array([[3.851, 4.257, 5.299, 6.712, 8.438],
+               [5.036, 5.552, 6.872, 8.572, 10.622],
+               [5.9, 6.499, 8.018, 9.927, 12.214],
+               [6.549, 7.211, 8.88, 10.945, 13.409]])
+
+
+def test_table1d_construct(bench):
+    bench(Table1D, X1, Y1)
+
+
+def test_table1d_vector(bench):
+    # Половина точек вне диапазона — работает и экстраполяция
+    bench(Table1D(X1, Y1), np.linspace(0.0, 120.0, N_POINTS), batch=N_POINTS)
+
+
+def test_table2d_construct(bench):
+    bench(Table2D, X2, Y2, Z2)
+
+
+def test_table2d_vector(bench):
+    rng = np.random.default_rng(0)
+    tx, ty = rng.uniform(25.0, 35.0, N_POINTS), rng.uniform(20.0, 200.0, N_POINTS)
+    bench(Table2D(X2, Y2, Z2), tx, ty, batch=N_POINTS)
+
+
+def test_unit_converter_construct(bench):
+    bench(UnitConverter)
+
+
+def test_unit_converter_scalar(bench):
+    uc = get_default_converter()
+    bench(lambda: uc.convert(1.5, from_unit="бар", to_unit="кгс/см²", parameter_type="pressure"))
+
+
+def test_unit_converter_vector(bench):
+    uc = get_default_converter()
+    values = np.linspace(0.01, 10.0, N_POINTS)
+    bench(lambda: uc.convert(values, from_unit="°C", to_unit="K", parameter_type="temperature"), batch=N_POINTS)
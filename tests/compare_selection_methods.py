@@ -1,6 +1,7 @@
+import math
 import time
 from utils.base_for_selection import ProblemDefinition
-from utils.selection_methods import AnalyticalSolver, BisectionSolver, NewtonSolver
+from utils.selection_methods import AnalyticalSolver, BisectionSolver, NewtonSolver, SafeguardedNewtonSolver
 
 
 def run_comparison():
@@ -13,13 +14,15 @@ def run_comparison():
     solver_params = {
         "Аналитический": {},
         "Метод Дихотомии": {'a': 1.0, 'b': 5.0},
-        "Метод Ньютона": {'initial_guess': 2.0}
+        "Метод Ньютона": {'initial_guess': 2.0},
+        "Гибридный": {'a': 1.0, 'b': 5.0}
     }
 
     solvers = {
         "Аналитический": AnalyticalSolver(problem),
         "Метод Дихотомии": BisectionSolver(problem),
-        "Метод Ньютона": NewtonSolver(problem)
+        "Метод Ньютона": NewtonSolver(problem),
+        "Гибридный": SafeguardedNewtonSolver(problem, warm_start=False)
     }
 
     results = []
@@ -71,6 +74,98 @@ def print_results_to_console(results):
         print(f"{res['Метод']:<20} | {x_str:<18} | {res['Итераций']:<10} | {t_str:<20} | {d_str:<20}")
 
 
+def slowly_varying_targets(n_points=2000, base=0.001, amplitude=0.0005):
+    """Последовательность медленно меняющихся целей (как соседние режимы)."""
+    return [base + amplitude * math.sin(4 * math.pi * i / n_points) for i in range(n_points)]
+
+
+def run_sequence_benchmark(n_points=2000, n_repeats=5):
+    """
+    Решает последовательность близких задач разными решателями.
+
+    Тёплые варианты получают решение предыдущей точки как начальное
+    приближение. Возвращает суммарные итерации, время на точку и
+    максимальную невязку по A3_delt.
+    """
+    problem = ProblemDefinition()
+    targets = slowly_varying_targets(n_points)
+
+    def cold(solver, **params):
+        def run():
+            xs = []
+            for t in targets:
+                xs.append(solver.solve(t, **params))
+                counters["iterations"] += solver.iterations
+            return xs
+        return run
+
+    def warm_newton(solver):
+        def run():
+            xs, guess = [], 2.0
+            for t in targets:
+                guess = solver.solve(t, initial_guess=guess)
+                xs.append(guess)
+                counters["iterations"] += solver.iterations
+            return xs
+        return run
+
+    def warm_hybrid(solver):
+        def run():
+            xs, guess = [], None
+            for t in targets:
+                guess = solver.solve(t, a=1.0, b=5.0, initial_guess=guess)
+                xs.append(guess)
+                counters["iterations"] += solver.iterations
+            return xs
+        return run
+
+    cases = {
+        "Дихотомия": cold(BisectionSolver(problem), a=1.0, b=5.0),
+        "Ньютон (холодный)": cold(NewtonSolver(problem), initial_guess=2.0),
+        "Ньютон (тёплый)": warm_newton(NewtonSolver(problem)),
+        "Гибридный (холодный)": cold(SafeguardedNewtonSolver(problem, warm_start=False), a=1.0, b=5.0),
+        "Гибридный (тёплый)": warm_hybrid(SafeguardedNewtonSolver(problem, warm_start=False)),
+    }
+
+    results = []
+    for name, run in cases.items():
+        counters = {"iterations": 0}
+        try:
+            start_time = time.perf_counter()
+            for _ in range(n_repeats):
+                xs = run()
+            end_time = time.perf_counter()
+            max_residual = max(abs(problem.calculate_delta(x) - t) for x, t in zip(xs, targets))
+            results.append({
+                "Метод": name,
+                "Итераций/точку": counters["iterations"] / (n_points * n_repeats),
+                "Время (μs/точку)": (end_time - start_time) * 1e6 / (n_points * n_repeats),
+                "Макс. невязка": max_residual,
+            })
+        except (RuntimeError, ValueError) as e:
+            results.append({"Метод": name, "Итераций/точку": "N/A", "Время (μs/точку)": "N/A",
+                            "Макс. невязка": str(e)})
+    return results
+
+
+def print_sequence_results_to_console(results, n_points=2000):
+    """Выводит результаты бенчмарка последовательности в консоль."""
+    print(f"\nПоследовательность из {n_points} медленно меняющихся целей")
+    print(f"{'Метод':<22} | {'Итераций/точку':<15} | {'Время (μs/точку)':<17} | {'Макс. невязка':<15}")
+    print("=" * 80)
+    for res in results:
+        it = res['Итераций/точку']
+        t = res['Время (μs/точку)']
+        r = res['Макс. невязка']
+        it_str = f"{it:.2f}" if isinstance(it, float) else str(it)
+        t_str = f"{t:.3f}" if isinstance(t, float) else str(t)
+        r_str = f"{r:.2e}" if isinstance(r, float) else str(r)
+        print(f"{res['Метод']:<22} | {it_str:<15} | {t_str:<17} | {r_str:<15}")
+
+
 if __name__ == "__main__":
     comparison_results = run_comparison()
     print_results_to_console(comparison_results)
+
+    sequence_results = run_sequence_benchmark()
+    print_sequence_results_to_console(sequence_results)
@@ -0,0 +1,41 @@
+import time
+from utils.uniconv import UnitConverter, get_default_converter, _build_default_tables
+from utils.metrovickers_strategy import MetroVickersStrategy
+
+
+def measure(func, n_runs):
+    """Среднее время одного вызова func() в микросекундах."""
+    start_time = time.perf_counter()
+    for _ in range(n_runs):
+        func()
+    end_time = time.perf_counter()
+    return (end_time - start_time) * 1e6 / n_runs
+
+
+def run_comparison(n_runs=2000):
+    """
+    Сравнивает стоимость создания конвертера и стратегии Metro-Vickers
+    до (полная сборка таблиц) и после (общие таблицы + copy-on-write).
+    """
+    results = [
+        ("Сборка таблиц (_build_defaults)", measure(_build_default_tables, n_runs)),
+        ("UnitConverter()", measure(UnitConverter, n_runs)),
+        ("get_default_converter()", measure(get_default_converter, n_runs)),
+        ("UnitConverter() + add_unit", measure(
+            lambda: UnitConverter().add_unit("pressure", unit_symbol="psi", unit_name="psi",
+                                             to_base=6_894.757 / 98_066.5), n_runs)),
+        ("MetroVickersStrategy()", measure(MetroVickersStrategy, n_runs)),
+    ]
+    return results
+
+
+def print_results_to_console(results):
+    """Выводит результаты в консоль в виде таблицы."""
+    print(f"{'Операция':<36} | {'Время (μs/вызов)':<18}")
+    print("=" * 58)
+    for name, duration_us in results:
+        print(f"{name:<36} | {duration_us:<18.3f}")
+
+
+if __name__ == "__main__":
+    print_results_to_console(run_comparison())
@@ -0,0 +1,221 @@
+"""
+Unit-тесты для выгрузки DBF-базы BALANCE ``validation_data/scripts/read_dbf_for_zone_json.py``.
+
+DBF-файлы для тестов генерируются на лету (dbf_synth.write_dbf).
+
+Запуск:  pytest -q
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "validation_data", "scripts"))
+
+import read_dbf_for_zone_json as exporter  # noqa: E402
+from dbf_synth import make_legacy_db, write_dbf  # noqa: E402
+
+TEPT_FIELDS = [f"V{i}" for i in range(1, 7)]
+
+
+def tept_row(name, namu, values):
+    row = {"NAME": name, "NAMU": namu}
+    row.update({f: v for f, v in zip(TEPT_FIELDS, values)})
+    return row
+
+
+def write_legacy_db(folder, tept_extra=()):
+    """Две зоны: кривые 2D (2 и 4 строки), shared X, 3D по NAMU и из TEPW, нестандартная группа."""
+    os.makedirs(folder, exist_ok=True)
+    c, n = (lambda size: ("C", size, 0)), (lambda size, dec: ("N", size, dec))
+    write_dbf(os.path.join(folder, "TEPO.DBF"),
+              [("NAME", *c(10)), ("NAMEP", *c(10)), ("NAMER", *c(10)), ("NAMEW", *c(10)), ("NAMES", *c(10)),
+               ("KIND", *n(4, 0))],
+              [{"NAME": "ZONE1", "NAMEP": "P1", "NAMER": "R1", "NAMEW": "W1", "NAMES": "S1", "KIND": 1},
+               {"NAME": "ZONE2", "NAMEP": "P2", "NAMER": "", "NAMEW": "", "NAMES": "S1", "KIND": 2}])
+    write_dbf(os.path.join(folder, "TEPP.DBF"),
+              [("NAME", *c(10)), ("NAMET", *c(10)), ("NAMED", *c(10)), ("EK", *n(8, 3))],
+              [{"NAME": "P1", "NAMET": "CRV2", "NAMED": "CRV4", "EK": 0.85},
+               {"NAME": "P1", "NAMET": "FAM", "NAMED": "", "EK": 0.8},
+               {"NAME": "P2", "NAMET": "CRV3D", "NAMED": "ODD", "EK": 0.9},
+               {"NAME": "P2", "NAMET": "MISSING", "NAMED": "CRV2", "EK": 0.7}])
+    write_dbf(os.path.join(folder, "TEPR.DBF"), [("NAME", *c(10)), ("R", *n(8, 2))],
+              [{"NAME": "R1", "R": 1.5}, {"NAME": "R2", "R": 2.5}])
+    write_dbf(os.path.join(folder, "TEPS.DBF"), [("NAME", *c(10)), ("S", *n(8, 2))],
+              [{"NAME": "S1", "S": 3.0}])
+    write_dbf(os.path.join(folder, "TEPW.DBF"), [("NAME", *c(10)), ("NAMET", *c(10))],
+              [{"NAME": "W1", "NAMET": ""}])
+    tept = [
+        tept_row("CRV4", "", [1, 2, 3]), tept_row("CRV4", "", [10, 20, 30]),
+        tept_row("CRV4", "", [3, 4, 5]), tept_row("CRV4", "", [30, 40, 50]),
+        tept_row("CRV2", "", [0.5, 1.5, 0, 2.5]), tept_row("CRV2", "", [5, 6, 0, 7]),
+        tept_row("FAM", "U", [1, 2, 3]), tept_row("FAM", "FAMA", [4, 5, 6]), tept_row("FAM", "FAMB", [7, 8, 9]),
+        tept_row("W1", "", [1, 2]), tept_row("W1", "", [100, 200]),
+        tept_row("W1", "", [1.1, 1.2]), tept_row("W1", "", [2.1, 2.2]),
+        tept_row("CRV3D", "К", [1, 2]), tept_row("CRV3D", "", [5, 6]), tept_row("CRV3D", "", [7, 8]),
+        tept_row("ODD", "", [1, 2]), tept_row("ODD", "Q", [3, 4]), tept_row("ODD", "", [5, 6]),
+        tept_row("OTHER", "", [9, 9]), tept_row("OTHER", "", [9, 9]),
+        *tept_extra,
+    ]
+    write_dbf(os.path.join(folder, "TEPT.DBF"),
+              [("NAME", *c(10)), ("NAMU", *c(4))] + [(f, *n(12, 4)) for f in TEPT_FIELDS], tept)
+    return folder
+
+
+@pytest.fixture()
+def legacy_db(tmp_path):
+    return write_legacy_db(str(tmp_path / "dbf"))
+
+
+def test_extract_object_curves(legacy_db):
+    tables = exporter.LegacyTables.load(legacy_db)
+    assert tables.object_names == ["ZONE1", "ZONE2"]
+
+    zone = exporter.extract_object(tables, "ZONE1")["ZONE1"]
+    assert [r["EK"] for r in zone["TEPP"]] == [0.85, 0.8]
+    assert zone["TEPR"] == [{"NAME": "R1", "R": 1.5}]
+    curves = {c["NAME"]: c for c in zone["TEPT"]}
+    assert [c["NAME"] for c in zone["TEPT"]] == ["CRV4", "CRV2", "FAMA", "FAMB", "W1"]
+    assert curves["CRV4"] == {"NAME": "CRV4", "X": [1, 2, 3, 4, 5], "Y": [10, 20, 30, 40, 50]}
+    assert curves["CRV2"] == {"NAME": "CRV2", "X": [0.5, 1.5, 2.5], "Y": [5, 6, 7]}
+    assert curves["FAMB"] == {"NAME": "FAMB", "X": [1, 2, 3], "Y": [7, 8, 9]}
+    assert curves["W1"] == {"NAME": "W1", "X": [1, 2], "Y": [100, 200], "Z": [[1.1, 1.2], [2.1, 2.2]]}
+
+    zone = exporter.extract_object(tables, "ZONE2")["ZONE2"]
+    assert zone["TEPR"] == [] and zone["TEPW"] == []
+    assert [c["NAME"] for c in zone["TEPT"]] == ["CRV2", "CRV3D", "ODD", "ODD", "ODD"]
+    assert zone["TEPT"][1]["Z"] == [[7, 8]]
+    assert zone["TEPT"][3] == {"NAME": "ODD", "NAMU": "Q", "tab": [3, 4]}
+
+    with pytest.raises(ValueError, match="не найден"):
+        exporter.extract_object(tables, "NOPE")
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_batch_export(legacy_db, tmp_path, jobs):
+    out = str(tmp_path / f"out{jobs}")
+    assert exporter.main(["--dbf-folder", legacy_db, "--out", out, "--all", "-j", str(jobs)]) == 0
+    assert sorted(os.listdir(out)) == ["ZONE1.json", "ZONE2.json"]
+    with open(os.path.join(out, "ZONE2.json"), encoding="utf-8") as f:
+        assert json.load(f)["ZONE2"]["TEPO"]["KIND"] == 2
+
+    assert exporter.main(["--dbf-folder", legacy_db, "--out", out, "--objects", "ZONE1", "NOPE"]) == 1
+
+
+def test_extract_matches_linear_scan(tmp_path):
+    import bench_dbf_export
+
+    folder = str(tmp_path / "synth")
+    make_legacy_db(folder, n_objects=6, curves_per_object=5, points=4)
+    tables = exporter.LegacyTables.load(folder)
+    raw = {tbl: exporter.read_dbf(os.path.join(folder, f"{tbl}.DBF"))[0]
+           for tbl in ['TEPO', 'TEPP', 'TEPR', 'TEPS', 'TEPT', 'TEPW']}
+    for name in tables.object_names:
+        zone = exporter.extract_object(tables, name)
+        assert json.dumps(zone) == json.dumps(bench_dbf_export._extract_scan(raw, tables.tept_fields, name))
+        assert len(zone[name]["TEPT"]) == 8  # 5 кривых TEPP (shared X даёт 3) + 3D из TEPW
+
+
+def test_tept_streaming_projection(tmp_path):
+    path = str(tmp_path / "TEPT.DBF")
+    write_dbf(path, [("NAME", "C", 6, 0), ("NAMU", "C", 4, 0), ("NOTE", "C", 8, 0),
+                     ("N0", "N", 6, 0), ("N2", "N", 8, 2)],
+              [{"NAME": "A", "NAMU": "U", "NOTE": "x", "N0": 3, "N2": 1.25},
+               {"NAME": "B", "NAMU": "", "N0": None, "N2": 0},
+               {"NAME": "A", "NAMU": "AA", "N0": 0, "N2": 2.0}])
+    tept = exporter.TeptCurves.read(path)
+    assert tept.fields == ["N0", "N2"] and len(tept) == 3 and len(tept.values) == 6
+    assert tept.order == {"A": 0, "B": 1}
+    rows = tept.rows("A")
+    assert rows == [("U", [3, 1.25]), ("AA", [2.0])]
+    assert type(rows[0][1][0]) is int and type(rows[1][1][0]) is float
+    assert tept.rows("B") == [("", [])] and tept.rows("C") == []
+
+
+def test_curve_pack_roundtrip(legacy_db, tmp_path):
+    out = str(tmp_path / "pack")
+    assert exporter.main(["--dbf-folder", legacy_db, "--out", out, "--all", "--format", "both"]) == 0
+    for name in ("ZONE1", "ZONE2"):
+        with open(os.path.join(out, f"{name}.json"), encoding="utf-8") as f:
+            expected = json.load(f)
+        packed = exporter.load_curve_pack(os.path.join(out, f"{name}.index.json"))
+        curves = packed[name].pop("TEPT")
+        assert packed[name] == {k: v for k, v in expected[name].items() if k != "TEPT"}
+        as_lists = [{k: (v.tolist() if isinstance(v, np.ndarray) else v) for k, v in c.items()} for c in curves]
+        assert as_lists == expected[name]["TEPT"]
+
+    curves = {c["NAME"]: c for c in exporter.load_curve_pack(os.path.join(out, "ZONE1.index.json"))["ZONE1"]["TEPT"]}
+    assert isinstance(curves["W1"]["Z"], np.ndarray) and curves["W1"]["Z"].shape == (2, 2)
+    assert np.shares_memory(curves["FAMA"]["X"], curves["FAMB"]["X"])
+    assert not curves["CRV4"]["X"].flags.writeable
+
+
+def test_incremental_export(tmp_path, monkeypatch):
+    folder = write_legacy_db(str(tmp_path / "dbf"))
+    out = str(tmp_path / "out")
+    done, skipped, failed = exporter.export_incremental(folder, out, fmt="both")
+    assert sorted(done) == ["ZONE1", "ZONE2"] and skipped == [] and failed == {}
+
+    # DBF не менялись — таблицы не читаются
+    with monkeypatch.context() as m:
+        m.setattr(exporter.LegacyTables, "load", lambda *a: pytest.fail("DBF перечитаны"))
+        assert exporter.export_incremental(folder, out, fmt="both") == ({}, ["ZONE1", "ZONE2"], {})
+
+    # Кривая ODD есть только у ZONE2
+    write_legacy_db(folder, tept_extra=[tept_row("ODD", "", [7, 8])])
+    done, skipped, failed = exporter.export_incremental(folder, out, fmt="both")
+    assert list(done) == ["ZONE2"] and skipped == ["ZONE1"]
+    with open(os.path.join(out, "ZONE2.json"), encoding="utf-8") as f:
+        assert json.load(f)["ZONE2"]["TEPT"][-1] == {"NAME": "ODD", "X": [1, 2, 6], "Y": [3, 4, 8]}
+
+    os.remove(os.path.join(out, "ZONE1.npy"))
+    assert list(exporter.export_incremental(folder, out, fmt="both")[0]) == ["ZONE1"]
+    assert sorted(exporter.export_incremental(folder, out, fmt="both", force=True)[0]) == ["ZONE1", "ZONE2"]
+
+
+def test_parse_group_vectorized():
+    nan = float("nan")
+    matrix = np.array([[1.0, 0.0, 2.0, nan], [10.0, 20.0, 0.0, nan], [2.0, 3.0, 4.0, nan], [21.0, 31.0, 41.0, 0.0]])
+    rows = exporter.strip_rows(matrix, np.array([True, False, False, False]))
+    assert [r[0].tolist() for r in rows] == [[1.0, 2.0], [10.0, 20.0], [2.0, 3.0, 4.0], [21.0, 31.0, 41.0]]
+    assert exporter.classify_group("", len(rows)) == exporter.CURVE_2D_JOINED
+    curves, masks = exporter.parse_group("J", ["", "", "", ""], rows)
+    assert exporter.curves_as_lists(curves, masks) == [{"NAME": "J", "X": [1, 2.0, 3.0, 4.0],
+                                                        "Y": [10, 20.0, 31.0, 41.0]}]
+    assert type(exporter.curves_as_lists(curves, masks)[0]["X"][0]) is int
+    assert exporter.classify_group("U", 3) == exporter.CURVE_SHARED_X
+    assert exporter.classify_group("", 2, from_tepw=True) == exporter.CURVE_XYZ
+
+
+def test_curve_parser_cache_shared(legacy_db):
+    tables = exporter.LegacyTables.load(legacy_db)
+    parser = exporter.CURVE_PARSER
+    parser.clear()
+    exporter.extract_object(tables, "ZONE1")
+    hits = parser.hits
+    exporter.extract_object(tables, "ZONE2")
+    assert parser.hits == hits + 1  # CRV2 есть у обоих объектов
+
+    curves = {c["NAME"]: c for c in exporter.object_curves(tables, "ZONE1")}
+    assert curves["W1"]["Z"][1].tolist() == [2.1, 2.2]
+    assert curves["FAMA"]["X"] is curves["FAMB"]["X"]
+    assert not curves["CRV4"]["X"].flags.writeable
+
+
+def test_curve_parser_cache_does_not_pin_table(legacy_db):
+    tables = exporter.LegacyTables.load(legacy_db)
+    exporter.CURVE_PARSER.clear()
+    curves = exporter.object_curves(tables, "ZONE1")
+    flat = np.frombuffer(tables.tept._stripped[0])
+    arrays = [arr for c in curves for k, v in c.items() if k in ("X", "Y", "Z", "tab")
+              for arr in (v if k == "Z" else [v])]
+    assert arrays
+    for arr in arrays:
+        assert not np.shares_memory(arr, flat)
+        assert not arr.flags.writeable
+    by_name = {c["NAME"]: c for c in curves}
+    assert by_name["FAMA"]["X"] is by_name["FAMB"]["X"]
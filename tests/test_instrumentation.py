@@ -0,0 +1,155 @@
+import threading
+
+import pytest
+
+from utils import instrumentation
+from utils.berman_strategy import BermanStrategy
+from utils.instrumentation import REGISTRY, collect, count, instrumented, span
+from utils.metrovickers_strategy import MetroVickersStrategy
+from utils.strategy_registry import dispatch
+
+MV_PARAMS = {
+    'diameter_inside_of_pipes': 22.4, 'thickness_pipe_wall': 0.8,
+    'length_cooling_tubes_of_the_main_bundle': 13910, 'number_cooling_tubes_of_the_main_bundle': 20904,
+    'number_cooling_tubes_of_the_built_in_bundle': 0, 'number_cooling_water_passes_of_the_main_bundle': 2,
+    'mass_flow_cooling_water': 45000.0, 'temperature_cooling_water_1': 45.0,
+    'thermal_conductivity_cooling_surface_tube_material': 16.2, 'coefficient_b': 1.0,
+    'mass_flow_flow_path_1': 200.0, 'degree_dryness_flow_path_1': 0.95,
+}
+
+BERMAN_PARAMS = {
+    'length_cooling_tubes_of_the_main_bundle': 7.080, 'number_cooling_water_passes_of_the_main_bundle': 2,
+    'number_cooling_tubes_of_the_main_bundle': 1754, 'mass_flow_steam_nom': 16.0,
+    'thermal_conductivity_cooling_surface_tube_material': 37.0, 'diameter_inside_of_pipes': 22.0,
+    'thickness_pipe_wall': 1.0, 'enthalpy_flow_path_1': 520.0, 'BAP': 1,
+    'mass_flow_cooling_water_list': [1200], 'mass_flow_steam_list': [16], 'coefficient_R_list': [0.10e-6],
+    'temperature_cooling_water_1_list': [4, 5, 10, 15, 20, 25, 30, 35], 'mass_flow_air': 16.5,
+}
+
+VKU_PARAMS = {'mass_flow_steam_nom': 1250.0, 'degree_dryness_steam_nom': 0.92,
+              'mass_flow_flow_path_1': 301.2, 'degree_dryness_flow_path_1': 0.91, 'temperature_air': 20.0}
+
+TPS_PARAMS = {
+    'NAMET': {'data': [[35, 33, 30, 25], [20, 50, 100, 150, 200],
+                       [[6.549, 7.211, 8.88, 10.945, 13.409], [5.9, 6.499, 8.018, 9.927, 12.214],
+                        [5.036, 5.552, 6.872, 8.572, 10.622], [3.851, 4.257, 5.299, 6.712, 8.438]]]},
+    'NAMED': {'data': [[15.3, 26.8, 38.4, 49.9, 61.5, 73], [0.157, 0.258, 0.469, 0.607, 0.763, 0.919]]},
+}
+
+
+@pytest.fixture
+def registry():
+    REGISTRY.reset()
+    instrumentation.enable()
+    yield REGISTRY
+    instrumentation.disable()
+    REGISTRY.reset()
+
+
+def test_disabled_is_noop():
+    assert not instrumentation.is_enabled()
+    assert span('any') is span('other')
+    count('interpolations')
+    assert instrumentation.current_trace() is None
+    result = MetroVickersStrategy().calculate(MV_PARAMS)
+    assert result['pressure_flow_path_1'] == pytest.approx(0.11498207272441292)
+
+
+def test_metro_vickers_stages_and_counters():
+    strategy = MetroVickersStrategy()
+    with collect() as traces:
+        result = strategy.calculate(MV_PARAMS)
+    assert result['pressure_flow_path_1'] == pytest.approx(0.11498207272441292)
+    assert len(traces) == 1
+    trace = traces[0].as_dict()
+    assert trace['strategy'] == 'metro_vickers' and trace['status'] == 'success'
+    assert set(trace['stages']) == {'k_lookup', 'iteration', 'seuif97', 'unit_conversion'}
+    assert all(s['calls'] == 1 and s['seconds'] >= 0 for s in trace['stages'].values())
+    assert sum(s['seconds'] for s in trace['stages'].values()) <= trace['elapsed_s']
+    counters = trace['counters']
+    # Начальный поиск K плюс по одной интерполяции на итерацию
+    assert counters['interpolations'] == counters['iterations'] + 1
+    assert counters['property_calls'] == 1 and counters['unit_conversions'] == 1
+
+
+def test_berman_stages_and_counters():
+    with collect() as traces:
+        BermanStrategy().calculate(BERMAN_PARAMS)
+    trace = traces[0].as_dict()
+    assert trace['strategy'] == 'berman'
+    assert trace['stages']['heat_transfer']['calls'] == 8
+    assert trace['stages']['ejectors']['calls'] == 1
+    assert trace['counters'] == {'property_calls': 8, 'modes': 8}
+
+
+def test_nested_spans_and_error_status():
+    @instrumented('demo')
+    def calc(fail):
+        with span('outer'):
+            with span('inner'):
+                count('steps', 3)
+        if fail:
+            raise ZeroDivisionError
+        return 1
+
+    with collect() as traces:
+        calc(False)
+        with pytest.raises(ZeroDivisionError):
+            calc(True)
+    assert set(traces[0].stages) == {'outer', 'outer.inner'}
+    assert traces[0].counters == {'steps': 3}
+    assert traces[1].as_dict()['status'] == 'error'
+    assert traces[1].as_dict()['error_type'] == 'ZeroDivisionError'
+
+
+def test_registry_prometheus_export(registry):
+    strategy = MetroVickersStrategy()
+    for _ in range(3):
+        strategy.calculate(MV_PARAMS)
+    BermanStrategy().calculate(BERMAN_PARAMS)
+
+    metrics = registry.as_dict()
+    tasks = {tuple(sorted(m['labels'].items())): m['value'] for m in metrics['condenser_tasks_total']}
+    assert tasks[(('status', 'success'), ('strategy', 'metro_vickers'))] == 3
+    assert tasks[(('status', 'success'), ('strategy', 'berman'))] == 1
+    stages = {(m['labels']['strategy'], m['labels']['stage']): m['count']
+              for m in metrics['condenser_stage_duration_seconds']}
+    assert stages[('metro_vickers', 'seuif97')] == 3 and stages[('berman', 'heat_transfer')] == 8
+
+    text = registry.to_prometheus()
+    assert '# TYPE condenser_task_duration_seconds summary' in text
+    assert 'condenser_task_duration_seconds_count{strategy="metro_vickers"} 3' in text
+    assert 'condenser_operations_total{operation="property_calls",strategy="berman"} 8' in text
+
+
+def test_dispatch_batches_are_instrumented(registry):
+    vku = [{**VKU_PARAMS, 'mass_flow_flow_path_1': g} for g in (301.2, 250.0, 186.5)]
+    tps = [{**TPS_PARAMS, 'inputs': {'temperature_cooling_water_1': t, 'mass_flow_flow_path_1': 112.0}}
+           for t in (25.0, 30.0)]
+    results = dispatch([{'strategy': 'vku', 'params': p} for p in vku]
+                       + [{'strategy': 'table_pressure', 'params': p} for p in tps])
+    assert all(r.ok for r in results)
+
+    metrics = registry.as_dict()
+    tasks = {tuple(sorted(m['labels'].items())): m['value'] for m in metrics['condenser_tasks_total']}
+    assert tasks == {(('status', 'success'), ('strategy', 'vku')): 1,
+                     (('status', 'success'), ('strategy', 'table_pressure')): 1}
+    durations = {m['labels']['strategy']: m['count'] for m in metrics['condenser_task_duration_seconds']}
+    assert durations == {'vku': 1, 'table_pressure': 1}
+    operations = {(m['labels']['strategy'], m['labels']['operation']): m['value']
+                  for m in metrics['condenser_operations_total']}
+    assert operations[('vku', 'modes')] == 3 and operations[('table_pressure', 'modes')] == 2
+
+
+def test_collect_is_context_local():
+    seen = []
+
+    def worker():
+        seen.append(instrumentation.is_enabled())
+
+    with collect():
+        t = threading.Thread(target=worker)
+        t.start()
+        t.join()
+        assert instrumentation.is_enabled()
+    assert seen == [False]
@@ -87,5 +87,24 @@ class TestBermanEjectorPressure(unittest.TestCase):
 
         print("\nТест эжектора: все значения давлений успешно прошли проверку.")
 
+    def test_two_bundles_without_root_do_not_raise(self):
+        """
+        Без тепловой нагрузки (энтальпия 0) отрезок баланса пучков вырождается
+        в точку без смены знака: расчет не должен падать, как и прежний цикл.
+        """
+        params = dict(self.simulation_params,
+                      BAP=3, enthalpy_flow_path_1=0.0,
+                      length_cooling_tubes_of_the_built_in_bundle=7.080,
+                      number_cooling_tubes_of_the_built_in_bundle=400,
+                      number_cooling_water_passes_of_the_built_in_bundle=2,
+                      mass_flow_cooling_water_built_in_beam_list=[300],
+                      temperature_cooling_water_built_in_beam_1_list=[10] * 8)
+        main_results = self.strategy.calculate(params)['main_results']
+
+        self.assertEqual(len(main_results), 8)
+        # Нагрева нет: температура насыщения основного пучка равна температуре воды на входе
+        for temp, row in zip(params['temperature_cooling_water_1_list'], main_results):
+            self.assertAlmostEqual(row['saturation_temperature_C'], temp, places=9)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
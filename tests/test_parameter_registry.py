@@ -0,0 +1,467 @@
+"""
+Unit-тесты для слоя БД Parameter Registry Manager (Database / ParameterRegistry).
+
+Запуск:  pytest -q
+"""
+
+import json
+import os
+import sqlite3
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "Parameter Registry Manager"))
+
+import registry_cli  # noqa: E402
+from registry_core import Database, ParameterRegistry, connect  # noqa: E402
+
+
+def make_param(i: int, **overrides) -> dict:
+    param = {
+        "longCode": f"temperature.water.inlet.condenser.t-{i}",
+        "quantityKind": "thermodynamic-temperature",
+        "systemUnit": "К",
+        "allowedUnits": ["К", "°С"],
+        "method": "poly",
+        "shortCode": f"T_{i}",
+        "labels": {"ru": f"Температура {i}"},
+        "tags": ["test"],
+        "constraints": {"min": 0, "max": 1000},
+    }
+    param.update(overrides)
+    return param
+
+
+@pytest.fixture()
+def db(tmp_path) -> Database:
+    database = Database(str(tmp_path / "registry.db"))
+    yield database
+    database.conn.close()
+
+
+@pytest.fixture()
+def registry(db: Database) -> ParameterRegistry:
+    return ParameterRegistry(db, check_cache=True)
+
+
+def test_fresh_db_is_seeded(registry: ParameterRegistry):
+    rows = registry.list()
+    assert len(rows) == 3
+    for row in rows:
+        assert registry.validate_parameter(row["id"])["ok"]
+
+
+def test_transaction_commits_once(db: Database):
+    with db.transaction():
+        db._execute("INSERT INTO UNIT(code, dimension) VALUES (?, ?)", ("мм", "length"))
+        db.executemany("INSERT INTO UNIT(code, dimension) VALUES (?, ?)", [("м", "length"), ("км", "length")])
+        assert db.conn.in_transaction
+    assert not db.conn.in_transaction
+    codes = {r["code"] for r in db._execute("SELECT code FROM UNIT WHERE dimension='length'")}
+    assert codes == {"мм", "м", "км"}
+
+
+def test_transaction_rollback(db: Database):
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            db._execute("INSERT INTO UNIT(code, dimension) VALUES (?, ?)", ("мм", "length"))
+            raise RuntimeError("boom")
+    assert db._execute("SELECT 1 FROM UNIT WHERE code='мм'").fetchone() is None
+
+
+def test_nested_transaction_rolls_back_inner_only(db: Database):
+    with db.transaction():
+        db._execute("INSERT INTO UNIT(code, dimension) VALUES (?, ?)", ("мм", "length"))
+        with pytest.raises(ValueError):
+            with db.transaction():
+                db._execute("INSERT INTO UNIT(code, dimension) VALUES (?, ?)", ("м", "length"))
+                raise ValueError("inner")
+    codes = {r["code"] for r in db._execute("SELECT code FROM UNIT WHERE dimension='length'")}
+    assert codes == {"мм"}
+
+
+def test_outer_rollback_undoes_nested_block_run_first(db: Database):
+    # Вложенный блок выполняется до любой записи внешнего: его RELEASE не должен фиксировать
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            db._execute("SELECT COUNT(*) FROM UNIT").fetchone()
+            with db.transaction():
+                db._execute("INSERT INTO UNIT(code, dimension) VALUES (?, ?)", ("мм", "length"))
+            db._execute("INSERT INTO UNIT(code, dimension) VALUES (?, ?)", ("м", "length"))
+            raise RuntimeError("outer")
+    assert not db.conn.in_transaction
+    assert db._execute("SELECT 1 FROM UNIT WHERE dimension='length'").fetchone() is None
+
+
+def test_rollback_invalidates_vocab(db: Database):
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            db.add_unit("parsec", "length")
+            assert "parsec" in db.unit_codes()
+            raise RuntimeError("boom")
+    assert "parsec" not in db.unit_codes()
+
+
+def test_failed_create_leaves_no_trace(registry: ParameterRegistry, db: Database):
+    seq_before = db._execute("SELECT value FROM SEQ WHERE name='param_seq'").fetchone()["value"]
+    with pytest.raises(Exception):
+        # несуществующая единица нарушает внешний ключ PARAMETER_ALLOWED_UNIT -> UNIT
+        registry.create_parameter(make_param(1, allowedUnits=["К", "нет-такой"]))
+    seq_after = db._execute("SELECT value FROM SEQ WHERE name='param_seq'").fetchone()["value"]
+    assert seq_after == seq_before
+    assert registry.getByLongCode(make_param(1)["longCode"]) is None
+
+
+def test_create_and_update_parameter(registry: ParameterRegistry):
+    pid = registry.create_parameter(make_param(1))
+    assert sorted(registry.allowedUnits(pid)) == sorted(["К", "°С"])
+
+    registry.update_parameter(pid, make_param(1, allowedUnits=["К"]))
+    assert registry.allowedUnits(pid) == ["К"]
+    assert registry.getById(pid)["version_minor"] == 1
+
+
+def test_rename_unit_is_atomic(registry: ParameterRegistry, db: Database):
+    pid = registry.create_parameter(make_param(1))
+    registry.rename_unit("К", "K", "temperature")
+    assert registry.systemUnit(pid) == "K"
+    assert "K" in registry.allowedUnits(pid)
+    assert db._execute("SELECT 1 FROM UNIT WHERE code='К'").fetchone() is None
+
+
+def test_search_index_follows_mutations(registry: ParameterRegistry):
+    pid = registry.create_parameter(make_param(1, labels={"ru": "Температура охлаждающей воды"}))
+    assert [r["id"] for r in registry.list("темпер охлажд")] == [pid]
+    assert [r["id"] for r in registry.list("condenser t-1")] == [pid]
+
+    registry.update_parameter(pid, make_param(1, labels={"ru": "Расход конденсата"}))
+    assert registry.list("темпер охлажд") == []
+    assert [r["id"] for r in registry.list("конденс")] == [pid]
+
+    registry.delete_parameter(pid)
+    assert registry.list("конденс") == []
+
+
+def test_search_ranks_code_matches_first(registry: ParameterRegistry):
+    in_label = registry.create_parameter(make_param(1, labels={"ru": "см. condenser"},
+                                                    longCode="pressure.water.inlet.pipe.a"))
+    in_code = registry.create_parameter(make_param(2))  # condenser в long code
+    assert [r["id"] for r in registry.list("condenser")] == [in_code, in_label]
+
+
+def test_search_without_fts_falls_back_to_like(registry: ParameterRegistry, db: Database):
+    registry.create_parameter(make_param(1))
+    db.has_fts = False
+    assert [r["short_code"] for r in registry.list("ondens")] == ["T_1"]
+
+
+def test_search_index_migration(tmp_path):
+    path = str(tmp_path / "old.db")
+    db = Database(path)
+    db._execute("DROP TABLE PARAMETER_FTS")
+    for trigger in ("param_fts_ai", "param_fts_ad", "param_fts_au"):
+        db._execute(f"DROP TRIGGER {trigger}")
+    db.conn.close()
+
+    db = Database(path)
+    assert len(ParameterRegistry(db).list("compressor")) == 3
+    db.conn.close()
+
+
+def test_jsonl_round_trip(registry: ParameterRegistry, tmp_path):
+    for i in range(5):
+        registry.create_parameter(make_param(i, labels={"ru": f"Т{i}", "en": f"T{i}"}))
+    path = str(tmp_path / "params.jsonl")
+    assert registry.export_jsonl(path, method="poly") == 7  # 5 новых + 2 seed-примера методики poly
+
+    target = ParameterRegistry(Database(str(tmp_path / "target.db")))
+    target.db._execute("DELETE FROM PARAMETER")
+    report = target.import_jsonl(path, batch_size=2)
+    assert report["errors"] == []
+    assert len(report["imported"]) == report["total"] == 7
+
+    row = target.getByLongCode(make_param(3)["longCode"])
+    assert row["short_code"] == "T_3"
+    assert json.loads(row["labels"]) == {"ru": "Т3"}  # экспортируются только RU-поля
+    assert sorted(target.allowedUnits(row["id"])) == sorted(["К", "°С"])
+    target.db.conn.close()
+
+
+def test_jsonl_import_reports_row_errors(registry: ParameterRegistry, tmp_path):
+    registry.create_parameter(make_param(1))
+    lines = [
+        json.dumps(make_param(2), ensure_ascii=False),                      # 1: ok
+        "{not json",                                                        # 2: битый JSON
+        json.dumps(make_param(3, shortCode="T_1"), ensure_ascii=False),     # 3: shortCode занят в БД
+        json.dumps(make_param(1, shortCode="X"), ensure_ascii=False),       # 4: longCode занят
+        json.dumps(make_param(4, allowedUnits=["parsec"]), ensure_ascii=False),  # 5: нет единицы
+        json.dumps(make_param(5, shortCode="T_2"), ensure_ascii=False),     # 6: дубликат внутри файла
+        "",
+        json.dumps({"longCode": "pressure.water.inlet"}),                   # 8: нет systemUnit
+        json.dumps(make_param(6), ensure_ascii=False),                      # 9: ok
+    ]
+    path = tmp_path / "params.jsonl"
+    path.write_text("\n".join(lines), encoding="utf-8")
+
+    report = registry.import_jsonl(str(path), batch_size=3)
+    assert report["total"] == 8
+    assert [line for line, _ in report["errors"]] == [2, 3, 4, 5, 6, 8]
+    assert [registry.getById(pid)["short_code"] for pid in report["imported"]] == ["T_2", "T_6"]
+    assert "parsec" in dict(report["errors"])[5]
+
+
+def test_jsonl_import_abort_adds_nothing(registry: ParameterRegistry, db: Database, tmp_path, monkeypatch):
+    path = tmp_path / "params.jsonl"
+    path.write_text("\n".join(json.dumps(make_param(i), ensure_ascii=False) for i in range(1, 10)),
+                    encoding="utf-8")
+    count_sql = "SELECT COUNT(*) AS n FROM PARAMETER"
+    rows_before = db._execute(count_sql).fetchone()["n"]
+    seq_before = db._execute("SELECT value FROM SEQ WHERE name='param_seq'").fetchone()["value"]
+
+    insert_rows = registry._insert_rows
+    batches = []
+
+    def flaky_insert(rows):
+        if len(rows) > 1:
+            batches.append(len(rows))
+            if len(batches) == 2:
+                # второй пакет уходит в построчный повтор, который проходит
+                raise sqlite3.IntegrityError("batch")
+            if len(batches) == 3:
+                raise RuntimeError("abort")
+        insert_rows(rows)
+    monkeypatch.setattr(registry, "_insert_rows", flaky_insert)
+
+    with pytest.raises(RuntimeError):
+        registry.import_jsonl(str(path), batch_size=3)
+    assert db._execute(count_sql).fetchone()["n"] == rows_before
+    assert db._execute("SELECT value FROM SEQ WHERE name='param_seq'").fetchone()["value"] == seq_before
+    assert registry.getByLongCode(make_param(1)["longCode"]) is None
+
+
+def test_unseeded_database(tmp_path):
+    db = Database(str(tmp_path / "empty.db"), seed=False)
+    assert db._execute("SELECT COUNT(*) AS n FROM PARAMETER").fetchone()["n"] == 0
+    assert db._execute("SELECT COUNT(*) AS n FROM UNIT").fetchone()["n"] == 0
+    assert db.next_param_pid() == "PRM-00000001"
+    db.conn.close()
+
+
+def test_registry_core_does_not_import_tk():
+    import subprocess
+    code = "import sys, registry_core; print('tkinter' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                         cwd=os.path.dirname(registry_cli.__file__))
+    assert out.stdout.strip() == "False"
+
+
+def test_cli_round_trip(tmp_path, capsys):
+    src = str(tmp_path / "src.db")
+    assert registry_cli.main(["--db", src, "--seed", "search", "compressor inlet"]) == 0
+    assert "T_in" in capsys.readouterr().out
+
+    assert registry_cli.main(["--db", src, "validate-all"]) == 0
+    assert registry_cli.main(["--db", src, "export", str(tmp_path / "all.jsonl")]) == 0
+    assert registry_cli.main(["--db", src, "export-md", str(tmp_path / "poly.md"), "--method", "poly"]) == 0
+    assert (tmp_path / "poly.md").read_text(encoding="utf-8").count("\n") == 4  # заголовок + 2 параметра
+    capsys.readouterr()
+
+    dst = str(tmp_path / "dst.db")
+    registry_cli.main(["--db", dst, "--seed", "search", "x"])
+    # в dst те же seed-примеры, поэтому все строки отклоняются как дубликаты
+    assert registry_cli.main(["--db", dst, "import", str(tmp_path / "all.jsonl")]) == 1
+    assert "уже существует" in capsys.readouterr().err
+
+
+def test_cli_refuses_missing_db(tmp_path, capsys):
+    missing = tmp_path / "typo.db"
+    assert registry_cli.main(["--db", str(missing), "validate-all"]) == 2
+    assert "не найдена" in capsys.readouterr().err
+    assert not missing.exists()
+
+
+def test_cli_read_commands_do_not_modify_db(tmp_path):
+    import shutil
+    import sqlite3
+    src = str(tmp_path / "registry.db")
+    shutil.copy(os.path.join(os.path.dirname(registry_cli.__file__), "registry.db"), src)
+
+    def state():
+        conn = sqlite3.connect(src)
+        try:
+            return (conn.execute("PRAGMA journal_mode").fetchone()[0],
+                    sorted(r[0] for r in conn.execute("SELECT name FROM sqlite_master")))
+        finally:
+            conn.close()
+
+    before = state()
+    assert registry_cli.main(["--db", src, "search", "temperature"]) == 0
+    assert registry_cli.main(["--db", src, "export", str(tmp_path / "all.jsonl")]) == 0
+    registry_cli.main(["--db", src, "validate-all", "--errors-only"])
+    assert state() == before
+
+
+def test_registry_cache_loaded_lazily(db: Database):
+    reg = ParameterRegistry(db)
+    assert reg._cache_data is None
+    reg.list("temperature")
+    assert reg._cache_data is None
+    pid = reg.create_parameter(make_param(1))
+    assert reg._cache_data is None
+    assert reg.getByLongCode(make_param(1)["longCode"])["id"] == pid
+    assert reg.verify_cache() == []
+
+
+def test_vocab_cache_invalidation(registry: ParameterRegistry, db: Database):
+    long_code = "temperature.water.inlet.condenser.novel-zone"
+    assert registry.validate_long_code(long_code)[0] == []
+    assert "hx" not in db.segment_vocab("component")
+
+    db.add_segment("component", "hx")
+    assert "hx" in db.segment_vocab("component")
+    db.delete_segment("component", "hx")
+    assert "hx" not in db.segment_vocab("component")
+
+    assert "parsec" not in db.unit_codes()
+    db.add_unit("parsec", "length")
+    assert "parsec" in db.unit_codes()
+    with pytest.raises(ValueError):
+        db.add_unit("parsec")
+    db.rename_unit_with_dimension("parsec", "pc", "length")
+    assert "pc" in db.unit_codes() and "parsec" not in db.unit_codes()
+    db.delete_unit("pc")
+    assert "pc" not in db.unit_codes()
+
+
+def test_validate_all_matches_validate_parameter(registry: ParameterRegistry, db: Database):
+    registry.create_parameter(make_param(1))
+    registry.create_parameter(make_param(2, systemUnit="°С", allowedUnits=["К"], method="exotic"))
+    registry.create_parameter(make_param(3, constraints={"min": 5, "max": 1}))
+    db._execute("UPDATE PARAMETER SET short_code='3bad' WHERE short_code='T_3'")
+    db.delete_unit("°С")
+
+    batch = registry.validate_all()
+    assert list(batch) == [r["id"] for r in db._execute("SELECT id FROM PARAMETER ORDER BY long_code")]
+    for pid, result in batch.items():
+        assert result == registry.validate_parameter(pid)
+    assert sum(not r["ok"] for r in batch.values()) == 2
+
+
+def test_short_code_duplicates_same_rule(registry: ParameterRegistry, db: Database):
+    # База без уникального индекса (старая схема) может содержать дубликаты;
+    # коды, отличающиеся только пробелами, различны, как и для самого индекса
+    pids = [registry.create_parameter(make_param(i, method="poly")) for i in (1, 2, 3)]
+    db._execute("DROP INDEX idx_param_method_short")
+    db._execute("UPDATE PARAMETER SET short_code='T_1 ' WHERE id=?", (pids[1],))
+    db._execute("UPDATE PARAMETER SET short_code='T_1' WHERE id=?", (pids[2],))
+    batch = registry.validate_all()
+    for pid in pids:
+        assert batch[pid] == registry.validate_parameter(pid)
+    assert not batch[pids[0]]["ok"] and not batch[pids[2]]["ok"]
+    assert not any("уже используется" in e for e in batch[pids[1]]["errors"])
+
+
+def test_export_markdown_single_pass(registry: ParameterRegistry, tmp_path):
+    registry.create_parameter(make_param(1, labels={"ru": "Т | вход"}))
+    registry.create_parameter(make_param(2, method="mapfit", allowedUnits=["°С"], systemUnit="°С"))
+
+    path = tmp_path / "poly.md"
+    assert registry.export_markdown(str(path), "poly", with_units=True) == 3
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert lines[0] == "| Название | Системная ед. | Допустимые ед. | Короткий код | Длинный код |"
+    row = next(line for line in lines if "T_1" in line)
+    assert row == "| Т \\| вход | К | °С, К | T_1 | temperature.water.inlet.condenser.t-1 |"
+
+    path = tmp_path / "all.md"
+    n_total = len(registry.list())
+    assert registry.export_markdown(str(path), None) == n_total
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert lines[0].startswith("| Методика |") and len(lines) == n_total + 2
+
+    assert registry.export_markdown(str(tmp_path / "none.md"), "no-such-method") == 0
+    assert not (tmp_path / "none.md").exists()
+
+
+def test_cache_follows_mutations(registry: ParameterRegistry, db: Database, tmp_path):
+    pid = registry.create_parameter(make_param(1))
+    assert registry.getByLongCode("Temperature.Water.Inlet.Condenser.T-1")["id"] == pid
+
+    registry.update_parameter(pid, make_param(1, longCode="pressure.water.inlet.condenser.p-1"))
+    assert registry.getByLongCode(make_param(1)["longCode"]) is None
+    assert registry.getByLongCode("pressure.water.inlet.condenser.p-1")["id"] == pid
+
+    registry.rename_unit("К", "K", "temperature")
+    assert registry.systemUnit(pid) == "K"
+
+    path = tmp_path / "params.jsonl"
+    path.write_text(json.dumps(make_param(2, systemUnit="K", allowedUnits=["K"]), ensure_ascii=False),
+                    encoding="utf-8")
+    imported = registry.import_jsonl(str(path))["imported"]
+    assert registry.getByLongCode(make_param(2)["longCode"])["id"] == imported[0]
+
+    registry.delete_parameter(pid)
+    with pytest.raises(KeyError):
+        registry.systemUnit(pid)
+    assert registry.verify_cache() == []
+
+
+def test_verify_cache_detects_stale_rows(registry: ParameterRegistry, db: Database):
+    pid = registry.create_parameter(make_param(1))
+    db._execute("UPDATE PARAMETER SET system_unit='°С' WHERE id=?", (pid,))
+    assert registry.verify_cache() == [f"{pid}: устаревшая строка в кэше"]
+    with pytest.raises(RuntimeError, match="расходится"):
+        registry.delete_parameter("PRM-NOPE")
+    registry.refresh_cache()
+    assert registry.verify_cache() == []
+
+
+@pytest.mark.parametrize("search, use_fts", [("", True), ("condenser", True), ("ondens", False)])
+def test_list_page_walks_whole_result(registry: ParameterRegistry, db: Database, search, use_fts):
+    for i in range(7):
+        registry.create_parameter(make_param(i))
+    db.has_fts = use_fts
+    expected = [r["id"] for r in registry.list(search)]
+
+    seen, after = [], None
+    while True:
+        rows, after = registry.list_page(search, after=after, limit=3)
+        seen.extend(r["id"] for r in rows)
+        if after is None:
+            break
+    assert seen == expected
+
+
+def test_connection_pragmas(db: Database):
+    assert db.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert db.conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert db.conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+
+
+def test_readonly_reader_is_not_blocked_by_writer(registry: ParameterRegistry, db: Database):
+    pid = registry.create_parameter(make_param(1))
+    reader = db.open_reader()
+    try:
+        with pytest.raises(sqlite3.OperationalError):
+            reader.execute("DELETE FROM PARAMETER")
+
+        with db.transaction():
+            db._execute("UPDATE PARAMETER SET system_unit='°С' WHERE id=?", (pid,))
+            # незафиксированная запись не блокирует читателя и не видна ему
+            row = reader.execute("SELECT system_unit FROM PARAMETER WHERE id=?", (pid,)).fetchone()
+            assert row["system_unit"] == "К"
+        row = reader.execute("SELECT system_unit FROM PARAMETER WHERE id=?", (pid,)).fetchone()
+        assert row["system_unit"] == "°С"
+    finally:
+        reader.close()
+        registry.refresh_cache()
+
+
+def test_readonly_connect_after_writer_closed(tmp_path):
+    path = str(tmp_path / "dir with spaces" / "registry.db")
+    os.makedirs(os.path.dirname(path))
+    Database(path).conn.close()
+    conn = connect(path, readonly=True)
+    assert conn.execute("SELECT COUNT(*) FROM PARAMETER").fetchone()[0] == 3
+    conn.close()
@@ -0,0 +1,123 @@
+"""
+Unit-тесты для индекса реестра и резолвера входных параметров ``parameter_resolver.py``.
+
+Запуск:  pytest -q
+"""
+
+import os
+
+import pytest
+
+from utils.parameter_resolver import (ParameterConstraintError, ParameterIndex, ParameterResolver,
+                                      ParameterSpec)
+from utils.uniconv import UnknownUnitError
+
+REGISTRY_DB = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "Parameter Registry Manager", "registry.db")
+
+SPECS = [
+    ParameterSpec("PRM-1", "temperature.water.inlet.condenser.t1", "t1", "cond", "°С", ("°С", "К"), -10.0, 150.0),
+    ParameterSpec("PRM-2", "mass-flow.water.inlet.condenser.w", "W", "cond", "т/ч", ("т/ч", "кг/с"), 0.0, 1e5),
+    ParameterSpec("PRM-3", "mass-flow.steam.inlet.condenser.g", "W", "other", "т/ч", ("т/ч",)),
+]
+
+BINDINGS = {
+    'temperature_cooling_water_1': 't1',
+    'mass_flow_cooling_water': 'cond:W',
+}
+
+
+@pytest.fixture()
+def resolver() -> ParameterResolver:
+    return ParameterResolver(ParameterIndex(SPECS), BINDINGS)
+
+
+def test_index_lookup():
+    index = ParameterIndex(SPECS)
+    assert index.resolve("TEMPERATURE.water.inlet.condenser.t1").pid == "PRM-1"
+    assert index.resolve("t1").pid == "PRM-1"
+    assert index.resolve("other:W").pid == "PRM-3"
+    with pytest.raises(KeyError, match="неоднозначен"):
+        index.resolve("W")
+    with pytest.raises(KeyError, match="не найден"):
+        index.resolve("nope")
+
+
+def test_normalize_record(resolver: ParameterResolver):
+    record = {'temperature_cooling_water_1': 300.0, 'mass_flow_cooling_water': 10.0, 'coefficient_R': 0.5}
+    out = resolver.normalize(record, units={'temperature_cooling_water_1': 'К', 'mass_flow_cooling_water': 'кг/с'})
+    assert out['temperature_cooling_water_1'] == pytest.approx(26.85)
+    assert out['mass_flow_cooling_water'] == pytest.approx(36.0)
+    assert out['coefficient_R'] == 0.5
+    assert record['temperature_cooling_water_1'] == 300.0
+
+
+def test_batch_constraints_reported_together(resolver: ParameterResolver):
+    records = [
+        {'temperature_cooling_water_1': 20.0, 'mass_flow_cooling_water': 100.0},
+        {'temperature_cooling_water_1': [15.0, 200.0], 'mass_flow_cooling_water': -1.0},
+        {'temperature_cooling_water_1': -40.0},
+    ]
+    with pytest.raises(ParameterConstraintError) as exc:
+        resolver.normalize_batch(records)
+    assert [(i, field) for i, field, _, _ in exc.value.violations] == [
+        (1, 'mass_flow_cooling_water'), (1, 'temperature_cooling_water_1'), (2, 'temperature_cooling_water_1'),
+    ]
+    assert resolver.normalize_batch(records[:1]) == records[:1]
+
+
+def test_non_numeric_value_is_record_violation(resolver: ParameterResolver):
+    records = [
+        {'temperature_cooling_water_1': 20.0},
+        {'temperature_cooling_water_1': 'n/a'},
+        {'temperature_cooling_water_1': 200.0},
+    ]
+    with pytest.raises(ParameterConstraintError) as exc:
+        resolver.normalize_batch(records)
+    assert [(i, field, value) for i, field, value, _ in exc.value.violations] == [
+        (1, 'temperature_cooling_water_1', 'n/a'), (2, 'temperature_cooling_water_1', 200.0),
+    ]
+    assert "не число" in exc.value.violations[0][3]
+
+
+def test_non_numeric_value_with_conversion_is_record_violation(resolver: ParameterResolver):
+    records = [
+        {'temperature_cooling_water_1': 300.0},
+        {'temperature_cooling_water_1': 'n/a'},
+        {'temperature_cooling_water_1': [290.0, 'x']},
+    ]
+    with pytest.raises(ParameterConstraintError) as exc:
+        resolver.normalize_batch(records, units={'temperature_cooling_water_1': 'К'})
+    assert [(i, field, value) for i, field, value, _ in exc.value.violations] == [
+        (1, 'temperature_cooling_water_1', 'n/a'), (2, 'temperature_cooling_water_1', 'x'),
+    ]
+    assert resolver.normalize_batch(records[:1], units={'temperature_cooling_water_1': 'К'}) == [
+        {'temperature_cooling_water_1': pytest.approx(26.85)}]
+
+
+def test_unit_not_allowed(resolver: ParameterResolver):
+    with pytest.raises(UnknownUnitError, match="allowedUnits"):
+        resolver.normalize({'mass_flow_cooling_water': 1.0}, units={'mass_flow_cooling_water': 'кг/ч'})
+
+
+def test_index_from_shipped_registry():
+    index = ParameterIndex.from_db(REGISTRY_DB)
+    spec = index.resolve("initial-data-condenser:t1_op")
+    assert (spec.system_unit, spec.min, spec.max) == ("°С", -10.0, 150.0)
+    resolver = ParameterResolver(index, {'temperature_cooling_water_1': 'initial-data-condenser:t1_op'})
+    assert resolver.normalize({'temperature_cooling_water_1': 25.0}) == {'temperature_cooling_water_1': 25.0}
+
+
+def test_index_from_db_uses_readonly_registry_connection(monkeypatch):
+    from utils import parameter_resolver
+    registry_core = parameter_resolver._registry_core()
+    calls = []
+    connect = registry_core.connect
+
+    def spy(path, readonly=False, **kwargs):
+        calls.append(readonly)
+        return connect(path, readonly=readonly, **kwargs)
+
+    monkeypatch.setattr(registry_core, "connect", spy)
+    assert len(ParameterIndex.from_db(REGISTRY_DB)) > 0
+    assert calls == [True]
@@ -1,7 +1,10 @@
 import unittest
 
+import numpy as np
+
 from utils.base_for_selection import ProblemDefinition
-from utils.selection_methods import AnalyticalSolver, BisectionSolver, NewtonSolver
+from utils.selection_methods import (AnalyticalSolver, BisectionSolver, NewtonSolver, SafeguardedNewtonSolver,
+                                     VectorAnalyticalSolver, VectorBisectionSolver, VectorNewtonSolver)
 
 
 class TestSolvers(unittest.TestCase):
@@ -49,5 +52,116 @@ class TestSolvers(unittest.TestCase):
             solver.solve(self.target_delta, a=3.0, b=10.0)
 
 
+class TestVectorSolvers(unittest.TestCase):
+
+    def setUp(self):
+        """Массив целей и эталонные корни, посчитанные аналитически."""
+        self.problem = ProblemDefinition()
+        self.targets = np.linspace(0.0005, 0.05, 200)
+        self.expected = VectorAnalyticalSolver(self.problem).solve(self.targets)
+
+    def test_problem_arrays_match_scalar(self):
+        """Тест: векторные calculate_delta/df совпадают со скалярными."""
+        x = np.array([0.5, 1.0, 2.0694058273, 7.5])
+        np.testing.assert_allclose(self.problem.calculate_delta_array(x),
+                                   [self.problem.calculate_delta(v) for v in x])
+        np.testing.assert_allclose(self.problem.df_array(x), [self.problem.df(v) for v in x])
+        self.assertTrue(np.isnan(self.problem.calculate_delta_array(np.array([-1.0, 0.0]))).all())
+
+    def test_vector_analytical_matches_scalar(self):
+        """Тест: векторное аналитическое решение совпадает со скалярным."""
+        scalar = AnalyticalSolver(self.problem)
+        np.testing.assert_allclose(self.expected, [scalar.solve(t) for t in self.targets])
+
+    def test_vector_newton(self):
+        """Тест: векторный Ньютон сходится для всех целей."""
+        solver = VectorNewtonSolver(self.problem, tol=1e-9)
+        result = solver.solve(self.targets, initial_guess=2.0)
+        np.testing.assert_allclose(result, self.expected, atol=1e-7)
+        self.assertTrue(solver.converged.all())
+        self.assertLess(solver.iterations, 10)
+
+    def test_vector_bisection(self):
+        """Тест: векторная дихотомия сходится для всех целей."""
+        solver = VectorBisectionSolver(self.problem, tol=1e-7)
+        result = solver.solve(self.targets, a=1.0, b=3.0)
+        np.testing.assert_allclose(result, self.expected, atol=1e-6)
+        self.assertTrue(solver.converged.all())
+
+    def test_vector_newton_fails_to_converge(self):
+        """Тест: векторный Ньютон сообщает о несошедшихся элементах."""
+        solver = VectorNewtonSolver(self.problem, max_iter=1)
+        with self.assertRaisesRegex(RuntimeError, "не сошелся за 1 итераций"):
+            solver.solve(self.targets, initial_guess=10.0)
+        self.assertFalse(solver.converged.all())
+
+    def test_vector_bisection_fails_bad_initial_range(self):
+        """Тест: векторная дихотомия проверяет знаки на концах для каждого элемента."""
+        solver = VectorBisectionSolver(self.problem)
+        with self.assertRaisesRegex(ValueError, "функция имеет одинаковый знак"):
+            solver.solve(self.targets, a=3.0, b=10.0)
+
+
+class TestSafeguardedNewtonSolver(unittest.TestCase):
+
+    def setUp(self):
+        self.problem = ProblemDefinition()
+        self.target_delta = 0.001
+        self.expected_x = 2.0694058273
+
+    def test_cold_start_convergence(self):
+        """Тест: гибридный метод сходится без подсказки."""
+        solver = SafeguardedNewtonSolver(self.problem)
+        result = solver.solve(self.target_delta)
+        self.assertAlmostEqual(result, self.expected_x, places=7)
+        self.assertEqual(solver.last_solution, result)
+
+    def test_converges_where_newton_fails(self):
+        """Тест: из точки, где Ньютон расходится, гибрид всё равно сходится."""
+        solver = SafeguardedNewtonSolver(self.problem, max_iter=50)
+        result = solver.solve(self.target_delta, a=1.0, b=10.0, initial_guess=9.0)
+        self.assertAlmostEqual(result, self.expected_x, places=7)
+
+    def test_warm_start_reduces_iterations(self):
+        """Тест: тёплый старт от близкого решения требует меньше итераций."""
+        solver = SafeguardedNewtonSolver(self.problem, warm_start=True)
+        solver.solve(self.target_delta)
+        cold = solver.iterations
+        result = solver.solve(self.target_delta * 1.001)
+        self.assertLess(solver.iterations, cold)
+        self.assertAlmostEqual(result, AnalyticalSolver(self.problem).solve(self.target_delta * 1.001), places=7)
+
+    def test_cold_by_default(self):
+        """Тест: по умолчанию повторный solve не стартует от предыдущего решения."""
+        solver = SafeguardedNewtonSolver(self.problem)
+        solver.solve(self.target_delta)
+        cold = solver.iterations
+        solver.solve(self.target_delta * 1.001)
+        self.assertEqual(solver.iterations, cold)
+
+    def test_solve_sequence_warm_starts(self):
+        """Тест: solve_sequence передаёт решения как тёплый старт и при warm_start=False."""
+        targets = np.linspace(0.0009, 0.0011, 5)
+        cold = SafeguardedNewtonSolver(self.problem)
+        cold.solve(targets[-1])
+        solver = SafeguardedNewtonSolver(self.problem)
+        solver.solve_sequence(targets)
+        self.assertLess(solver.iterations, cold.iterations)
+
+    def test_solve_sequence(self):
+        """Тест: последовательность решений совпадает с аналитическими."""
+        targets = np.linspace(0.0009, 0.0011, 20)
+        solver = SafeguardedNewtonSolver(self.problem)
+        result = solver.solve_sequence(targets)
+        analytical = AnalyticalSolver(self.problem)
+        np.testing.assert_allclose(result, [analytical.solve(t) for t in targets], atol=1e-7)
+
+    def test_bad_initial_range(self):
+        """Тест: ошибка, если на концах отрезка нет смены знака."""
+        solver = SafeguardedNewtonSolver(self.problem, warm_start=False)
+        with self.assertRaisesRegex(ValueError, "функция имеет одинаковый знак"):
+            solver.solve(self.target_delta, a=3.0, b=10.0)
+
+
 if __name__ == '__main__':
     unittest.main(argv=['first-arg-is-ignored'], exit=False, verbosity=2)
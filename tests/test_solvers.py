@@ -0,0 +1,149 @@
+"""
+Unit-тесты для общей подсистемы решателей ``solvers.py``.
+
+Запуск:  pytest -q
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from utils.base_for_selection import ProblemDefinition
+from utils.berman_strategy import BermanStrategy
+from utils.solvers import (BracketRootSolver, ConvergenceError, FixedPointSolver, NewtonRootSolver,
+                           SolverStats)
+
+EXPECTED_X = 2.0694058273  # решение ProblemDefinition при target_delta = 0.001
+
+
+@pytest.fixture()
+def stats() -> SolverStats:
+    return SolverStats()
+
+
+def test_fixed_point_plain(stats: SolverStats):
+    solver = FixedPointSolver(tol=1e-10, stats=stats)
+    result = solver.solve(math.cos, x0=1.0)
+    assert result.converged
+    assert result.value == pytest.approx(0.7390851332, abs=1e-9)
+    assert isinstance(result.value, float)
+
+
+def test_anderson_reduces_iterations(stats: SolverStats):
+    plain = FixedPointSolver(tol=1e-10, stats=stats).solve(math.cos, x0=1.0)
+    accelerated = FixedPointSolver(tol=1e-10, anderson_depth=2, stats=stats).solve(math.cos, x0=1.0)
+    assert accelerated.value == pytest.approx(plain.value, abs=1e-9)
+    assert accelerated.iterations < plain.iterations / 3
+
+
+def test_fixed_point_vector(stats: SolverStats):
+    g = lambda x: np.array([0.5 * x[1] + 1.0, 0.25 * x[0]])
+    result = FixedPointSolver(tol=1e-12, anderson_depth=3, stats=stats).solve(g, x0=np.zeros(2))
+    np.testing.assert_allclose(result.value, [8 / 7, 2 / 7])
+
+
+@pytest.mark.parametrize("method", ["illinois", "bisection"])
+def test_bracket_solver(method, stats: SolverStats):
+    problem = ProblemDefinition()
+    solver = BracketRootSolver(method=method, ftol=1e-12, stats=stats)
+    result = solver.solve(lambda x: problem.f(x, 0.001), bracket=(1.0, 10.0))
+    assert result.value == pytest.approx(EXPECTED_X, abs=1e-7)
+    assert result.method == method
+
+
+def test_bracket_same_sign_raises(stats: SolverStats):
+    solver = BracketRootSolver(stats=stats)
+    with pytest.raises(ValueError, match="одинаковый знак"):
+        solver.solve(lambda x: x - 5.0, bracket=(0.0, 1.0))
+
+
+def test_bracket_same_sign_without_raise(stats: SolverStats):
+    solver = BracketRootSolver(raise_on_failure=False, stats=stats, name='no_root')
+    result = solver.solve(lambda x: x - 5.0, bracket=(0.0, 1.0))
+    assert not result.converged
+    assert result.value == 1.0 and result.residual == pytest.approx(4.0)
+    assert stats.as_dict()['no_root']['failures'] == 1
+
+
+def test_newton_same_sign_without_raise(stats: SolverStats):
+    solver = NewtonRootSolver(raise_on_failure=False, stats=stats, name='no_root')
+    result = solver.solve(lambda x: x - 5.0, bracket=(0.0, 1.0))
+    assert not result.converged
+    assert result.value == 1.0 and result.residual == pytest.approx(4.0)
+    with pytest.raises(ValueError, match="одинаковый знак"):
+        NewtonRootSolver().solve(lambda x: x - 5.0, bracket=(0.0, 1.0))
+
+
+def test_newton_zero_iterations():
+    result = NewtonRootSolver(max_iter=0, raise_on_failure=False).solve(lambda x: x - 5.0, x0=1.0)
+    assert not result.converged and result.iterations == 0 and result.value == 1.0
+
+
+def test_bracket_expand(stats: SolverStats):
+    solver = BracketRootSolver(expand=10, stats=stats)
+    result = solver.solve(lambda x: x - 5.0, bracket=(0.0, 1.0))
+    assert result.value == pytest.approx(5.0)
+
+
+def test_newton_with_derivative_and_secant(stats: SolverStats):
+    problem = ProblemDefinition()
+    f = lambda x: problem.f(x, 0.001)
+    newton = NewtonRootSolver(stats=stats).solve(f, x0=2.0, df=problem.df)
+    secant = NewtonRootSolver(stats=stats).solve(f, x0=2.0)
+    assert newton.value == pytest.approx(EXPECTED_X, abs=1e-7)
+    assert secant.value == pytest.approx(EXPECTED_X, abs=1e-7)
+
+
+def test_newton_bracket_safeguard(stats: SolverStats):
+    problem = ProblemDefinition()
+    f = lambda x: problem.f(x, 0.001)
+    # Из x0 = 10 чистый Ньютон расходится; защита отрезком обеспечивает сходимость
+    result = NewtonRootSolver(stats=stats).solve(f, x0=9.0, bracket=(1.0, 10.0), df=problem.df)
+    assert result.value == pytest.approx(EXPECTED_X, abs=1e-7)
+
+
+def test_convergence_error_and_stats(stats: SolverStats):
+    solver = FixedPointSolver(name='test.fp', max_iter=3, record_history=True, stats=stats)
+    with pytest.raises(ConvergenceError) as exc:
+        solver.solve(lambda x: x + 1.0, x0=0.0)
+    assert exc.value.result.history == [1.0, 1.0, 1.0]
+
+    quiet = FixedPointSolver(name='test.fp', max_iter=3, raise_on_failure=False, stats=stats)
+    assert not quiet.solve(lambda x: x + 1.0, x0=0.0).converged
+
+    entry = stats.as_dict()['test.fp']
+    assert entry['calls'] == 2
+    assert entry['failures'] == 2
+    assert entry['mean_iterations'] == 3
+
+
+def test_berman_two_bundle_balance(stats: SolverStats):
+    strategy = BermanStrategy()
+    strategy._balance_solver.stats = stats
+    params = {
+        'length_cooling_tubes_of_the_main_bundle': 8.9,
+        'length_cooling_tubes_of_the_built_in_bundle': 8.9,
+        'number_cooling_water_passes_of_the_main_bundle': 2,
+        'number_cooling_water_passes_of_the_built_in_bundle': 2,
+        'number_cooling_tubes_of_the_main_bundle': 10000,
+        'number_cooling_tubes_of_the_built_in_bundle': 2000,
+        'enthalpy_flow_path_1': 535.0,
+        'mass_flow_steam_nom': 250.0,
+        'thermal_conductivity_cooling_surface_tube_material': 100.0,
+        'BAP': 3,
+        'diameter_inside_of_pipes': 26.0,
+        'thickness_pipe_wall': 1.0,
+        'mass_flow_cooling_water_list': [20000.0],
+        'mass_flow_cooling_water_built_in_beam_list': [4000.0],
+        'temperature_cooling_water_1_list': [10.0, 30.0],
+        'temperature_cooling_water_built_in_beam_1_list': [15.0, 32.0],
+        'mass_flow_steam_list': [150.0, 250.0],
+        'coefficient_R_list': [0.0],
+    }
+    results = strategy.calculate(params)['main_results']
+    assert [round(r['saturation_temperature_C'], 2) for r in results] == pytest.approx(
+        [16.22, 19.50, 34.80, 37.78], abs=0.01)
+    entry = stats.as_dict()['berman.saturation_balance']
+    assert entry['calls'] == 4
+    assert entry['failures'] == 0
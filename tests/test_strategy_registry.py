@@ -0,0 +1,150 @@
+import numpy as np
+import pytest
+
+from utils.TPS_module import TablePressureStrategy
+from utils.VKU_strategy import VKUStrategy
+from utils.metrovickers_strategy import MetroVickersStrategy
+from utils.strategy_registry import STRATEGY_REGISTRY, StrategyRegistry, UnknownStrategyError, dispatch
+
+VKU_INIT = {'mass_flow_steam_nom': 1250.0, 'degree_dryness_steam_nom': 0.92}
+
+MV_PARAMS = {
+    'diameter_inside_of_pipes': 22.4, 'thickness_pipe_wall': 0.8,
+    'length_cooling_tubes_of_the_main_bundle': 13910, 'number_cooling_tubes_of_the_main_bundle': 20904,
+    'number_cooling_tubes_of_the_built_in_bundle': 0, 'number_cooling_water_passes_of_the_main_bundle': 2,
+    'mass_flow_cooling_water': 45000.0, 'temperature_cooling_water_1': 45.0,
+    'thermal_conductivity_cooling_surface_tube_material': 16.2, 'coefficient_b': 1.0,
+    'mass_flow_flow_path_1': 200.0, 'degree_dryness_flow_path_1': 0.95,
+}
+
+TPS_TABLES = {
+    'NAMET': {'data': [[35, 33, 30, 25], [20, 50, 100, 150, 200],
+                       [[6.549, 7.211, 8.88, 10.945, 13.409], [5.9, 6.499, 8.018, 9.927, 12.214],
+                        [5.036, 5.552, 6.872, 8.572, 10.622], [3.851, 4.257, 5.299, 6.712, 8.438]]]},
+    'NAMED': {'data': [[15.3, 26.8, 38.4, 49.9, 61.5, 73], [0.157, 0.258, 0.469, 0.607, 0.763, 0.919]]},
+}
+
+
+def _vku(g, x=0.91, t_air=20.0, **init):
+    return {**VKU_INIT, **init, 'mass_flow_flow_path_1': g, 'degree_dryness_flow_path_1': x, 'temperature_air': t_air}
+
+
+def _tps(t, g):
+    return {**TPS_TABLES, 'inputs': {'temperature_cooling_water_1': t, 'mass_flow_flow_path_1': g}}
+
+
+def test_vku_batch_matches_scalar():
+    strategy = VKUStrategy(**VKU_INIT)
+    modes = [_vku(g, x, t) for g, x, t in [(301.2, 0.903, 20.0), (1250.0, 0.92, 30.0), (186.5, 0.907, 37.5)]]
+    batch = strategy.calculate_batch(modes)
+    for params, result in zip(modes, batch):
+        expected = strategy.calculate(params)
+        assert result['pressure_flow_path_1'] == pytest.approx(expected['pressure_flow_path_1'], rel=1e-12)
+        assert result['mass_flow_reduced_steam_condencer'] == pytest.approx(
+            expected['mass_flow_reduced_steam_condencer'], rel=1e-12)
+    assert strategy.calculate_batch([]) == []
+    with pytest.raises(KeyError):
+        strategy.calculate_batch([{'mass_flow_flow_path_1': 300.0}])
+
+
+def test_table_pressure_batch_matches_scalar():
+    strategy = TablePressureStrategy()
+    modes = [_tps(30.0, 112.0), _tps(27.5, 40.0), _tps(34.0, 190.0), _tps(20.0, 20.0)]
+    for params, result in zip(modes, strategy.calculate_batch(modes)):
+        expected = strategy.calculate(params)
+        for key in ('pressure_flow_path_1', 'pressure_flow_path_1_NAMET', 'pressure_flow_path_1_NAMED'):
+            assert result[key] == pytest.approx(expected[key], rel=1e-12)
+
+
+def test_instances_pooled_per_init_params():
+    registry = StrategyRegistry()
+    registry.register('vku', VKUStrategy, init_keys=('mass_flow_steam_nom', 'degree_dryness_steam_nom'))
+    registry.register('metro_vickers', MetroVickersStrategy)
+    a = registry.instance('vku', _vku(300.0))
+    assert registry.instance('vku', _vku(250.0, 0.95)) is a
+    assert registry.instance('vku', _vku(300.0, mass_flow_steam_nom=1000.0)) is not a
+    assert registry.instance('metro_vickers') is registry.instance('metro_vickers', MV_PARAMS)
+    with pytest.raises(KeyError, match='mass_flow_steam_nom'):
+        registry.instance('vku', {'degree_dryness_steam_nom': 0.92})
+    with pytest.raises(UnknownStrategyError):
+        registry.instance('nope')
+
+
+def test_pool_is_bounded():
+    registry = StrategyRegistry(max_instances=2)
+    registry.register('vku', VKUStrategy, init_keys=('mass_flow_steam_nom', 'degree_dryness_steam_nom'))
+    first = registry.instance('vku', _vku(300.0, mass_flow_steam_nom=1000.0))
+    for nom in (1100.0, 1200.0):
+        registry.instance('vku', _vku(300.0, mass_flow_steam_nom=nom))
+    assert registry.instance('vku', _vku(300.0, mass_flow_steam_nom=1000.0)) is not first
+
+
+def test_dispatch_groups_and_preserves_order(monkeypatch):
+    calls = []
+    original = VKUStrategy.calculate_batch
+
+    def spy(self, params_list):
+        calls.append(len(params_list))
+        return original(self, params_list)
+    monkeypatch.setattr(VKUStrategy, 'calculate_batch', spy)
+
+    records = [
+        {'strategy': 'vku', 'params': _vku(301.2)},
+        {'strategy': 'table_pressure', 'params': _tps(30.0, 112.0)},
+        {'strategy': 'metro_vickers', 'params': MV_PARAMS},
+        {'strategy': 'vku', 'params': _vku(247.8, mass_flow_steam_nom=1000.0)},
+        {'strategy': 'vku', 'params': _vku(186.5)},
+        {'strategy': 'table_pressure', 'params': _tps(25.0, 60.0)},
+    ]
+    results = dispatch(records)
+
+    assert [r.strategy for r in results] == [r['strategy'] for r in records]
+    assert all(r.ok for r in results)
+    # Две группы ВКУ (разные номинальные расходы): 2 + 1 режима
+    assert sorted(calls) == [1, 2]
+    for record, task in zip(records, results):
+        expected = STRATEGY_REGISTRY.calculate(record['strategy'], record['params'])
+        assert task.result['pressure_flow_path_1'] == pytest.approx(expected['pressure_flow_path_1'], rel=1e-12)
+    assert results[1].result['pressure_flow_path_1'] == pytest.approx(7.280, rel=0.01)
+
+
+def test_dispatch_isolates_errors():
+    bad_vku = {'strategy': 'vku', 'params': {**VKU_INIT, 'mass_flow_flow_path_1': 300.0}}
+    results = dispatch([
+        {'strategy': 'vku', 'params': _vku(301.2)},
+        bad_vku,
+        {'strategy': 'unknown', 'params': {}},
+        {'strategy': 'vku', 'params': {'mass_flow_flow_path_1': 300.0}},
+    ])
+    assert results[0].ok and results[0].result['pressure_flow_path_1'] > 0
+    assert isinstance(results[1].error, KeyError)
+    assert isinstance(results[2].error, UnknownStrategyError)
+    assert isinstance(results[3].error, KeyError)
+
+
+def test_dispatch_survives_unhashable_params():
+    odd = {**MV_PARAMS, 'thickness_pipe_wall': {0.8}}
+    odd_object = {**MV_PARAMS, 'diameter_inside_of_pipes': type('Unhashable', (), {'__hash__': None})()}
+    results = dispatch([
+        {'strategy': 'metro_vickers', 'params': odd},
+        {'strategy': 'metro_vickers', 'params': odd_object},
+        {'strategy': 'vku', 'params': _vku(301.2)},
+    ])
+    assert [r.strategy for r in results] == ['metro_vickers', 'metro_vickers', 'vku']
+    assert not results[0].ok and not results[1].ok
+    assert results[2].ok and results[2].result['pressure_flow_path_1'] > 0
+
+
+def test_table_pressure_batch_accepts_array_tables():
+    tables = {'NAMET': {'data': [np.asarray(v) for v in TPS_TABLES['NAMET']['data']]},
+              'NAMED': {'data': np.asarray(TPS_TABLES['NAMED']['data'])}}
+    modes = [{**tables, 'inputs': _tps(t, 112.0)['inputs']} for t in (25.0, 30.0)]
+    batch = TablePressureStrategy().calculate_batch(modes)
+    expected = TablePressureStrategy().calculate_batch([_tps(t, 112.0) for t in (25.0, 30.0)])
+    assert batch == expected
+
+
+def test_result_keys_match_worker_contract():
+    assert {n: STRATEGY_REGISTRY.spec(n).result_key for n in STRATEGY_REGISTRY.names()} == {
+        'berman': 'berman_results', 'metro_vickers': 'metro_vickers_results',
+        'vku': 'vku_results', 'table_pressure': 'table_pressure_results'}
@@ -8,9 +8,11 @@
 import pytest
 
 from utils.uniconv import (
+    FrozenConverterError,
     UnitConverter,
     UnknownParameterError,
     UnknownUnitError,
+    get_default_converter,
 )
 
 
@@ -140,4 +142,42 @@ def test_unknown_parameter_raises(uc: UnitConverter):
 
 def test_unknown_unit_raises(uc: UnitConverter):
     with pytest.raises(UnknownUnitError):
-        uc.convert(1, from_unit="foo", to_unit="bar", parameter_type="pressure")
\ No newline at end of file
+        uc.convert(1, from_unit="foo", to_unit="bar", parameter_type="pressure")
+
+
+# ------------------------------------------------------------------
+# 5. Общие таблицы по умолчанию и copy-on-write
+# ------------------------------------------------------------------
+def test_instances_share_default_tables():
+    a, b = UnitConverter(), UnitConverter()
+    assert a.parameters is b.parameters
+
+
+def test_add_unit_copies_on_write():
+    """Расширение одного экземпляра не должно влиять на остальные."""
+    extended, plain = UnitConverter(), UnitConverter()
+    extended.add_unit("pressure", unit_symbol="psi", unit_name="фунт на кв. дюйм",
+                      to_base=6_894.757 / 98_066.5)
+
+    assert "psi" in extended.get_available_units("pressure")
+    assert "psi" not in plain.get_available_units("pressure")
+    assert "psi" not in UnitConverter().get_available_units("pressure")
+    # Стандартные единицы в расширенном экземпляре сохраняются
+    assert extended.convert(1, from_unit="бар", to_unit="Па",
+                            parameter_type="pressure") == pytest.approx(100_000)
+
+
+def test_default_tables_are_read_only():
+    with pytest.raises(TypeError):
+        UnitConverter().parameters["pressure"]["units"]["psi"] = {}
+
+
+def test_default_converter_is_singleton_and_frozen():
+    uc = get_default_converter()
+    assert uc is get_default_converter()
+    assert uc.convert(100, from_unit="°C", to_unit="K",
+                      parameter_type="temperature") == pytest.approx(373.15)
+    with pytest.raises(FrozenConverterError):
+        uc.add_unit("pressure", unit_symbol="psi", unit_name="psi", to_base=0.07)
+    with pytest.raises(FrozenConverterError):
+        uc.add_parameter("area", base_unit_symbol="м²", base_unit_name="квадратный метр")
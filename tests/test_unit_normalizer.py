@@ -0,0 +1,113 @@
+"""
+Unit-тесты для RecordNormalizer из модуля ``unit_normalizer.py``.
+
+Запуск:  pytest -q
+"""
+
+import numpy as np
+import pytest
+
+from utils.berman_strategy import BermanStrategy
+from utils.unit_normalizer import RecordNormalizer
+from utils.uniconv import UnknownUnitError
+
+TARGET = {
+    'diameter_inside_of_pipes': ('length', 'мм'),
+    'mass_flow_cooling_water': ('mass_flow', 'т/ч'),
+    'temperature_cooling_water_1': ('temperature', '°C'),
+    'enthalpy_flow_path_1': ('enthalpy', 'ккал/кг'),
+}
+
+SOURCE = {
+    'diameter_inside_of_pipes': ('length', 'м'),
+    'mass_flow_cooling_water': ('mass_flow', 'кг/с'),
+    'temperature_cooling_water_1': ('temperature', 'K'),
+    'enthalpy_flow_path_1': ('enthalpy', 'кДж/кг'),
+}
+
+
+@pytest.fixture()
+def normalizer() -> RecordNormalizer:
+    return RecordNormalizer(TARGET)
+
+
+def test_normalize_single_record(normalizer: RecordNormalizer):
+    record = {
+        'diameter_inside_of_pipes': 0.0224,
+        'mass_flow_cooling_water': 12500.0,
+        'temperature_cooling_water_1': 293.15,
+        'enthalpy_flow_path_1': 2300.5,
+        'number_cooling_water_passes_of_the_main_bundle': 2,
+    }
+    out = normalizer.normalize(record, SOURCE)
+
+    assert out['diameter_inside_of_pipes'] == pytest.approx(22.4)
+    assert out['mass_flow_cooling_water'] == pytest.approx(45000.0)
+    assert out['temperature_cooling_water_1'] == pytest.approx(20.0)
+    assert out['enthalpy_flow_path_1'] == pytest.approx(2300.5 / 4.1868)
+    # Поля вне схемы переносятся без изменений, исходная запись не меняется
+    assert out['number_cooling_water_passes_of_the_main_bundle'] == 2
+    assert record['diameter_inside_of_pipes'] == 0.0224
+
+
+def test_same_units_are_skipped(normalizer: RecordNormalizer):
+    compiled = normalizer.compile({'diameter_inside_of_pipes': ('length', 'мм')})
+    assert compiled.steps == ()
+
+
+def test_compiled_schema_is_cached(normalizer: RecordNormalizer):
+    assert normalizer.compile(SOURCE) is normalizer.compile(dict(SOURCE))
+
+
+def test_batch_matches_single(normalizer: RecordNormalizer):
+    records = [
+        {'diameter_inside_of_pipes': 0.02 + i * 1e-3,
+         'mass_flow_cooling_water': 1000.0 * (i + 1),
+         'temperature_cooling_water_1': 280.0 + i}
+        for i in range(5)
+    ]
+    records.append({'diameter_inside_of_pipes': 0.03})  # неполная запись
+
+    batch = normalizer.normalize_batch(records, SOURCE)
+    single = [normalizer.normalize(r, SOURCE) for r in records]
+
+    assert len(batch) == len(single)
+    for b, s in zip(batch, single):
+        assert b.keys() == s.keys()
+        for key in b:
+            assert b[key] == pytest.approx(s[key])
+            assert isinstance(b[key], float)
+
+
+def test_list_values_are_converted():
+    normalizer = RecordNormalizer(BermanStrategy.INPUT_UNITS)
+    out = normalizer.normalize(
+        {'temperature_cooling_water_1_list': [288.15, 293.15],
+         'length_cooling_tubes_of_the_main_bundle': 7080.0},
+        {'temperature_cooling_water_1_list': ('temperature', 'K'),
+         'length_cooling_tubes_of_the_main_bundle': ('length', 'мм')},
+    )
+    assert out['temperature_cooling_water_1_list'] == pytest.approx([15.0, 20.0])
+    assert out['length_cooling_tubes_of_the_main_bundle'] == pytest.approx(7.08)
+
+
+def test_apply_columns(normalizer: RecordNormalizer):
+    compiled = normalizer.compile(SOURCE)
+    cols = compiled.apply_columns({'mass_flow_cooling_water': [1.0, 2.0, 10.0]})
+    assert isinstance(cols['mass_flow_cooling_water'], np.ndarray)
+    assert cols['mass_flow_cooling_water'] == pytest.approx([3.6, 7.2, 36.0])
+
+
+def test_unknown_field_raises(normalizer: RecordNormalizer):
+    with pytest.raises(KeyError):
+        normalizer.compile({'unknown_field': ('length', 'м')})
+
+
+def test_quantity_mismatch_raises(normalizer: RecordNormalizer):
+    with pytest.raises(ValueError, match="не совпадает"):
+        normalizer.compile({'diameter_inside_of_pipes': ('pressure', 'Па')})
+
+
+def test_unknown_unit_raises(normalizer: RecordNormalizer):
+    with pytest.raises(UnknownUnitError):
+        normalizer.compile({'diameter_inside_of_pipes': ('length', 'дюйм')})
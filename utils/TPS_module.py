@@ -2,6 +2,18 @@ from typing import Dict, Any, List
 import numpy as np
 from scipy import interpolate
 
+from utils.instrumentation import count, instrumented
+
+
+def _freeze_table(data: Any) -> Any:
+    # Хешируемый ключ таблицы NAMET/NAMED: вложенные списки и массивы -> кортежи
+    if isinstance(data, (list, tuple)):
+        return tuple(_freeze_table(v) for v in data)
+    if hasattr(data, 'tolist'):
+        return _freeze_table(data.tolist())
+    return data
+
+
 class TablePressureStrategy:    
     def _create_namet_interpolator(self, namet_data: List) -> interpolate.RectBivariateSpline:
         t_axis_raw = np.array(namet_data[0])
@@ -23,6 +35,7 @@ class TablePressureStrategy:
         
         return interpolate.interp1d(t_axis, p_axis, bounds_error=False, fill_value="extrapolate")
 
+    @instrumented('table_pressure')
     def calculate(self, params: Dict[str, Any]) -> Dict[str, Any]:
         namet_block = params['NAMET']
         namet_data = namet_block['data']
@@ -42,6 +55,7 @@ class TablePressureStrategy:
             namet_inputs['temperature_cooling_water_1'], 
             namet_inputs['mass_flow_flow_path_1']
         )[0][0]
+        count('interpolations', 2)
         
         if pressure_flow_path_1_NAMET >= pressure_flow_path_1_NAMED:
             pressure_flow_path_1 = pressure_flow_path_1_NAMET
@@ -52,4 +66,36 @@ class TablePressureStrategy:
             'pressure_flow_path_1_NAMET': pressure_flow_path_1_NAMET,
             'pressure_flow_path_1_NAMED': float(pressure_flow_path_1_NAMED),
             'pressure_flow_path_1': pressure_flow_path_1
-        }
\ No newline at end of file
+        }
+
+    @instrumented('table_pressure')
+    def calculate_batch(self, params_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Расчет набора режимов: интерполяторы строятся один раз на каждую пару таблиц
+        NAMET/NAMED, точки режимов вычисляются векторно.
+        """
+        groups: Dict[Any, List[int]] = {}
+        for idx, params in enumerate(params_list):
+            key = (_freeze_table(params['NAMET']['data']), _freeze_table(params['NAMED']['data']))
+            groups.setdefault(key, []).append(idx)
+
+        results: List[Dict[str, Any]] = [{} for _ in params_list]
+        for indices in groups.values():
+            first = params_list[indices[0]]
+            named_interpolator = self._create_named_interpolator(first['NAMED']['data'])
+            namet_interpolator = self._create_namet_interpolator(first['NAMET']['data'])
+
+            t = np.array([params_list[i]['inputs']['temperature_cooling_water_1'] for i in indices], dtype=float)
+            g = np.array([params_list[i]['inputs']['mass_flow_flow_path_1'] for i in indices], dtype=float)
+            pressure_named = np.atleast_1d(named_interpolator(t))
+            pressure_namet = namet_interpolator.ev(t, g)
+            count('interpolations', 2 * len(indices))
+
+            for i, p_namet, p_named in zip(indices, pressure_namet, pressure_named):
+                results[i] = {
+                    'pressure_flow_path_1_NAMET': float(p_namet),
+                    'pressure_flow_path_1_NAMED': float(p_named),
+                    'pressure_flow_path_1': float(max(p_namet, p_named))
+                }
+        count('modes', len(params_list))
+        return results
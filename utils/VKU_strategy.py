@@ -2,6 +2,8 @@ import numpy as np
 from scipy.interpolate import RegularGridInterpolator
 from typing import List, Dict, Any
 
+from utils.instrumentation import count, instrumented
+
 
 class VKUStrategy:
     """
@@ -9,6 +11,13 @@ class VKUStrategy:
     Методика основана на определении давления по приведенному расходу пара
     и температуре наружного воздуха с использованием 2D-интерполяции.
     """
+    # Системные единицы входных параметров (см. utils.unit_normalizer)
+    INPUT_UNITS = {
+        'mass_flow_flow_path_1': ('mass_flow', 'т/ч'),
+        'degree_dryness_flow_path_1': ('quality', 'fraction'),
+        'temperature_air': ('temperature', '°C'),
+    }
+
     _TVOZD_CONST_DEFAULT = 20.0
     _P_DATA: List = [
         [40, 35, 30, 25, 20],
@@ -58,6 +67,7 @@ class VKUStrategy:
             fill_value=None
         )
 
+    @instrumented('vku')
     def calculate(self, params: Dict[str, Any]) -> Dict[str, float]:
         """
         Выполняет расчет давления в конденсаторе.
@@ -93,6 +103,7 @@ class VKUStrategy:
 
         point_to_interpolate = (mass_flow_reduced_steam_condencer, t_air)
         pressure_flow_path_1 = self._interpolator(point_to_interpolate).item()
+        count('interpolations')
 
         results = {
             'pressure_flow_path_1': pressure_flow_path_1,
@@ -100,3 +111,36 @@ class VKUStrategy:
         }
 
         return results
+
+    @instrumented('vku')
+    def calculate_batch(self, params_list: List[Dict[str, Any]]) -> List[Dict[str, float]]:
+        """
+        Расчет давления для набора режимов одним вызовом интерполятора.
+
+        Args:
+            params_list (List[Dict[str, Any]]): Режимы с теми же ключами, что и в `calculate`.
+
+        Returns:
+            List[Dict[str, float]]: Результаты в порядке режимов (как у `calculate`).
+
+        Raises:
+            KeyError: Если в каком-либо режиме отсутствует обязательный ключ.
+        """
+        if not params_list:
+            return []
+        try:
+            mass_flow = np.array([p['mass_flow_flow_path_1'] for p in params_list], dtype=float)
+            dryness = np.array([p['degree_dryness_flow_path_1'] for p in params_list], dtype=float)
+        except KeyError as e:
+            raise KeyError(f"Отсутствует обязательный параметр в словаре: {e}")
+        t_air = np.array([p.get('temperature_air', self._TVOZD_CONST_DEFAULT) for p in params_list], dtype=float)
+
+        mass_flow_reduced = (mass_flow / self.mass_flow_steam_nom) * (dryness / self.degree_dryness_steam_nom) * 100
+        pressures = self._interpolator(np.column_stack((mass_flow_reduced, t_air)))
+        count('interpolations', len(params_list))
+        count('modes', len(params_list))
+
+        return [
+            {'pressure_flow_path_1': float(p), 'mass_flow_reduced_steam_condencer': float(g)}
+            for p, g in zip(pressures, mass_flow_reduced)
+        ]
@@ -1,4 +1,5 @@
 import math
+import numpy as np
 
 
 class ProblemDefinition:
@@ -34,3 +35,22 @@ class ProblemDefinition:
         if x <= 0:
             return float('nan')
         return -self.c * self.power_minus_1 * math.pow(x, self.power_minus_1 - 1.0)
+
+    # ---- Векторные версии (для решателей, работающих с массивами целей) ----
+    def calculate_delta_array(self, x: np.ndarray) -> np.ndarray:
+        """Рассчитывает A3_delt поэлементно для массива X (NaN для X <= 0)."""
+        x = np.asarray(x, dtype=float)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out = 1.0 - self.c * np.power(x, self.power_minus_1)
+        return np.where(x > 0, out, np.nan)
+
+    def f_array(self, x: np.ndarray, target_delta: np.ndarray) -> np.ndarray:
+        """Векторная целевая функция F(X) = A3_delt(X) - target_delta."""
+        return self.calculate_delta_array(x) - target_delta
+
+    def df_array(self, x: np.ndarray) -> np.ndarray:
+        """Векторная производная F'(X)."""
+        x = np.asarray(x, dtype=float)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out = -self.c * self.power_minus_1 * np.power(x, self.power_minus_1 - 1.0)
+        return np.where(x > 0, out, np.nan)
@@ -1,9 +1,54 @@
 import math
 
+from utils.instrumentation import count, instrumented, span
+from utils.solvers import BracketRootSolver
+
+
 class BermanStrategy:
     """
     Рассчитывает теплогидравлические характеристики конденсатора по методике С.С. Бермана.
     """
+    # Системные единицы входных параметров (см. utils.unit_normalizer)
+    INPUT_UNITS = {
+        'length_cooling_tubes_of_the_main_bundle': ('length', 'м'),
+        'length_cooling_tubes_of_the_built_in_bundle': ('length', 'м'),
+        'diameter_inside_of_pipes': ('length', 'мм'),
+        'thickness_pipe_wall': ('length', 'мм'),
+        'enthalpy_flow_path_1': ('enthalpy', 'ккал/кг'),
+        'mass_flow_steam_nom': ('mass_flow', 'т/ч'),
+        'mass_flow_steam_list': ('mass_flow', 'т/ч'),
+        'mass_flow_cooling_water_list': ('mass_flow', 'т/ч'),
+        'mass_flow_cooling_water_built_in_beam_list': ('mass_flow', 'т/ч'),
+        'temperature_cooling_water_1_list': ('temperature', '°C'),
+        'temperature_cooling_water_built_in_beam_1_list': ('temperature', '°C'),
+        'mass_flow_air': ('mass_flow', 'кг/ч'),
+    }
+
+    def __init__(self):
+        # Баланс температур насыщения двух пучков (допуск 0.01 °C, как в исходной методике)
+        self._balance_solver = BracketRootSolver(name='berman.saturation_balance', ftol=0.01,
+                                                 xtol=1e-9, expand=20, max_iter=100,
+                                                 raise_on_failure=False)
+
+    @staticmethod
+    def _bundle_saturation(heat_transfer_coeff, fouling_resistance, water_flow, surface_area,
+                           inlet_temp, water_heating):
+        """
+        Температура насыщения и недогрев для одного пучка.
+
+        :return: (температура насыщения, недогрев).
+        """
+        k_inv = 1.0 / heat_transfer_coeff if heat_transfer_coeff != 0 else float('inf')
+        heat_transfer_coeff_with_fouling = 1.0 / (k_inv + fouling_resistance)
+
+        exp_arg = (heat_transfer_coeff_with_fouling / water_flow * surface_area / 1000.0) if water_flow > 0 else float('inf')
+        try: exp_val = math.exp(exp_arg)
+        except OverflowError: exp_val = float('inf')
+
+        undercooling = water_heating / (exp_val - 1.0) if (exp_val - 1.0) != 0 else 0.0
+        return inlet_temp + water_heating + undercooling, undercooling
+
+    @instrumented('berman')
     def calculate(self, params: dict) -> dict:
         """
         Выполняет основной расчет.
@@ -88,7 +133,6 @@ class BermanStrategy:
         ref_heat_transfer_coeffs = [0.0] * 3
         heat_transfer_coeffs = [0.0] * 3
         water_heating_values = [0.0] * 3
-        heat_transfer_coeffs_with_fouling = [0.0] * 3
         undercooling_values = [0.0] * 3
         saturation_temps = [0.0] * 3
         avg_water_temps = [0.0] * 3
@@ -129,8 +173,8 @@ class BermanStrategy:
 
                         water_heating_values[1], water_heating_values[2] = 0.0, 0.0
 
-                        # Цикл для расчета K (без итераций, выполняется один раз для инициализации)
-                        for _ in range(1):
+                        # Расчет K (без итераций, выполняется один раз для инициализации)
+                        with span('heat_transfer'):
                             for bundle_idx in range(1, 3):
                                 avg_water_temps[bundle_idx] = inlet_temps_matrix[j][bundle_idx] + water_heating_values[bundle_idx]
                                 
@@ -172,47 +216,50 @@ class BermanStrategy:
 
                         # Итерационный решатель для двухпучковых конденсаторов
                         if bap_coefficient > 2:
-                            temp_diff_check, temp_diff_step = 0.0, 0.1
-                            for _ in range(100): # Итерационный цикл
-                                for bundle_idx in range(1, 3):
-                                    k_inv = 1.0 / heat_transfer_coeffs[bundle_idx] if heat_transfer_coeffs[bundle_idx] != 0 else float('inf')
-                                    heat_transfer_coeffs_with_fouling[bundle_idx] = 1.0 / (k_inv + current_fouling_resistance)
-
-                                    exp_arg = (heat_transfer_coeffs_with_fouling[bundle_idx] / water_flows_matrix[i][bundle_idx] * surface_areas[bundle_idx] / 1000.0) if water_flows_matrix[i][bundle_idx] > 0 else float('inf')
-                                    try: exp_val = math.exp(exp_arg)
-                                    except OverflowError: exp_val = float('inf')
-
-                                    undercooling_values[bundle_idx] = water_heating_values[bundle_idx] / (exp_val - 1.0) if (exp_val - 1.0) != 0 else 0.0
-                                    saturation_temps[bundle_idx] = inlet_temps_matrix[j][bundle_idx] + water_heating_values[bundle_idx] + undercooling_values[bundle_idx]
-
-                                temp_diff = saturation_temps[1] - saturation_temps[2]
-                                if temp_diff_check * temp_diff < 0: temp_diff_step /= 5.0
-                                temp_diff_check = temp_diff
-                                if abs(temp_diff) <= 0.01: break
-
-                                step_direction = -temp_diff_step if temp_diff > 0 else temp_diff_step
-                                water_heating_values[1] += step_direction
-                                if water_flows_matrix[i][2] > 0:
-                                    water_heating_values[2] = (current_steam_flow * enthalpy - water_heating_values[1] * water_flows_matrix[i][1]) / water_flows_matrix[i][2]
-                                else:
-                                    break
-                            
+                            w1, w2 = water_flows_matrix[i][1], water_flows_matrix[i][2]
+                            if w2 > 0:
+                                total_heat = current_steam_flow * enthalpy
+
+                                def bundle_states(dh1):
+                                    dh2 = (total_heat - dh1 * w1) / w2
+                                    return [self._bundle_saturation(heat_transfer_coeffs[b], current_fouling_resistance,
+                                                                    water_flows_matrix[i][b], surface_areas[b],
+                                                                    inlet_temps_matrix[j][b], dh)
+                                            for b, dh in ((1, dh1), (2, dh2))]
+
+                                def temp_diff(dh1):
+                                    (ts1, _), (ts2, _) = bundle_states(dh1)
+                                    return ts1 - ts2
+
+                                # Равенство температур насыщения пучков: корень по нагреву воды в основном пучке
+                                upper = total_heat / w1 if w1 > 0 else 0.0
+                                with span('saturation_balance'):
+                                    balance = self._balance_solver.solve(temp_diff, bracket=(0.0, upper))
+                                count('iterations', balance.iterations)
+                                dh1 = balance.value
+                                water_heating_values[1] = dh1
+                                water_heating_values[2] = (total_heat - dh1 * w1) / w2
+
+                            states = [self._bundle_saturation(heat_transfer_coeffs[b], current_fouling_resistance,
+                                                              water_flows_matrix[i][b], surface_areas[b],
+                                                              inlet_temps_matrix[j][b], water_heating_values[b])
+                                      for b in (1, 2)]
+                            for bundle_idx, (saturation_temp, undercooling) in zip((1, 2), states):
+                                saturation_temps[bundle_idx] = saturation_temp
+                                undercooling_values[bundle_idx] = undercooling
+
                             final_saturation_temp = saturation_temps[1]
 
                         else: # Расчет для однопучкового конденсатора
                             bundle_idx = 1
-                            k_inv = 1.0 / heat_transfer_coeffs[bundle_idx] if heat_transfer_coeffs[bundle_idx] != 0 else float('inf')
-                            heat_transfer_coeffs_with_fouling[bundle_idx] = 1.0 / (k_inv + current_fouling_resistance)
-
-                            exp_arg = (heat_transfer_coeffs_with_fouling[bundle_idx] / water_flows_matrix[i][bundle_idx] * surface_areas[bundle_idx] / 1000.0) if water_flows_matrix[i][bundle_idx] > 0 else float('inf')
-                            try: exp_val = math.exp(exp_arg)
-                            except OverflowError: exp_val = float('inf')
-
-                            undercooling_values[bundle_idx] = water_heating_values[bundle_idx] / (exp_val - 1.0) if (exp_val - 1.0) != 0 else 0.0
-                            final_saturation_temp = inlet_temps_matrix[j][bundle_idx] + water_heating_values[bundle_idx] + undercooling_values[bundle_idx]
+                            final_saturation_temp, undercooling_values[bundle_idx] = self._bundle_saturation(
+                                heat_transfer_coeffs[bundle_idx], current_fouling_resistance,
+                                water_flows_matrix[i][bundle_idx], surface_areas[bundle_idx],
+                                inlet_temps_matrix[j][bundle_idx], water_heating_values[bundle_idx])
 
                         # Расчет давления насыщения по финальной температуре
                         saturation_temp_K = final_saturation_temp + 273.15
+                        count('property_calls')
                         try:
                             pressure_exponent = 82.86568 + 1.028003 / 100.0 * saturation_temp_K - 7821.541 / saturation_temp_K - 11.48776 * math.log(saturation_temp_K)
                             condenser_pressure_Pa = math.exp(pressure_exponent)
@@ -226,26 +273,29 @@ class BermanStrategy:
                             "undercooling_built_in_bundle_C": undercooling_values[2],
                         })
         
+        count('modes', len(main_results))
+
         # --- 4. Расчет эжекторов ---
         ejector_results = []
         if mass_flow_air > 0:
-            for num_ejectors in range(1, 3):
-                for temp_idx in range(1, max_temp_idx + 1):
-                    list_idx = max_temp_idx - temp_idx + 1
-                    inlet_temp_C = inlet_temps_matrix[list_idx][1]
-                    water_temp_K = inlet_temp_C + 273.15 + 1.0
-                    scaled_temp = water_temp_K / 1000.0
-                    try:
-                        ejector_pressure_exponent = -7.821541 / scaled_temp + 82.86586 + 10.28 * scaled_temp - 11.48776 * math.log(water_temp_K)
-                        ejector_pressure_Pa = math.exp(ejector_pressure_exponent)
-                        ejector_pressure_kPa = (0.009 + 0.0003 * mass_flow_air / num_ejectors + ejector_pressure_Pa * 10) * 100
-
-                        ejector_results.append({
-                            "number_of_ejectors": num_ejectors,
-                            "inlet_water_temperature_C": inlet_temp_C,
-                            "ejector_pressure_kPa": ejector_pressure_kPa
-                        })
-                    except (ValueError, ZeroDivisionError):
-                        pass
+            with span('ejectors'):
+                for num_ejectors in range(1, 3):
+                    for temp_idx in range(1, max_temp_idx + 1):
+                        list_idx = max_temp_idx - temp_idx + 1
+                        inlet_temp_C = inlet_temps_matrix[list_idx][1]
+                        water_temp_K = inlet_temp_C + 273.15 + 1.0
+                        scaled_temp = water_temp_K / 1000.0
+                        try:
+                            ejector_pressure_exponent = -7.821541 / scaled_temp + 82.86586 + 10.28 * scaled_temp - 11.48776 * math.log(water_temp_K)
+                            ejector_pressure_Pa = math.exp(ejector_pressure_exponent)
+                            ejector_pressure_kPa = (0.009 + 0.0003 * mass_flow_air / num_ejectors + ejector_pressure_Pa * 10) * 100
+
+                            ejector_results.append({
+                                "number_of_ejectors": num_ejectors,
+                                "inlet_water_temperature_C": inlet_temp_C,
+                                "ejector_pressure_kPa": ejector_pressure_kPa
+                            })
+                        except (ValueError, ZeroDivisionError):
+                            pass
 
         return {'main_results': main_results, 'ejector_results': ejector_results}
\ No newline at end of file
@@ -2,10 +2,21 @@ import math
 import numpy as np
 from scipy.interpolate import RegularGridInterpolator
 import seuif97
-from uniconv import UnitConverter
+from utils.uniconv import get_default_converter
 
 coefficient_B_const = 1.0
 
+# Системные единицы входных параметров (см. utils.unit_normalizer)
+INPUT_UNITS = {
+    'diameter_inside_of_pipes': ('length', 'мм'),
+    'thickness_pipe_wall': ('length', 'мм'),
+    'length_cooling_tubes_of_the_main_bundle': ('length', 'мм'),
+    'mass_flow_cooling_water': ('mass_flow', 'т/ч'),
+    'temperature_cooling_water_1': ('temperature', '°C'),
+    'mass_flow_flow_path_1': ('mass_flow', 'т/ч'),
+    'degree_dryness_flow_path_1': ('quality', 'fraction'),
+}
+
 k_interpolation_data = {
     "temperature_points": [5, 15, 27, 38, 50, 70, 95, 120, 150],  # Средняя температура tср [°C]
     "speed_points": [0.4, 0.6, 0.8, 1.0, 1.2, 1.4, 1.6, 1.8, 1.9, 2.0, 2.1, 2.2, 2.4, 2.6, 2.8, 3.0, 3.2, 3.4, 3.6], # Скорость воды Cов [м/с]
@@ -42,7 +53,7 @@ def calculate_pressure(params):
     )
 
     get_heat_of_vaporization = lambda temp: (30 - temp) * 0.582 + 580.4
-    uc = UnitConverter()
+    uc = get_default_converter()
 
     d_in = params['diameter_inside_of_pipes']
     s_w = params['thickness_pipe_wall']
@@ -0,0 +1,269 @@
+"""
+Поэтапные замеры внутри расчётов стратегий (опционально, по умолчанию выключено).
+
+Стратегия помечает ``calculate`` (и ``calculate_batch``, если он есть) декоратором
+``instrumented('<стратегия>')`` и размечает этапы расчёта спанами и счётчиками:
+
+    with span('k_lookup'):
+        k = interpolator(point)
+    count('interpolations')
+
+Пока замеры выключены, декоратор сразу вызывает исходный метод, ``span``
+возвращает общий пустой контекст-менеджер, ``count`` ничего не делает —
+накладные расходы сводятся к чтению ContextVar.
+
+Включить замеры можно двумя способами:
+
+* ``enable()`` — на весь процесс: каждый вызов стратегии попадает в реестр
+  метрик ``REGISTRY`` (имена совпадают со спецификацией condenser_worker:
+  ``condenser_tasks_total{strategy, status}``, ``condenser_task_duration_seconds{strategy}``,
+  ``condenser_calculation_errors_total{strategy, error_type}``) плюс поэтапные
+  ``condenser_stage_duration_seconds{strategy, stage}`` и
+  ``condenser_operations_total{strategy, operation}``;
+* ``collect()`` — только в текущем контексте, возвращает список трасс вызовов:
+
+    with collect() as traces:
+        MetroVickersStrategy().calculate(params)
+    traces[0].as_dict()  # {'strategy', 'status', 'elapsed_s', 'stages', 'counters'}
+
+Экспорт реестра: ``REGISTRY.as_dict()`` и ``REGISTRY.to_prometheus()`` (текстовый
+формат экспозиции Prometheus).
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import functools
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+_TRACE: contextvars.ContextVar[Optional["Trace"]] = contextvars.ContextVar("instrumentation_trace", default=None)
+_COLLECTOR: contextvars.ContextVar[Optional[List["Trace"]]] = contextvars.ContextVar(
+    "instrumentation_collector", default=None)
+_enabled = False
+
+_NOOP = contextlib.nullcontext()
+
+Labels = Tuple[Tuple[str, str], ...]
+
+METRICS_HELP = {
+    'condenser_tasks_total': ('counter', "Число расчётов по стратегиям и статусу"),
+    'condenser_task_duration_seconds': ('summary', "Длительность расчёта стратегии, с"),
+    'condenser_calculation_errors_total': ('counter', "Ошибки расчёта по стратегиям и типу исключения"),
+    'condenser_stage_duration_seconds': ('summary', "Длительность этапа расчёта стратегии, с"),
+    'condenser_operations_total': ('counter', "Операции внутри расчёта (интерполяции, итерации, вызовы свойств)"),
+}
+
+
+class Trace:
+    """Замеры одного вызова стратегии: этапы (число входов, секунды) и счётчики операций."""
+
+    __slots__ = ('strategy', 'status', 'error_type', 'elapsed', 'stages', 'counters', '_stack')
+
+    def __init__(self, strategy: str) -> None:
+        self.strategy = strategy
+        self.status = 'success'
+        self.error_type: Optional[str] = None
+        self.elapsed = 0.0
+        self.stages: Dict[str, List[float]] = {}
+        self.counters: Dict[str, int] = {}
+        self._stack: List[str] = []
+
+    def as_dict(self) -> Dict[str, Any]:
+        out = {
+            'strategy': self.strategy,
+            'status': self.status,
+            'elapsed_s': self.elapsed,
+            'stages': {name: {'calls': int(calls), 'seconds': seconds}
+                       for name, (calls, seconds) in self.stages.items()},
+            'counters': dict(self.counters),
+        }
+        if self.error_type:
+            out['error_type'] = self.error_type
+        return out
+
+
+class _Span:
+    __slots__ = ('_trace', '_path', '_started')
+
+    def __init__(self, trace: Trace, stage: str) -> None:
+        self._trace = trace
+        # Вложенные этапы получают составное имя: iteration.k_lookup
+        self._path = f"{trace._stack[-1]}.{stage}" if trace._stack else stage
+
+    def __enter__(self) -> None:
+        self._trace._stack.append(self._path)
+        self._started = time.perf_counter()
+
+    def __exit__(self, *exc) -> bool:
+        elapsed = time.perf_counter() - self._started
+        self._trace._stack.pop()
+        entry = self._trace.stages.get(self._path)
+        if entry is None:
+            self._trace.stages[self._path] = [1, elapsed]
+        else:
+            entry[0] += 1
+            entry[1] += elapsed
+        return False
+
+
+def span(stage: str):
+    """Контекст-менеджер этапа расчёта; без активной трассы — общий пустой контекст."""
+    trace = _TRACE.get()
+    if trace is None:
+        return _NOOP
+    return _Span(trace, stage)
+
+
+def count(operation: str, n: int = 1) -> None:
+    """Увеличивает счётчик операции текущей трассы (интерполяции, итерации, вызовы свойств)."""
+    trace = _TRACE.get()
+    if trace is not None:
+        trace.counters[operation] = trace.counters.get(operation, 0) + n
+
+
+def current_trace() -> Optional[Trace]:
+    return _TRACE.get()
+
+
+class MetricsRegistry:
+    """Потокобезопасный реестр счётчиков и сводок (sum/count) с метками."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._summaries: Dict[Tuple[str, Labels], List[float]] = {}
+
+    def inc(self, name: str, value: float = 1, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            entry = self._summaries.setdefault(key, [0, 0.0])
+            entry[0] += 1
+            entry[1] += value
+
+    def record(self, trace: Trace) -> None:
+        """Заносит завершённую трассу вызова стратегии."""
+        strategy = trace.strategy
+        self.inc('condenser_tasks_total', strategy=strategy, status=trace.status)
+        self.observe('condenser_task_duration_seconds', trace.elapsed, strategy=strategy)
+        if trace.error_type:
+            self.inc('condenser_calculation_errors_total', strategy=strategy, error_type=trace.error_type)
+        for stage, (calls, seconds) in trace.stages.items():
+            key = ('condenser_stage_duration_seconds', (('stage', stage), ('strategy', strategy)))
+            with self._lock:
+                entry = self._summaries.setdefault(key, [0, 0.0])
+                entry[0] += calls
+                entry[1] += seconds
+        for operation, n in trace.counters.items():
+            self.inc('condenser_operations_total', n, operation=operation, strategy=strategy)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._summaries.clear()
+
+    def as_dict(self) -> Dict[str, List[Dict[str, Any]]]:
+        """{имя метрики: [{'labels': {...}, 'value': ...} или {'labels', 'count', 'sum'}]}."""
+        out: Dict[str, List[Dict[str, Any]]] = {}
+        with self._lock:
+            for (name, labels), value in sorted(self._counters.items()):
+                out.setdefault(name, []).append({'labels': dict(labels), 'value': value})
+            for (name, labels), (n, total) in sorted(self._summaries.items()):
+                out.setdefault(name, []).append({'labels': dict(labels), 'count': int(n), 'sum': total})
+        return out
+
+    def to_prometheus(self) -> str:
+        """Текстовый формат экспозиции Prometheus."""
+        lines = []
+        for name, samples in self.as_dict().items():
+            kind, help_text = METRICS_HELP.get(name, ('untyped', name))
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for sample in samples:
+                labels = ",".join(f'{k}="{_escape(v)}"' for k, v in sample['labels'].items())
+                labels = f"{{{labels}}}" if labels else ""
+                if 'value' in sample:
+                    lines.append(f"{name}{labels} {_format(sample['value'])}")
+                else:
+                    lines.append(f"{name}_count{labels} {sample['count']}")
+                    lines.append(f"{name}_sum{labels} {_format(sample['sum'])}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+REGISTRY = MetricsRegistry()
+
+
+def enable() -> None:
+    """Включает замеры всех вызовов стратегий в процессе (с записью в REGISTRY)."""
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled or _COLLECTOR.get() is not None
+
+
+@contextlib.contextmanager
+def collect() -> Iterator[List[Trace]]:
+    """Включает замеры в текущем контексте и собирает трассы завершённых вызовов."""
+    traces: List[Trace] = []
+    token = _COLLECTOR.set(traces)
+    try:
+        yield traces
+    finally:
+        _COLLECTOR.reset(token)
+
+
+@contextlib.contextmanager
+def trace_call(strategy: str) -> Iterator[Trace]:
+    """Трасса одного вызова стратегии; по завершении — в collect() и (если enable()) в REGISTRY."""
+    trace = Trace(strategy)
+    token = _TRACE.set(trace)
+    started = time.perf_counter()
+    try:
+        yield trace
+    except BaseException as e:
+        trace.status = 'error'
+        trace.error_type = type(e).__name__
+        raise
+    finally:
+        trace.elapsed = time.perf_counter() - started
+        _TRACE.reset(token)
+        collector = _COLLECTOR.get()
+        if collector is not None:
+            collector.append(trace)
+        if _enabled:
+            REGISTRY.record(trace)
+
+
+def instrumented(strategy: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Декоратор метода calculate: при включённых замерах каждый вызов идёт в свою трассу."""
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled and _COLLECTOR.get() is None:
+                return func(*args, **kwargs)
+            with trace_call(strategy):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -3,12 +3,25 @@ import numpy as np
 from scipy.interpolate import RegularGridInterpolator
 from typing import Dict, Any
 import seuif97
-from uniconv import UnitConverter
+from utils.uniconv import get_default_converter
+from utils.solvers import FixedPointSolver
+from utils.instrumentation import count, instrumented, span
 
 from utils.Constants import coefficient_B_const, k_interpolation_data, \
     temperature_cooling_water_average_heating_const, speed_cooling_water_const
 
 class MetroVickersStrategy:
+    # Системные единицы входных параметров (см. utils.unit_normalizer)
+    INPUT_UNITS = {
+        'diameter_inside_of_pipes': ('length', 'мм'),
+        'thickness_pipe_wall': ('length', 'мм'),
+        'length_cooling_tubes_of_the_main_bundle': ('length', 'мм'),
+        'mass_flow_cooling_water': ('mass_flow', 'т/ч'),
+        'temperature_cooling_water_1': ('temperature', '°C'),
+        'mass_flow_flow_path_1': ('mass_flow', 'т/ч'),
+        'degree_dryness_flow_path_1': ('quality', 'fraction'),
+    }
+
     def __init__(self):
         self._get_k_from_table_temp = RegularGridInterpolator(
             (k_interpolation_data["speed_points"], k_interpolation_data["temperature_points"]),
@@ -17,8 +30,11 @@ class MetroVickersStrategy:
             method="nearest"
         )
         self._get_heat_of_vaporization = lambda temp: (30 - temp) * 0.582 + 580.4
-        self.uc = UnitConverter()
+        self.uc = get_default_converter()
+        self._k_solver = FixedPointSolver(name='metro_vickers.k', tol=0.001, max_iter=20,
+                                          raise_on_failure=False)
 
+    @instrumented('metro_vickers')
     def calculate(self, params: Dict[str, Any]) -> Dict[str, Any]:
         diameter_inside_of_pipes = params['diameter_inside_of_pipes']
         thickness_pipe_wall = params['thickness_pipe_wall']
@@ -61,10 +77,9 @@ class MetroVickersStrategy:
                           ((diameter_outside_of_pipes / 1000 + diameter_inside_of_pipes / 1000) 
                            * thermal_conductivity_cooling_surface_tube_material)) # p.4
 
-        max_iterations = 20
-        tolerance = 0.001
-        
-        coefficient_K_temp = self._get_k_from_table_temp((speed_cooling_water_const, temperature_cooling_water_average_heating_const)).item() # p.5
+        with span('k_lookup'):
+            coefficient_K_temp = self._get_k_from_table_temp((speed_cooling_water_const, temperature_cooling_water_average_heating_const)).item() # p.5
+        count('interpolations')
 
         speed_cooling_water = ((mass_flow_cooling_water * number_cooling_water_passes_of_the_main_bundle) / 
                                    (900 * math.pi * (number_cooling_tubes_of_the_main_bundle + 
@@ -86,24 +101,11 @@ class MetroVickersStrategy:
         # print("-------------------------------------\n")
         # ===============================================================
         
-        for i in range(max_iterations):   
-
-            # ==================== ДИАГНОСТИЧЕСКИЙ БЛОК ====================
-            # print(f"\n--- Итерация #{i} ---")
-            # print(f"speed_cooling_water: значение = {speed_cooling_water}, тип = {type(speed_cooling_water)}")
-            # print(f"temperature_cooling_water_average_heating: значение = {temperature_cooling_water_average_heating}, тип = {type(temperature_cooling_water_average_heating)}")
-            # ==============================================================
-
-            _get_k_from_table = RegularGridInterpolator(
-                (k_interpolation_data["speed_points"], k_interpolation_data["temperature_points"]),
-                np.array(k_interpolation_data["k_values_matrix"]),
-                bounds_error=False,
-                method="nearest"
-            )
-
+        def next_k(_k_old):
+            count('interpolations')
             try:
                 query_point = np.array([[speed_cooling_water, temperature_cooling_water_average_heating]])
-                k_temp_new = _get_k_from_table(query_point).item()
+                return self._get_k_from_table_temp(query_point).item()
             except ValueError as e:
                 error_message = (
                     f"Ошибка интерполяции: расчетные параметры вышли за пределы таблицы.\n"
@@ -112,21 +114,19 @@ class MetroVickersStrategy:
                     f"Проверьте входные данные, особенно `diameter_inside_of_pipes` (должен быть в мм)."
                 )
                 raise ValueError(error_message) from e
-            
-            '''
-                Сравниваем K_new и K_old. Если разница велика, 
-                то K_old становится равным K_new, повторяем, 
-                пока abs(K_new - K_old) не станет меньше tolerance
-            '''
-            if abs(k_temp_new - coefficient_K_temp) < tolerance:
-                coefficient_K_temp = k_temp_new # Сохраняем последнее значение
-                break
-            
-            coefficient_K_temp = k_temp_new
-            
-            if i == max_iterations - 1:
-                print("Warning: Iteration limit reached without convergence.")
-                
+
+        '''
+            Сравниваем K_new и K_old. Если разница велика,
+            то K_old становится равным K_new, повторяем,
+            пока abs(K_new - K_old) не станет меньше tolerance
+        '''
+        with span('iteration'):
+            k_result = self._k_solver.solve(next_k, x0=coefficient_K_temp)
+        count('iterations', k_result.iterations)
+        coefficient_K_temp = k_result.value
+        if not k_result.converged:
+            print("Warning: Iteration limit reached without convergence.")
+
         k_clean_denominator = (1 / (coefficient_K_temp * 0.85 * coefficient_B_const * coefficient_Kf)) - 0.087 / 10000 + coefficient_R1 # p.12
         coefficient_K = 1 / k_clean_denominator 
 
@@ -139,14 +139,18 @@ class MetroVickersStrategy:
     
         temperature_saturation_steam = temperature_cooling_water_2 + temperature_relative_underheating * (temperature_cooling_water_2 - temperature_cooling_water_1) # p.15
 
-        pressure_flow_path_1_mpa = seuif97.tx(temperature_saturation_steam, 1.0, 0)
+        with span('seuif97'):
+            pressure_flow_path_1_mpa = seuif97.tx(temperature_saturation_steam, 1.0, 0)
+        count('property_calls')
 
-        pressure_flow_path_1_kgf_cm2 = self.uc.convert(
-            pressure_flow_path_1_mpa,
-            from_unit="МПа",
-            to_unit="кгс/см²",
-            parameter_type="pressure"
-        )
+        with span('unit_conversion'):
+            pressure_flow_path_1_kgf_cm2 = self.uc.convert(
+                pressure_flow_path_1_mpa,
+                from_unit="МПа",
+                to_unit="кгс/см²",
+                parameter_type="pressure"
+            )
+        count('unit_conversions')
 
         results.update({
             'diameter_outside_of_pipes': diameter_outside_of_pipes,
@@ -0,0 +1,297 @@
+"""
+Разрешение входных параметров стратегий по реестру параметров (registry.db).
+
+Реестр (Parameter Registry Manager) хранит канонические коды параметров —
+длинный код, короткий код в методике, системную и допустимые единицы,
+ограничения min/max. Стратегии же принимают записи с полями в snake_case
+(``temperature_cooling_water_1``, ``mass_flow_cooling_water`` …).
+
+``ParameterIndex`` — неизменяемый снимок реестра, загружаемый один раз при
+старте (двумя запросами к БД, read-only). ``ParameterResolver`` связывает
+поля записей с кодами реестра и за один проход приводит запись или пакет
+записей к системным единицам (через RecordNormalizer) и проверяет
+ограничения min/max; в пакетном режиме проверка векторная (NumPy).
+"""
+
+from __future__ import annotations
+
+import math
+import sqlite3
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from utils.uniconv import UnitConverter, UnknownUnitError, get_default_converter
+from utils.unit_normalizer import CompiledSchema, RecordNormalizer
+
+REGISTRY_DIR = Path(__file__).resolve().parent.parent / "Parameter Registry Manager"
+
+# Код единицы в реестре -> (параметр UnitConverter, символ единицы UnitConverter).
+# В реестре часть символов набрана кириллицей (К, °С), в конвертере — латиницей.
+UNIT_ALIASES: Mapping[str, Tuple[str, str]] = MappingProxyType({
+    "К": ("temperature", "K"),
+    "K": ("temperature", "K"),
+    "°С": ("temperature", "°C"),
+    "°C": ("temperature", "°C"),
+    "Па": ("pressure", "Па"),
+    "кПа": ("pressure", "кПа"),
+    "МПа": ("pressure", "МПа"),
+    "бар": ("pressure", "бар"),
+    "кгс/см²": ("pressure", "кгс/см²"),
+    "кгс/см2": ("pressure", "кгс/см²"),
+    "кг/с": ("mass_flow", "кг/с"),
+    "кг/ч": ("mass_flow", "кг/ч"),
+    "т/ч": ("mass_flow", "т/ч"),
+    "м": ("length", "м"),
+    "мм": ("length", "мм"),
+    "ккал/кг": ("enthalpy", "ккал/кг"),
+    "кДж/кг": ("enthalpy", "кДж/кг"),
+    "fraction": ("quality", "fraction"),
+    "%": ("quality", "%"),
+})
+
+
+class ParameterConstraintError(ValueError):
+    """Нарушены ограничения реестра; ``violations`` — список (индекс записи, поле, значение, текст)."""
+
+    def __init__(self, violations: List[Tuple[int, str, float, str]]):
+        self.violations = violations
+        head = "; ".join(f"#{i} {field}: {msg}" for i, field, _, msg in violations[:5])
+        more = f" (и ещё {len(violations) - 5})" if len(violations) > 5 else ""
+        super().__init__(f"Нарушены ограничения параметров: {head}{more}")
+
+
+@dataclass(frozen=True)
+class ParameterSpec:
+    """Определение параметра из реестра (только то, что нужно расчёту)."""
+    pid: str
+    long_code: str
+    short_code: str
+    method: str
+    system_unit: str
+    allowed_units: Tuple[str, ...]
+    min: Optional[float] = None
+    max: Optional[float] = None
+
+
+def _registry_core():
+    """Модуль registry_core менеджера реестра (его каталог — не пакет, импорт по пути)."""
+    if str(REGISTRY_DIR) not in sys.path:
+        sys.path.insert(0, str(REGISTRY_DIR))
+    import registry_core
+    return registry_core
+
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        return None if value is None else float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class ParameterIndex:
+    """
+    Неизменяемый индекс параметров реестра.
+
+    Поиск по длинному коду (без учёта регистра), по ``"методика:короткий код"``
+    и по короткому коду без методики, если он однозначен.
+    """
+
+    def __init__(self, specs: Iterable[ParameterSpec]) -> None:
+        by_pid: Dict[str, ParameterSpec] = {}
+        by_code: Dict[str, ParameterSpec] = {}
+        short_owners: Dict[str, List[ParameterSpec]] = {}
+        for spec in specs:
+            by_pid[spec.pid] = spec
+            by_code[spec.long_code.lower()] = spec
+            if spec.short_code:
+                if spec.method:
+                    by_code[f"{spec.method}:{spec.short_code}"] = spec
+                short_owners.setdefault(spec.short_code, []).append(spec)
+        for short_code, owners in short_owners.items():
+            if len(owners) == 1:
+                by_code.setdefault(short_code, owners[0])
+        self._by_pid: Mapping[str, ParameterSpec] = MappingProxyType(by_pid)
+        self._by_code: Mapping[str, ParameterSpec] = MappingProxyType(by_code)
+        self._ambiguous = frozenset(sc for sc, owners in short_owners.items() if len(owners) > 1)
+
+    @classmethod
+    def from_db(cls, path: str) -> "ParameterIndex":
+        """Снимок реестра из файла SQLite (соединение только для чтения, registry_core.connect)."""
+        conn = _registry_core().connect(path, readonly=True)
+        try:
+            return cls.from_connection(conn)
+        finally:
+            conn.close()
+
+    @classmethod
+    def from_connection(cls, conn: sqlite3.Connection) -> "ParameterIndex":
+        allowed: Dict[str, List[str]] = {}
+        for pid, unit in conn.execute("SELECT parameter_id, unit_code FROM PARAMETER_ALLOWED_UNIT ORDER BY unit_code"):
+            allowed.setdefault(pid, []).append(unit)
+        specs = []
+        rows = conn.execute("""
+            SELECT id, long_code, IFNULL(short_code, ''), IFNULL(method_name, ''), system_unit,
+                   json_extract(constraints, '$.min'), json_extract(constraints, '$.max')
+            FROM PARAMETER
+        """)
+        for pid, long_code, short_code, method, system_unit, mn, mx in rows:
+            specs.append(ParameterSpec(pid, long_code, short_code, method, system_unit,
+                                       tuple(allowed.get(pid, ())), _number(mn), _number(mx)))
+        return cls(specs)
+
+    def __len__(self) -> int:
+        return len(self._by_pid)
+
+    def __contains__(self, code: str) -> bool:
+        return self.find(code) is not None
+
+    def by_pid(self, pid: str) -> ParameterSpec:
+        return self._by_pid[pid]
+
+    def find(self, code: str) -> Optional[ParameterSpec]:
+        code = (code or "").strip()
+        return self._by_code.get(code) or self._by_code.get(code.lower())
+
+    def resolve(self, code: str) -> ParameterSpec:
+        spec = self.find(code)
+        if spec is None:
+            if code in self._ambiguous:
+                raise KeyError(f"Короткий код '{code}' неоднозначен, укажите 'методика:{code}'")
+            raise KeyError(f"Параметр '{code}' не найден в реестре")
+        return spec
+
+
+class ParameterResolver:
+    """
+    Приводит входные записи стратегии к системным единицам реестра и проверяет ограничения.
+
+    :param index: снимок реестра.
+    :param bindings: {поле записи: код параметра в реестре}. Поля, которых нет в bindings,
+        но имя которых само является кодом реестра, разрешаются напрямую; остальные поля
+        записи передаются без изменений.
+    :param converter: экземпляр UnitConverter (по умолчанию — общий get_default_converter()).
+    """
+
+    def __init__(self, index: ParameterIndex, bindings: Optional[Mapping[str, str]] = None,
+                 converter: Optional[UnitConverter] = None) -> None:
+        self.index = index
+        self.bindings = dict(bindings or {})
+        self.uc = converter if converter is not None else get_default_converter()
+        self._specs: Dict[str, ParameterSpec] = {f: index.resolve(code) for f, code in self.bindings.items()}
+        self._compiled: Dict[Tuple[frozenset, frozenset], Tuple[CompiledSchema, Tuple[Tuple[str, ParameterSpec], ...]]] = {}
+
+    def spec_for(self, field: str) -> Optional[ParameterSpec]:
+        spec = self._specs.get(field)
+        return spec if spec is not None else self.index.find(field)
+
+    def normalize(self, record: Mapping[str, Any], units: Optional[Mapping[str, str]] = None) -> Dict[str, Any]:
+        """Одна запись -> копия в системных единицах; при нарушении ограничений ParameterConstraintError."""
+        return self.normalize_batch([record], units)[0]
+
+    def normalize_batch(self, records: Iterable[Mapping[str, Any]],
+                        units: Optional[Mapping[str, str]] = None) -> List[Dict[str, Any]]:
+        """
+        Пакет записей с общими единицами входа units = {поле: код единицы реестра}
+        (не указанные поля считаются заданными в системной единице).
+
+        Все нарушения min/max собираются за один проход и выдаются одним исключением.
+        """
+        records = list(records)
+        fields = frozenset(k for r in records for k in r)
+        schema, checked = self._compile(fields, units or {})
+        records, violations = self._split_non_numeric(records, set(schema.fields).union(f for f, _ in checked))
+        out = schema.apply_batch(records)
+        for field, spec in checked:
+            violations.extend(self._check_field(out, field, spec))
+        if violations:
+            violations.sort(key=lambda v: v[0])
+            raise ParameterConstraintError(violations)
+        return out
+
+    # ---------------------- INTERNAL -----------------------------
+    def _compile(self, fields: frozenset, units: Mapping[str, str]):
+        key = (fields, frozenset(units.items()))
+        compiled = self._compiled.get(key)
+        if compiled is not None:
+            return compiled
+        target, source, checked = {}, {}, []
+        for field in sorted(fields):
+            spec = self.spec_for(field)
+            if spec is None:
+                if field in units:
+                    raise KeyError(f"Поле '{field}' не связано с параметром реестра")
+                continue
+            unit = units.get(field, spec.system_unit)
+            if unit != spec.system_unit and unit not in spec.allowed_units:
+                raise UnknownUnitError(f"Единица '{unit}' не входит в allowedUnits параметра "
+                                       f"'{spec.long_code}' ({', '.join(spec.allowed_units)})")
+            if unit != spec.system_unit:
+                target[field] = self._alias(spec.system_unit)
+                source[field] = self._alias(unit)
+            if spec.min is not None or spec.max is not None:
+                checked.append((field, spec))
+        compiled = (RecordNormalizer(target, self.uc).compile(source), tuple(checked))
+        self._compiled[key] = compiled
+        return compiled
+
+    @staticmethod
+    def _alias(unit: str) -> Tuple[str, str]:
+        try:
+            return UNIT_ALIASES[unit]
+        except KeyError:
+            raise UnknownUnitError(f"Единица реестра '{unit}' не сопоставлена с UnitConverter") from None
+
+    @staticmethod
+    def _split_non_numeric(records: List[Mapping[str, Any]], fields: Iterable[str]):
+        """
+        Нечисловые значения полей реестра отделяются до конвертации: каждое — нарушение
+        своей записи, а в копии этой записи поле обнуляется (не конвертируется и не проверяется).
+
+        :return: (записи для конвертации, список нарушений).
+        """
+        violations, bad = [], {}
+        for field in fields:
+            for i, rec in enumerate(records):
+                value = rec.get(field)
+                if value is None:
+                    continue
+                wrong = [v for v in (value if isinstance(value, (list, tuple)) else (value,)) if _number(v) is None]
+                if wrong:
+                    violations.extend((i, field, v, f"не число: {v!r}") for v in wrong)
+                    bad.setdefault(i, []).append(field)
+        if bad:
+            records = [dict(rec, **dict.fromkeys(bad[i])) if i in bad else rec for i, rec in enumerate(records)]
+        return records, violations
+
+    @staticmethod
+    def _check_field(records: List[Dict[str, Any]], field: str, spec: ParameterSpec):
+        idx, values = [], []
+        for i, rec in enumerate(records):
+            value = rec.get(field)
+            if value is None:
+                continue
+            if isinstance(value, (list, tuple)):
+                idx.extend([i] * len(value))
+                values.extend(value)
+            else:
+                idx.append(i)
+                values.append(value)
+        if not values:
+            return
+        arr = np.asarray(values, dtype=float)
+        bad = np.isnan(arr)
+        if spec.min is not None:
+            bad |= arr < spec.min
+        if spec.max is not None:
+            bad |= arr > spec.max
+        lo = "-∞" if spec.min is None else f"{spec.min:g}"
+        hi = "+∞" if spec.max is None else f"{spec.max:g}"
+        for j in np.flatnonzero(bad):
+            v = float(arr[j])
+            msg = "не число" if math.isnan(v) else f"{v:g} {spec.system_unit} вне [{lo}, {hi}]"
+            yield idx[j], field, v, msg
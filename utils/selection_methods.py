@@ -1,4 +1,5 @@
 import math
+import numpy as np
 from utils.base_for_selection import ProblemDefinition
 
 
@@ -79,3 +80,239 @@ class NewtonSolver:  # Ньютоном!
             x = x - fx / dfx
 
         raise RuntimeError(f"Метод Ньютона не сошелся за {self.max_iter} итераций")
+
+
+class VectorAnalyticalSolver:  # Аналитически, для массива целей!
+    """Аналитическое решение сразу для массива target_delta."""
+
+    def __init__(self, problem: ProblemDefinition):
+        self.problem = problem
+        self.iterations = 0
+        self._inv_power = 1.0 / problem.power_minus_1
+
+    def solve(self, target_delta, **kwargs):
+        self.iterations = 1
+        base = (1.0 - np.asarray(target_delta, dtype=float)) / self.problem.c
+        if np.any(base < 0):
+            raise ValueError("Невозможно найти вещественное решение: основание степени отрицательное.")
+        return np.power(base, self._inv_power)
+
+
+class VectorBisectionSolver:  # Дихотомии, для массива целей!
+    """
+    Метод дихотомии для массива target_delta.
+
+    Все отрезки делятся пополам одновременно; элементы, достигшие
+    точности, исключаются маской `converged` и больше не пересчитываются.
+    """
+
+    def __init__(self, problem: ProblemDefinition, max_iter=100, tol=1e-7):
+        self.problem = problem
+        self.max_iter = max_iter
+        self.tol = tol
+        self.iterations = 0
+        self.converged = None
+
+    def solve(self, target_delta, a=1.0, b=10.0):
+        self.iterations = 0
+        t = np.asarray(target_delta, dtype=float)
+        a = np.broadcast_to(np.asarray(a, dtype=float), t.shape).copy()
+        b = np.broadcast_to(np.asarray(b, dtype=float), t.shape).copy()
+        fa = self.problem.f_array(a, t)
+        fb = self.problem.f_array(b, t)
+
+        if np.any(fa * fb >= 0):
+            raise ValueError("На концах отрезка [a,b] функция имеет одинаковый знак.")
+
+        x = (a + b) / 2
+        converged = np.zeros(t.shape, dtype=bool)
+        for i in range(self.max_iter):
+            self.iterations += 1
+            active = ~converged
+            c = (a[active] + b[active]) / 2
+            x[active] = c
+            fc = self.problem.f_array(c, t[active])
+
+            done = (b[active] - a[active]) / 2 < self.tol
+            converged[active] = done
+            if converged.all():
+                self.converged = converged
+                return x
+
+            left = fa[active] * fc < 0
+            b[active] = np.where(left, c, b[active])
+            a[active] = np.where(left, a[active], c)
+            fa[active] = np.where(left, fa[active], fc)
+
+        self.converged = converged
+        raise RuntimeError(f"Метод дихотомии не сошелся за {self.max_iter} итераций "
+                           f"для {int((~converged).sum())} элементов")
+
+
+class VectorNewtonSolver:  # Ньютоном, для массива целей!
+    """
+    Метод Ньютона для массива target_delta.
+
+    Шаг делается только для элементов, ещё не достигших |F(X)| < tol.
+    """
+
+    def __init__(self, problem: ProblemDefinition, max_iter=20, tol=1e-9):
+        self.problem = problem
+        self.max_iter = max_iter
+        self.tol = tol
+        self.iterations = 0
+        self.converged = None
+
+    def solve(self, target_delta, initial_guess=2.0):
+        self.iterations = 0
+        t = np.asarray(target_delta, dtype=float)
+        x = np.broadcast_to(np.asarray(initial_guess, dtype=float), t.shape).copy()
+        converged = np.zeros(t.shape, dtype=bool)
+
+        for i in range(self.max_iter):
+            self.iterations += 1
+            active = ~converged
+            xa = x[active]
+            fx = self.problem.f_array(xa, t[active])
+
+            done = np.abs(fx) < self.tol
+            converged[active] = done
+            if converged.all():
+                self.converged = converged
+                return x
+
+            dfx = self.problem.df_array(xa)
+            step = ~done
+            if np.any(np.abs(dfx[step]) < 1e-12):
+                raise RuntimeError("Производная близка к нулю. Деление на ноль.")
+
+            xa[step] = xa[step] - fx[step] / dfx[step]
+            x[active] = xa
+
+        self.converged = converged
+        raise RuntimeError(f"Метод Ньютона не сошелся за {self.max_iter} итераций "
+                           f"для {int((~converged).sum())} элементов")
+
+
+class SafeguardedNewtonSolver:  # Ньютон под защитой дихотомии!
+    """
+    Гибрид Ньютона и дихотомии с поддержкой тёплого старта.
+
+    Поддерживает отрезок [a, b] со сменой знака F. На каждой итерации
+    делается шаг Ньютона; если он выходит за отрезок или производная близка
+    к нулю, шаг заменяется делением отрезка пополам. Поэтому решатель не
+    расходится, как NewtonSolver, и сходится быстрее BisectionSolver.
+
+    Тёплый старт: если передан `initial_guess` (или явно включен `warm_start`
+    и есть предыдущее решение), отрезок строится от подсказки до точки на
+    расстоянии `warm_width` (доля от X) в сторону шага Ньютона. Для соседних
+    режимов корни почти совпадают, и решение находится за 2 итерации.
+    По умолчанию `warm_start` выключен: независимые вызовы solve не зависят
+    от предыдущих; цепочку близких режимов решает solve_sequence.
+    """
+
+    def __init__(self, problem: ProblemDefinition, max_iter=100, tol=1e-9, xtol=1e-12,
+                 warm_start=False, warm_width=0.01):
+        self.problem = problem
+        self.max_iter = max_iter
+        self.tol = tol
+        self.xtol = xtol
+        self.warm_start = warm_start
+        self.warm_width = warm_width
+        self.iterations = 0
+        self.evaluations = 0
+        self.last_solution = None
+
+    def solve(self, target_delta, a=1.0, b=10.0, initial_guess=None):
+        self.iterations = 0
+        self.evaluations = 0
+
+        if initial_guess is None and self.warm_start:
+            initial_guess = self.last_solution
+
+        state = None
+        if initial_guess is not None and a < initial_guess < b:
+            state = self._warm_bracket(target_delta, float(initial_guess), a, b)
+            if isinstance(state, float):
+                self.last_solution = state
+                return state
+
+        if state is None:
+            fa = self.problem.f(a, target_delta)
+            fb = self.problem.f(b, target_delta)
+            self.evaluations += 2
+            if fa * fb >= 0:
+                raise ValueError("На концах отрезка [a,b] функция имеет одинаковый знак.")
+            state = (a, fa, b, fb, (a + b) / 2)
+
+        a, fa, b, fb, x = state
+        for i in range(self.max_iter):
+            self.iterations += 1
+            fx = self.problem.f(x, target_delta)
+            self.evaluations += 1
+
+            if abs(fx) < self.tol or (b - a) < self.xtol:
+                self.last_solution = x
+                return x
+
+            # Сужаем отрезок, сохраняя смену знака
+            if fa * fx < 0:
+                b, fb = x, fx
+            else:
+                a, fa = x, fx
+
+            x = self._step(x, fx, a, b)
+
+        raise RuntimeError(f"Гибридный метод не сошелся за {self.max_iter} итераций")
+
+    def solve_sequence(self, targets, a=1.0, b=10.0):
+        """
+        Решает последовательность близких задач, передавая каждое решение как
+        тёплый старт следующей (независимо от `warm_start`). Первая задача
+        начинается с предыдущего решения, только если `warm_start` включен.
+        """
+        results = []
+        guess = self.last_solution if self.warm_start else None
+        for t in targets:
+            guess = self.solve(t, a=a, b=b, initial_guess=guess)
+            results.append(guess)
+        return results
+
+    def _step(self, x, fx, a, b):
+        """Шаг Ньютона, если он остаётся внутри (a, b), иначе середина отрезка."""
+        dfx = self.problem.df(x)
+        if abs(dfx) > 1e-12:
+            x_new = x - fx / dfx
+            if a < x_new < b:
+                return x_new
+        return (a + b) / 2
+
+    def _warm_bracket(self, target_delta, x0, a, b):
+        """
+        Строит узкий отрезок от подсказки x0 в сторону шага Ньютона.
+
+        Возвращает x0, если подсказка уже является решением; кортеж
+        (a, fa, b, fb, x) для основного цикла; None, если смена знака
+        на узком отрезке не найдена.
+        """
+        self.iterations += 1
+        f0 = self.problem.f(x0, target_delta)
+        self.evaluations += 1
+        if abs(f0) < self.tol:
+            return x0
+
+        df0 = self.problem.df(x0)
+        if not abs(df0) > 1e-12:
+            return None
+        x_newton = x0 - f0 / df0
+        if x_newton > x0:
+            other = min(b, max(x_newton, x0 * (1.0 + self.warm_width)))
+        else:
+            other = max(a, min(x_newton, x0 * (1.0 - self.warm_width)))
+        f_other = self.problem.f(other, target_delta)
+        self.evaluations += 1
+        if f0 * f_other >= 0:
+            return None
+
+        lo, flo, hi, fhi = (x0, f0, other, f_other) if x0 < other else (other, f_other, x0, f0)
+        return lo, flo, hi, fhi, self._step(x0, f0, lo, hi)
@@ -0,0 +1,381 @@
+"""
+Общая подсистема итерационных решателей для стратегий конденсатора.
+
+Стратегии больше не пишут собственные циклы: вместо этого они описывают
+функцию (невязку или отображение неподвижной точки) и передают её одному
+из решателей модуля:
+
+* ``FixedPointSolver``  — простая итерация x = g(x) с ускорением Андерсона;
+* ``BracketRootSolver`` — поиск корня на отрезке со сменой знака
+  (метод Иллинойса или дихотомия);
+* ``NewtonRootSolver``  — метод Ньютона (или секущих без производной),
+  при заданном отрезке защищённый дихотомией.
+
+Все решатели реализуют протокол ``Solver`` и возвращают ``SolverResult``
+с числом итераций, вызовов функции, временем и невязкой. Каждый вызов
+учитывается в реестре ``SolverStats`` под именем решателя, что позволяет
+профилировать и настраивать сходимость централизованно.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Protocol, Tuple
+
+import numpy as np
+
+Func = Callable[[float], float]
+
+
+class ConvergenceError(RuntimeError):
+    """Решатель не сошелся; исходный SolverResult доступен в атрибуте ``result``."""
+
+    def __init__(self, message: str, result: "SolverResult"):
+        super().__init__(message)
+        self.result = result
+
+
+@dataclass
+class SolverResult:
+    """Результат работы решателя и диагностика сходимости."""
+    value: float
+    converged: bool
+    iterations: int
+    evaluations: int
+    elapsed: float
+    residual: float
+    method: str
+    history: Optional[List[float]] = None
+
+
+class Solver(Protocol):
+    """Общий интерфейс решателей."""
+    name: str
+
+    def solve(self, func: Func, x0: Optional[float] = None,
+              bracket: Optional[Tuple[float, float]] = None,
+              df: Optional[Func] = None) -> SolverResult:
+        ...
+
+
+@dataclass
+class _Entry:
+    calls: int = 0
+    failures: int = 0
+    iterations: int = 0
+    evaluations: int = 0
+    elapsed: float = 0.0
+    max_iterations: int = 0
+
+
+class SolverStats:
+    """
+    Реестр статистики решателей: суммарное число вызовов, итераций,
+    вызовов функции, отказов и затраченного времени по имени решателя.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, _Entry] = {}
+
+    def record(self, name: str, result: SolverResult) -> None:
+        entry = self._entries.setdefault(name, _Entry())
+        entry.calls += 1
+        entry.failures += 0 if result.converged else 1
+        entry.iterations += result.iterations
+        entry.evaluations += result.evaluations
+        entry.elapsed += result.elapsed
+        entry.max_iterations = max(entry.max_iterations, result.iterations)
+
+    def reset(self) -> None:
+        self._entries.clear()
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        """Снимок статистики со средними значениями на вызов."""
+        out = {}
+        for name, e in self._entries.items():
+            out[name] = {
+                'calls': e.calls,
+                'failures': e.failures,
+                'iterations': e.iterations,
+                'evaluations': e.evaluations,
+                'elapsed': e.elapsed,
+                'max_iterations': e.max_iterations,
+                'mean_iterations': e.iterations / e.calls,
+                'mean_elapsed': e.elapsed / e.calls,
+            }
+        return out
+
+
+STATS = SolverStats()
+
+
+def get_solver_stats() -> Dict[str, Dict[str, float]]:
+    return STATS.as_dict()
+
+
+def reset_solver_stats() -> None:
+    STATS.reset()
+
+
+class _BaseSolver:
+    method = ''
+
+    def __init__(self, name: Optional[str] = None, max_iter: int = 100,
+                 raise_on_failure: bool = True, record_history: bool = False,
+                 stats: Optional[SolverStats] = STATS) -> None:
+        self.name = name or self.method
+        self.max_iter = max_iter
+        self.raise_on_failure = raise_on_failure
+        self.record_history = record_history
+        self.stats = stats
+
+    def _finish(self, value, converged, iterations, evaluations, started, residual, history):
+        result = SolverResult(
+            value=value,
+            converged=converged,
+            iterations=iterations,
+            evaluations=evaluations,
+            elapsed=time.perf_counter() - started,
+            residual=residual,
+            method=self.method,
+            history=history,
+        )
+        if self.stats is not None:
+            self.stats.record(self.name, result)
+        if not converged and self.raise_on_failure:
+            raise ConvergenceError(
+                f"Решатель '{self.name}' ({self.method}) не сошелся за {iterations} итераций, "
+                f"невязка {residual:.3g}", result)
+        return result
+
+
+class FixedPointSolver(_BaseSolver):
+    """
+    Итерация неподвижной точки x = g(x) с ускорением Андерсона.
+
+    Критерий остановки: ||g(x) - x|| < tol; результатом считается
+    последнее значение g(x). При ``anderson_depth=0`` получается обычная
+    простая итерация.
+
+    :param tol: допуск на ||g(x) - x||.
+    :param anderson_depth: глубина истории ускорения Андерсона (m).
+    """
+    method = 'fixed_point'
+
+    def __init__(self, tol: float = 1e-8, anderson_depth: int = 0, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.tol = tol
+        self.anderson_depth = anderson_depth
+
+    def solve(self, func: Func, x0: Optional[float] = None,
+              bracket: Optional[Tuple[float, float]] = None,
+              df: Optional[Func] = None) -> SolverResult:
+        if x0 is None:
+            raise ValueError("Для итерации неподвижной точки нужно начальное приближение x0")
+        started = time.perf_counter()
+        history = [] if self.record_history else None
+        scalar = np.ndim(x0) == 0
+        x = np.atleast_1d(np.asarray(x0, dtype=float))
+        g_hist: List[np.ndarray] = []
+        f_hist: List[np.ndarray] = []
+        gx, residual = x, math.inf
+
+        for i in range(1, self.max_iter + 1):
+            gx = np.atleast_1d(np.asarray(func(x[0] if scalar else x), dtype=float))
+            f = gx - x
+            residual = float(np.max(np.abs(f)))
+            if history is not None:
+                history.append(residual)
+            if residual < self.tol:
+                return self._finish(float(gx[0]) if scalar else gx, True, i, i, started, residual, history)
+
+            if self.anderson_depth > 0:
+                g_hist.append(gx)
+                f_hist.append(f)
+                if len(f_hist) > self.anderson_depth + 1:
+                    g_hist.pop(0)
+                    f_hist.pop(0)
+                x = self._anderson(g_hist, f_hist)
+            else:
+                x = gx
+
+        return self._finish(float(gx[0]) if scalar else gx, False, self.max_iter, self.max_iter,
+                            started, residual, history)
+
+    @staticmethod
+    def _anderson(g_hist: List[np.ndarray], f_hist: List[np.ndarray]) -> np.ndarray:
+        """Шаг Андерсона (тип II) по накопленной истории g и невязок f."""
+        if len(f_hist) < 2:
+            return g_hist[-1]
+        dF = np.column_stack([f_hist[k + 1] - f_hist[k] for k in range(len(f_hist) - 1)])
+        dG = np.column_stack([g_hist[k + 1] - g_hist[k] for k in range(len(g_hist) - 1)])
+        gamma, *_ = np.linalg.lstsq(dF, f_hist[-1], rcond=None)
+        x_new = g_hist[-1] - dG @ gamma
+        return x_new if np.all(np.isfinite(x_new)) else g_hist[-1]
+
+
+class BracketRootSolver(_BaseSolver):
+    """
+    Поиск корня f(x) = 0 на отрезке со сменой знака.
+
+    :param method: 'illinois' (модифицированный метод хорд) или 'bisection'.
+    :param ftol: допуск на |f(x)|.
+    :param xtol: допуск на ширину отрезка.
+    :param expand: если на концах нет смены знака, отрезок расширяется
+        в сторону меньшей |f| не более чем за ``expand`` шагов.
+
+    Если смены знака нет и после расширения, решатель с ``raise_on_failure=True``
+    поднимает ValueError, иначе возвращает несошедшийся результат в конце
+    отрезка с меньшей |f|.
+    """
+    method = 'bracket'
+
+    def __init__(self, method: str = 'illinois', ftol: float = 1e-9, xtol: float = 1e-12,
+                 expand: int = 0, **kwargs) -> None:
+        if method not in ('illinois', 'bisection'):
+            raise ValueError(f"Неизвестный метод '{method}'")
+        self.method = method
+        super().__init__(**kwargs)
+        self.ftol = ftol
+        self.xtol = xtol
+        self.expand = expand
+
+    def solve(self, func: Func, x0: Optional[float] = None,
+              bracket: Optional[Tuple[float, float]] = None,
+              df: Optional[Func] = None) -> SolverResult:
+        if bracket is None:
+            raise ValueError("Для поиска корня на отрезке нужен bracket=(a, b)")
+        started = time.perf_counter()
+        history = [] if self.record_history else None
+        a, b = bracket
+        fa, fb = func(a), func(b)
+        evaluations = 2
+        for _ in range(self.expand):
+            if fa * fb <= 0:
+                break
+            width = (b - a) * 1.6
+            if abs(fa) < abs(fb):
+                a -= width
+                fa = func(a)
+            else:
+                b += width
+                fb = func(b)
+            evaluations += 1
+        if abs(fa) <= self.ftol:
+            return self._finish(a, True, 0, evaluations, started, abs(fa), history)
+        if abs(fb) <= self.ftol:
+            return self._finish(b, True, 0, evaluations, started, abs(fb), history)
+        if fa * fb > 0:
+            if self.raise_on_failure:
+                raise ValueError("На концах отрезка [a,b] функция имеет одинаковый знак.")
+            # Корня на отрезке нет: несошедшийся результат в конце с меньшей |f|
+            x, fx = (a, fa) if abs(fa) <= abs(fb) else (b, fb)
+            return self._finish(x, False, 0, evaluations, started, abs(fx), history)
+
+        side = 0
+        x, fx = a, fa
+        for i in range(1, self.max_iter + 1):
+            if self.method == 'bisection' or fb == fa:
+                x = (a + b) / 2
+            else:
+                x = (a * fb - b * fa) / (fb - fa)
+            fx = func(x)
+            evaluations += 1
+            if history is not None:
+                history.append(abs(fx))
+            if abs(fx) <= self.ftol or abs(b - a) < self.xtol:
+                return self._finish(x, True, i, evaluations, started, abs(fx), history)
+
+            if fa * fx < 0:
+                b, fb = x, fx
+                if side == -1:
+                    fa /= 2  # модификация Иллинойса: не даём концу «залипнуть»
+                side = -1
+            else:
+                a, fa = x, fx
+                if side == 1:
+                    fb /= 2
+                side = 1
+
+        return self._finish(x, False, self.max_iter, evaluations, started, abs(fx), history)
+
+
+class NewtonRootSolver(_BaseSolver):
+    """
+    Метод Ньютона для f(x) = 0.
+
+    Без производной ``df`` используется метод секущих. Если задан отрезок
+    со сменой знака, шаги, выходящие за него, заменяются дихотомией. Отрезок
+    без смены знака при ``raise_on_failure=True`` даёт ValueError, иначе —
+    несошедшийся результат в конце отрезка с меньшей |f|, как у BracketRootSolver.
+    """
+    method = 'newton'
+
+    def __init__(self, tol: float = 1e-9, xtol: float = 1e-12, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.tol = tol
+        self.xtol = xtol
+
+    def solve(self, func: Func, x0: Optional[float] = None,
+              bracket: Optional[Tuple[float, float]] = None,
+              df: Optional[Func] = None) -> SolverResult:
+        started = time.perf_counter()
+        history = [] if self.record_history else None
+        evaluations = 0
+        a = b = fa = None
+        if bracket is not None:
+            a, b = bracket
+            fa, fb = func(a), func(b)
+            evaluations += 2
+            if fa * fb > 0:
+                if self.raise_on_failure:
+                    raise ValueError("На концах отрезка [a,b] функция имеет одинаковый знак.")
+                x, fx = (a, fa) if abs(fa) <= abs(fb) else (b, fb)
+                return self._finish(x, False, 0, evaluations, started, abs(fx), history)
+            if x0 is None or not a < x0 < b:
+                x0 = (a + b) / 2
+        if x0 is None:
+            raise ValueError("Для метода Ньютона нужно начальное приближение x0 или отрезок")
+
+        x, x_prev, f_prev = float(x0), None, None
+        fx = math.inf
+        i = 0
+        for i in range(1, self.max_iter + 1):
+            fx = func(x)
+            evaluations += 1
+            if history is not None:
+                history.append(abs(fx))
+            if abs(fx) < self.tol:
+                return self._finish(x, True, i, evaluations, started, abs(fx), history)
+
+            if a is not None:
+                if fa * fx < 0:
+                    b = x
+                else:
+                    a, fa = x, fx
+                if b - a < self.xtol:
+                    return self._finish(x, True, i, evaluations, started, abs(fx), history)
+
+            if df is not None:
+                slope = df(x)
+            elif x_prev is not None and x != x_prev:
+                slope = (fx - f_prev) / (x - x_prev)
+            else:
+                slope = None
+
+            x_prev, f_prev = x, fx
+            if slope is not None and abs(slope) > 1e-12:
+                x_new = x - fx / slope
+            elif a is not None:
+                x_new = (a + b) / 2
+            else:
+                x_new = x * (1 + 1e-4) + 1e-4  # первый шаг секущих
+            if a is not None and not a < x_new < b:
+                x_new = (a + b) / 2
+            if not math.isfinite(x_new):
+                break
+            x = x_new
+
+        return self._finish(x, False, i, evaluations, started, abs(fx), history)
@@ -0,0 +1,259 @@
+"""
+Реестр стратегий расчёта конденсатора и диспетчер пакетного выполнения.
+
+Вместо цепочки if/elif по ``calculation_strategy`` (см. condenser_worker.md,
+п. 3.4) стратегия выбирается по имени из реестра:
+
+    result = calculate("vku", params)
+
+Реестр хранит для каждого имени фабрику и ключи параметров конструктора
+(``init_keys``, например номинальные расход и сухость ВКУ). Экземпляры
+переиспользуются в пределах процесса: один на (стратегия, значения init_keys).
+
+Общий протокол стратегий — ``calculate(params)`` и ``calculate_batch(params_list)``;
+для стратегий без собственного пакетного метода (Берман, Metro-Vickers)
+реестр выполняет режимы по одному на общем экземпляре.
+
+Диспетчер ``dispatch(records)`` принимает очередь разнородных записей
+``{"strategy": имя, "params": {...}}``, группирует их по стратегии, параметрам
+конструктора и геометрии (``group_keys``) и выполняет каждую группу одним
+пакетом. Результаты возвращаются в исходном порядке записей; ошибка одной
+записи не прерывает остальные.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Protocol, Sequence, Tuple
+
+from utils.TPS_module import TablePressureStrategy
+from utils.VKU_strategy import VKUStrategy
+from utils.berman_strategy import BermanStrategy
+from utils.metrovickers_strategy import MetroVickersStrategy
+
+# Параметры геометрии конденсатора (condenser_geometry.json)
+GEOMETRY_KEYS = (
+    'diameter_inside_of_pipes',
+    'thickness_pipe_wall',
+    'length_cooling_tubes_of_the_main_bundle',
+    'length_cooling_tubes_of_the_built_in_bundle',
+    'number_cooling_tubes_of_the_main_bundle',
+    'number_cooling_tubes_of_the_built_in_bundle',
+    'number_cooling_water_passes_of_the_main_bundle',
+    'number_cooling_water_passes_of_the_built_in_bundle',
+    'thermal_conductivity_cooling_surface_tube_material',
+)
+
+
+class UnknownStrategyError(KeyError):
+    """Стратегия с таким именем не зарегистрирована."""
+
+
+class CalculationStrategy(Protocol):
+    """Общий интерфейс стратегий расчёта."""
+
+    def calculate(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        ...
+
+    def calculate_batch(self, params_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        ...
+
+
+@dataclass(frozen=True)
+class StrategySpec:
+    """Описание стратегии в реестре."""
+    name: str
+    factory: Callable[..., Any]
+    init_keys: Tuple[str, ...] = ()
+    group_keys: Tuple[str, ...] = ()
+
+    @property
+    def result_key(self) -> str:
+        """Ключ результатов в выходном JSON (``berman_results`` и т.п.)."""
+        return f"{self.name}_results"
+
+
+@dataclass
+class TaskResult:
+    """Результат одной записи очереди: result при успехе, error — исключение записи."""
+    strategy: str
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+_SCALARS = (int, float, str, bool, type(None))
+
+
+def _freeze(value: Any) -> Any:
+    # Хешируемый ключ группы из значений параметров (списки, словари, таблицы)
+    if isinstance(value, _SCALARS):
+        return value
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if hasattr(value, 'tolist'):  # numpy-массивы и скаляры
+        return _freeze(value.tolist())
+    if isinstance(value, Mapping):
+        return _freeze(dict(value))
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted((_freeze(v) for v in value), key=repr))
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+class StrategyRegistry:
+    """Имена стратегий -> фабрики, пул экземпляров и пакетное выполнение."""
+
+    def __init__(self, max_instances: int = 256) -> None:
+        self.max_instances = max_instances
+        self._specs: Dict[str, StrategySpec] = {}
+        self._instances: Dict[Tuple[str, Any], Any] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, factory: Callable[..., Any], *,
+                 init_keys: Sequence[str] = (), group_keys: Sequence[str] = ()) -> StrategySpec:
+        spec = StrategySpec(name, factory, tuple(init_keys), tuple(group_keys))
+        with self._lock:
+            self._specs[name] = spec
+            self._instances = {k: v for k, v in self._instances.items() if k[0] != name}
+        return spec
+
+    def names(self) -> List[str]:
+        return list(self._specs)
+
+    def spec(self, name: str) -> StrategySpec:
+        try:
+            return self._specs[name]
+        except KeyError:
+            raise UnknownStrategyError(
+                f"Неизвестная стратегия: '{name}' (доступны: {', '.join(self._specs)})") from None
+
+    def instance(self, name: str, params: Optional[Mapping[str, Any]] = None) -> Any:
+        """Экземпляр стратегии из пула процесса (создаётся при первом запросе)."""
+        spec = self.spec(name)
+        params = params or {}
+        try:
+            init = {key: params[key] for key in spec.init_keys}
+        except KeyError as e:
+            raise KeyError(f"Отсутствует обязательный параметр стратегии '{name}': {e}") from None
+        key = (name, _freeze(init))
+        with self._lock:
+            strategy = self._instances.get(key)
+        if strategy is None:
+            strategy = spec.factory(**init)
+            with self._lock:
+                if len(self._instances) >= self.max_instances:
+                    self._instances.pop(next(iter(self._instances)))
+                strategy = self._instances.setdefault(key, strategy)
+        return strategy
+
+    def clear(self) -> None:
+        """Сбрасывает пул экземпляров."""
+        with self._lock:
+            self._instances.clear()
+
+    def calculate(self, name: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        return self.instance(name, params).calculate(params)
+
+    def calculate_batch(self, name: str, params_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Пакет режимов одной стратегии с одинаковыми параметрами конструктора."""
+        if not params_list:
+            return []
+        strategy = self.instance(name, params_list[0])
+        batch = getattr(strategy, 'calculate_batch', None)
+        if batch is not None:
+            return batch(params_list)
+        return [strategy.calculate(params) for params in params_list]
+
+    def group_key(self, name: str, params: Mapping[str, Any],
+                  memo: Optional[Dict[int, Any]] = None) -> Tuple[Any, ...]:
+        """
+        Ключ группы записи: (стратегия, параметры конструктора, геометрия).
+
+        :param memo: кеш замороженных значений по id объекта — записи одной очереди
+            обычно ссылаются на одни и те же таблицы геометрии.
+        """
+        spec = self.spec(name)
+
+        def frozen(value):
+            if memo is None or isinstance(value, _SCALARS):
+                return _freeze(value)
+            entry = memo.get(id(value))
+            if entry is None or entry[0] is not value:
+                entry = memo[id(value)] = (value, _freeze(value))
+            return entry[1]
+
+        return (name,
+                tuple(frozen(params.get(k)) for k in spec.init_keys),
+                tuple(frozen(params.get(k)) for k in spec.group_keys))
+
+    def dispatch(self, records: Iterable[Mapping[str, Any]]) -> List[TaskResult]:
+        """
+        Выполняет очередь записей {"strategy", "params"} пакетами по группам.
+
+        :return: TaskResult на каждую запись в исходном порядке.
+        """
+        records = list(records)
+        results: List[Optional[TaskResult]] = [None] * len(records)
+        groups: Dict[Tuple[Any, ...], List[int]] = {}
+        memo: Dict[int, Any] = {}
+        for idx, record in enumerate(records):
+            name = record.get('strategy')
+            try:
+                key = self.group_key(name, record['params'], memo)
+                groups.setdefault(key, []).append(idx)
+            except (UnknownStrategyError, KeyError, TypeError) as e:
+                results[idx] = TaskResult(str(name), error=e)
+
+        for (name, _, _), indices in groups.items():
+            params_list = [records[i]['params'] for i in indices]
+            try:
+                batch = self.calculate_batch(name, params_list)
+            except Exception:
+                # Пакет упал — считаем записи по одной, чтобы ошибка осталась у своей записи
+                for i in indices:
+                    try:
+                        results[i] = TaskResult(name, result=self.calculate(name, records[i]['params']))
+                    except Exception as e:
+                        results[i] = TaskResult(name, error=e)
+                continue
+            for i, result in zip(indices, batch):
+                results[i] = TaskResult(name, result=result)
+        return results
+
+
+def _default_registry() -> StrategyRegistry:
+    registry = StrategyRegistry()
+    registry.register('berman', BermanStrategy, group_keys=GEOMETRY_KEYS)
+    registry.register('metro_vickers', MetroVickersStrategy, group_keys=GEOMETRY_KEYS)
+    registry.register('vku', VKUStrategy, init_keys=('mass_flow_steam_nom', 'degree_dryness_steam_nom'))
+    registry.register('table_pressure', TablePressureStrategy, group_keys=('NAMET', 'NAMED'))
+    return registry
+
+
+STRATEGY_REGISTRY = _default_registry()
+
+
+def get_strategy(name: str, params: Optional[Mapping[str, Any]] = None) -> Any:
+    return STRATEGY_REGISTRY.instance(name, params)
+
+
+def calculate(name: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    return STRATEGY_REGISTRY.calculate(name, params)
+
+
+def calculate_batch(name: str, params_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return STRATEGY_REGISTRY.calculate_batch(name, params_list)
+
+
+def dispatch(records: Iterable[Mapping[str, Any]]) -> List[TaskResult]:
+    return STRATEGY_REGISTRY.dispatch(records)
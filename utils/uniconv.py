@@ -4,7 +4,8 @@
 """
 
 from __future__ import annotations
-from typing import Callable, Union, Dict, Any
+from types import MappingProxyType
+from typing import Callable, Union, Dict, Any, Mapping
 
 Number = Union[int, float]
 FactorOrFunc = Union[Number, Callable[[Number], Number]]
@@ -18,6 +19,10 @@ class UnknownUnitError(ValueError):
     pass
 
 
+class FrozenConverterError(TypeError):
+    pass
+
+
 def _linear(to_base_factor: float) -> tuple[Callable[[Number], Number],
                                             Callable[[Number], Number]]:
     """
@@ -66,8 +71,17 @@ class UnitConverter:
     # API
     # -------------------------------------------------------------
     def __init__(self) -> None:
-        self.parameters: Dict[str, Dict[str, Any]] = {}
-        self._build_defaults()
+        # Таблицы «из коробки» строятся один раз на процесс и разделяются
+        # всеми экземплярами; собственная копия создаётся только при
+        # первом add_parameter / add_unit (copy-on-write).
+        self._parameters: Mapping[str, Any] = _default_tables()
+        self._shared = True
+        self._frozen = False
+
+    @property
+    def parameters(self) -> Mapping[str, Any]:
+        """Таблица параметров (read-only, пока экземпляр не расширялся)."""
+        return self._parameters
 
     # ------------------------ PUBLIC -----------------------------
     def convert(self, value: Number, *,
@@ -120,7 +134,8 @@ class UnitConverter:
         p = self._norm_param(parameter_type)
         if p in self.parameters:
             raise ValueError(f"Parameter '{parameter_type}' уже существует")
-        self.parameters[p] = {
+        self._ensure_own_tables()
+        self._parameters[p] = {
             "name": parameter_type,
             "base": base_unit_symbol,
             "units": {
@@ -148,6 +163,7 @@ class UnitConverter:
         parameter_type = self._norm_param(parameter_type)
         if parameter_type not in self.parameters:
             raise UnknownParameterError(parameter_type)
+        self._ensure_own_tables()
 
         # Превращаем фактор в функцию (если нужно)
         if not callable(to_base):
@@ -168,13 +184,24 @@ class UnitConverter:
         else:
             from_base_func = from_base
 
-        self.parameters[parameter_type]["units"][unit_symbol] = {
+        self._parameters[parameter_type]["units"][unit_symbol] = {
             "name": unit_name,
             "to_base": to_base_func,
             "from_base": from_base_func,
         }
 
     # ---------------------- INTERNAL -----------------------------
+    def _ensure_own_tables(self) -> None:
+        """Copy-on-write: отвязывает экземпляр от общих таблиц."""
+        if self._frozen:
+            raise FrozenConverterError(
+                "Общий конвертер по умолчанию неизменяем; для расширения "
+                "создайте собственный экземпляр UnitConverter()"
+            )
+        if self._shared:
+            self._parameters = _thaw(self._parameters)
+            self._shared = False
+
     # нормализация ключа параметра
     @staticmethod
     def _norm_param(p: str) -> str:
@@ -381,9 +408,80 @@ class UnitConverter:
                       to_base=lambda v: v / 100.0,
                       from_base=lambda v: v * 100.0)
 
+        # 11) Length (геометрия трубных пучков) ---------------------
+        self.add_parameter("length",
+                           base_unit_symbol="м",
+                           base_unit_name="метр")
+
+        self.add_unit("length",
+                      unit_symbol="мм",
+                      unit_name="миллиметр",
+                      to_base=0.001,
+                      from_base=1000)
+
     # -------------------------------------------------------------
 
 
+def _freeze(parameters: Dict[str, Dict[str, Any]]) -> Mapping[str, Any]:
+    """Превращает таблицы параметров в неизменяемые MappingProxyType."""
+    return MappingProxyType({
+        p: MappingProxyType({
+            **meta,
+            "units": MappingProxyType({
+                u: MappingProxyType(dict(unit)) for u, unit in meta["units"].items()
+            }),
+        })
+        for p, meta in parameters.items()
+    })
+
+
+def _thaw(parameters: Mapping[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Изменяемая копия замороженных таблиц (функции конверсии не копируются)."""
+    return {
+        p: {
+            **meta,
+            "units": {u: dict(unit) for u, unit in meta["units"].items()},
+        }
+        for p, meta in parameters.items()
+    }
+
+
+def _build_default_tables() -> Mapping[str, Any]:
+    builder = UnitConverter.__new__(UnitConverter)
+    builder._parameters = {}
+    builder._shared = False
+    builder._frozen = False
+    builder._build_defaults()
+    return _freeze(builder._parameters)
+
+
+_DEFAULT_TABLES: Mapping[str, Any] | None = None
+_DEFAULT_CONVERTER: UnitConverter | None = None
+
+
+def _default_tables() -> Mapping[str, Any]:
+    global _DEFAULT_TABLES
+    if _DEFAULT_TABLES is None:
+        _DEFAULT_TABLES = _build_default_tables()
+    return _DEFAULT_TABLES
+
+
+def get_default_converter() -> UnitConverter:
+    """
+    Общий на процесс неизменяемый конвертер со стандартным набором единиц.
+
+    Предназначен для стратегий и расчётных функций, которым не нужны
+    пользовательские единицы: повторное создание не требуется вовсе.
+    Попытка расширить его вызывает FrozenConverterError.
+    """
+    global _DEFAULT_CONVERTER
+    if _DEFAULT_CONVERTER is None:
+        uc = UnitConverter()
+        uc._frozen = True
+        _DEFAULT_CONVERTER = uc
+    return _DEFAULT_CONVERTER
+
+
 # -----------------------------------------------------------------
 # Пример использования
 # -----------------------------------------------------------------
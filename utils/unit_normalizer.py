@@ -0,0 +1,151 @@
+"""
+Декларативное приведение входных записей стратегий к системным единицам.
+
+Каждая стратегия описывает свои системные единицы словарём
+``INPUT_UNITS = {поле: (параметр, единица)}``. Нормализатор принимает
+такую схему, описание единиц входных данных в том же формате и один раз
+«компилирует» их в список функций-преобразований. Скомпилированная схема
+применяется к одной записи или сразу к пакету записей: в пакетном режиме
+каждое поле конвертируется одним векторным вызовом NumPy.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Tuple
+
+import numpy as np
+
+from utils.uniconv import UnitConverter, UnknownParameterError, get_default_converter
+
+FieldUnits = Mapping[str, Tuple[str, str]]
+Conversion = Callable[[Any], Any]
+
+
+def _apply(func: Conversion, value: Any) -> Any:
+    """Применяет преобразование к скаляру, массиву или списку значений."""
+    if isinstance(value, (list, tuple)):
+        return func(np.asarray(value, dtype=float)).tolist()
+    return func(value)
+
+
+@dataclass(frozen=True)
+class CompiledSchema:
+    """
+    Результат компиляции схемы: кортеж пар (поле, преобразование).
+
+    Поля, единицы которых уже совпадают с системными, в схему не попадают,
+    поэтому для «чистых» входных данных нормализация сводится к копированию.
+    """
+    steps: Tuple[Tuple[str, Conversion], ...]
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        return tuple(name for name, _ in self.steps)
+
+    def apply(self, record: Mapping[str, Any]) -> Dict[str, Any]:
+        """Возвращает копию записи со значениями в системных единицах."""
+        out = dict(record)
+        for name, func in self.steps:
+            value = out.get(name)
+            if value is not None:
+                out[name] = _apply(func, value)
+        return out
+
+    def apply_batch(self, records: Iterable[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Нормализует пакет записей.
+
+        Скалярные значения одного поля собираются в массив и конвертируются
+        за один вызов; списочные значения (например, ``*_list`` у Бермана)
+        конвертируются поштучно.
+        """
+        out = [dict(r) for r in records]
+        for name, func in self.steps:
+            idx, values = [], []
+            for i, rec in enumerate(out):
+                value = rec.get(name)
+                if value is None:
+                    continue
+                if isinstance(value, (list, tuple)):
+                    rec[name] = _apply(func, value)
+                else:
+                    idx.append(i)
+                    values.append(value)
+            if idx:
+                converted = func(np.asarray(values, dtype=float)).tolist()
+                for i, v in zip(idx, converted):
+                    out[i][name] = v
+        return out
+
+    def apply_columns(self, columns: Mapping[str, Any]) -> Dict[str, np.ndarray]:
+        """Нормализует данные в колоночном виде {поле: массив значений}."""
+        out = {name: np.asarray(values, dtype=float) for name, values in columns.items()}
+        for name, func in self.steps:
+            if name in out:
+                out[name] = func(out[name])
+        return out
+
+
+class RecordNormalizer:
+    """
+    Приводит входные записи к системным единицам стратегии.
+
+    :param target_units: схема системных единиц стратегии {поле: (параметр, единица)}.
+    :param converter: экземпляр UnitConverter (по умолчанию — общий get_default_converter()).
+    """
+
+    def __init__(self, target_units: FieldUnits, converter: UnitConverter | None = None) -> None:
+        self.target_units = dict(target_units)
+        self.uc = converter if converter is not None else get_default_converter()
+        self._compiled: Dict[frozenset, CompiledSchema] = {}
+
+    def compile(self, source_units: FieldUnits) -> CompiledSchema:
+        """
+        Компилирует описание единиц входных данных в CompiledSchema.
+
+        Результат кэшируется, поэтому повторные вызовы с той же схемой
+        (типичный случай для пакета режимов) ничего не стоят.
+        """
+        key = frozenset(source_units.items())
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            compiled = CompiledSchema(tuple(self._build_steps(source_units)))
+            self._compiled[key] = compiled
+        return compiled
+
+    def normalize(self, record: Mapping[str, Any], source_units: FieldUnits) -> Dict[str, Any]:
+        """Нормализует одну запись."""
+        return self.compile(source_units).apply(record)
+
+    def normalize_batch(self, records: Iterable[Mapping[str, Any]],
+                        source_units: FieldUnits) -> List[Dict[str, Any]]:
+        """Нормализует пакет записей с общей схемой единиц."""
+        return self.compile(source_units).apply_batch(records)
+
+    # ---------------------- INTERNAL -----------------------------
+    def _build_steps(self, source_units: FieldUnits) -> Iterable[Tuple[str, Conversion]]:
+        for name, (parameter_type, from_unit) in source_units.items():
+            if name not in self.target_units:
+                raise KeyError(f"Поле '{name}' отсутствует в схеме системных единиц")
+            target_type, to_unit = self.target_units[name]
+            if self.uc._norm_param(parameter_type) != self.uc._norm_param(target_type):
+                raise ValueError(
+                    f"Поле '{name}': параметр '{parameter_type}' не совпадает "
+                    f"с системным '{target_type}'"
+                )
+            if from_unit == to_unit:
+                continue
+            yield name, self._conversion(target_type, from_unit, to_unit)
+
+    def _conversion(self, parameter_type: str, from_unit: str, to_unit: str) -> Conversion:
+        p = self.uc._norm_param(parameter_type)
+        if p not in self.uc.parameters:
+            raise UnknownParameterError(parameter_type)
+        to_base = self.uc._get_unit(p, from_unit)["to_base"]
+        base = self.uc.get_base_unit(p)
+        if to_unit == base:
+            return to_base
+        from_base = self.uc._get_unit(p, to_unit)["from_base"]
+        if from_unit == base:
+            return from_base
+        return lambda v, a=to_base, b=from_base: b(a(v))
@@ -0,0 +1,276 @@
+"""
+Прогон валидационных случаев стратегий с отчётом о точности и времени расчёта.
+
+Случаи хранятся в ``validation_data/**/cases/*.json``. Один файл — одна
+стратегия и набор случаев:
+
+    {
+      "strategy": "vku",                      // ключ STRATEGIES
+      "description": "...",
+      "init": {...},                          // аргументы конструктора стратегии
+      "defaults": {"inputs": {...}, "tolerance": {"rel": 0.01}},
+      "cases": [
+        {"id": "mode-1", "inputs": {...}, "expected": {"pressure_flow_path_1": 0.0913},
+         "tolerance": {"abs": 1e-5}, "xfail": "причина известного расхождения"}
+      ]
+    }
+
+Ключи expected — пути в результате через точку (индексы списков — числа):
+``ejector_results.0.ejector_pressure_kPa``. Значение сходится с эталоном, если
+``|факт - эталон| <= abs + rel * |эталон|``; ожидаемое null требует null.
+
+Каждый случай считается repeat раз (первый вызов — проверка, остальные — только
+время); отчёт JSON содержит статус и расхождения по каждому значению, задержки
+(min/median/max, мс) и сводку по стратегиям. Расхождение случая с xfail не
+считается регрессией (при совпадении с эталоном статус xpass), но исключение
+при расчёте — всегда статус error, независимо от xfail.
+
+Запуск:  python -m utils.validation_replay [--report replay_report.json] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import glob
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from utils.TPS_module import TablePressureStrategy
+from utils.VKU_strategy import VKUStrategy
+from utils.berman_strategy import BermanStrategy
+from utils.exceptions_method import CondenserExceptions
+from utils.metrovickers_strategy import MetroVickersStrategy
+
+VALIDATION_ROOT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "validation_data")
+CASES_PATTERN = os.path.join("**", "cases", "*.json")
+
+DEFAULT_TOLERANCE = {"abs": 0.0, "rel": 1e-6}
+
+
+def _condenser_exceptions(_, params: Mapping[str, Any]) -> Dict[str, Any]:
+    return {'pressure_flow_path_1': CondenserExceptions(**params).calculate_pressure()}
+
+
+# Ключ стратегии -> (фабрика экземпляра по "init" или None, расчёт (экземпляр, входы) -> результат)
+STRATEGIES: Dict[str, Tuple[Optional[Callable[..., Any]], Callable[[Any, Mapping[str, Any]], Any]]] = {
+    'berman': (BermanStrategy, lambda s, p: s.calculate(p)),
+    'metro_vickers': (MetroVickersStrategy, lambda s, p: s.calculate(p)),
+    'vku': (VKUStrategy, lambda s, p: s.calculate(p)),
+    'table_pressure': (TablePressureStrategy, lambda s, p: s.calculate(p)),
+    'condenser_exceptions': (None, _condenser_exceptions),
+}
+
+
+@dataclass(frozen=True)
+class ReplayCase:
+    """Один валидационный случай (после подстановки defaults файла)."""
+    file: str
+    case_id: str
+    strategy: str
+    init: Mapping[str, Any]
+    inputs: Mapping[str, Any]
+    expected: Mapping[str, Any]
+    tolerance: Mapping[str, float]
+    xfail: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        return f"{os.path.splitext(os.path.basename(self.file))[0]}::{self.case_id}"
+
+
+@dataclass
+class CaseResult:
+    case: ReplayCase
+    status: str                      # pass | fail | error | xfail | xpass
+    checks: List[Dict[str, Any]] = field(default_factory=list)
+    latency_ms: Dict[str, float] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = {"case": self.case.name, "file": self.case.file, "strategy": self.case.strategy,
+               "status": self.status, "latency_ms": self.latency_ms, "checks": self.checks}
+        if self.case.xfail:
+            out["xfail"] = self.case.xfail
+        if self.error:
+            out["error"] = self.error
+        return out
+
+
+def discover_cases(root: str = VALIDATION_ROOT, strategies: Optional[List[str]] = None) -> List[ReplayCase]:
+    """Все случаи из root/**/cases/*.json в порядке путей файлов."""
+    cases = []
+    for path in sorted(glob.glob(os.path.join(root, CASES_PATTERN), recursive=True)):
+        with open(path, encoding='utf-8') as f:
+            spec = json.load(f)
+        strategy = spec['strategy']
+        if strategy not in STRATEGIES:
+            raise ValueError(f"{path}: неизвестная стратегия '{strategy}' (доступны: {', '.join(STRATEGIES)})")
+        if strategies and strategy not in strategies:
+            continue
+        defaults = spec.get('defaults', {})
+        rel_path = os.path.relpath(path, os.path.dirname(root))
+        for i, case in enumerate(spec['cases'], 1):
+            cases.append(ReplayCase(
+                file=rel_path,
+                case_id=str(case.get('id', i)),
+                strategy=strategy,
+                init=spec.get('init', {}),
+                inputs={**defaults.get('inputs', {}), **case.get('inputs', {})},
+                expected=case['expected'],
+                tolerance={**DEFAULT_TOLERANCE, **defaults.get('tolerance', {}), **case.get('tolerance', {})},
+                xfail=case.get('xfail', spec.get('xfail')),
+            ))
+    return cases
+
+
+def resolve_path(result: Any, path: str) -> Any:
+    """Значение результата по пути вида ``a.0.b``."""
+    value = result
+    for part in path.split('.'):
+        value = value[int(part)] if isinstance(value, (list, tuple)) else value[part]
+    return value
+
+
+def _number(value: Any) -> Any:
+    # numpy-скаляры и 0-мерные массивы -> float, чтобы отчёт сериализовался в JSON
+    if hasattr(value, 'item') and not isinstance(value, (list, tuple, dict)):
+        return value.item()
+    return value
+
+
+def compare(actual: Any, expected: Any, tolerance: Mapping[str, float]) -> Dict[str, Any]:
+    """Одна проверка: {'expected', 'actual', 'abs_err', 'rel_err', 'ok'}."""
+    actual = _number(actual)
+    check: Dict[str, Any] = {"expected": expected, "actual": actual}
+    if expected is None or isinstance(expected, (str, bool)):
+        check["ok"] = actual == expected
+        return check
+    if isinstance(expected, list):
+        actual = list(actual) if actual is not None else []
+        items = [compare(a, e, tolerance) for a, e in zip(actual, expected)]
+        check["actual"] = [item["actual"] for item in items]
+        check["ok"] = len(actual) == len(expected) and all(item["ok"] for item in items)
+        errs = [item["abs_err"] for item in items if item.get("abs_err") is not None]
+        check["abs_err"] = max(errs) if errs else None
+        return check
+    if actual is None or not isinstance(actual, (int, float)) or math.isnan(actual):
+        check.update(abs_err=None, rel_err=None, ok=False)
+        return check
+    abs_err = abs(actual - expected)
+    check["abs_err"] = abs_err
+    check["rel_err"] = abs_err / abs(expected) if expected else None
+    check["ok"] = abs_err <= tolerance.get('abs', 0.0) + tolerance.get('rel', 0.0) * abs(expected)
+    return check
+
+
+class ReplayRunner:
+    """Прогоняет случаи; экземпляры стратегий создаются один раз на (стратегия, init)."""
+
+    def __init__(self, repeat: int = 1) -> None:
+        self.repeat = max(1, repeat)
+        self._instances: Dict[Tuple[str, str], Any] = {}
+
+    def _instance(self, case: ReplayCase) -> Any:
+        factory = STRATEGIES[case.strategy][0]
+        if factory is None:
+            return None
+        key = (case.strategy, json.dumps(case.init, sort_keys=True))
+        if key not in self._instances:
+            self._instances[key] = factory(**case.init)
+        return self._instances[key]
+
+    def run_case(self, case: ReplayCase) -> CaseResult:
+        calculate = STRATEGIES[case.strategy][1]
+        timings = []
+        try:
+            instance = self._instance(case)
+            for _ in range(self.repeat):
+                t0 = time.perf_counter_ns()
+                result = calculate(instance, case.inputs)
+                timings.append((time.perf_counter_ns() - t0) / 1e6)
+                if len(timings) == 1:
+                    first = result
+            checks = []
+            for path, expected in case.expected.items():
+                try:
+                    actual = resolve_path(first, path)
+                except (KeyError, IndexError, TypeError):
+                    checks.append({"path": path, "expected": expected, "actual": None, "ok": False,
+                                   "error": "нет значения в результате"})
+                    continue
+                checks.append({"path": path, **compare(actual, expected, case.tolerance)})
+        except Exception as e:
+            return CaseResult(case, "error", error=f"{type(e).__name__}: {e}")
+        ok = all(c["ok"] for c in checks)
+        status = ("xpass" if ok else "xfail") if case.xfail else ("pass" if ok else "fail")
+        latency = {"min": min(timings), "median": statistics.median(timings), "max": max(timings)}
+        return CaseResult(case, status, checks, {k: round(v, 4) for k, v in latency.items()})
+
+    def run(self, cases: List[ReplayCase]) -> List[CaseResult]:
+        return [self.run_case(case) for case in cases]
+
+
+def build_report(results: List[CaseResult], repeat: int = 1) -> Dict[str, Any]:
+    """Машиночитаемый отчёт: сводка, статистика по стратегиям и все случаи."""
+    totals = {s: 0 for s in ("pass", "fail", "error", "xfail", "xpass")}
+    by_strategy: Dict[str, Dict[str, Any]] = {}
+    for r in results:
+        totals[r.status] += 1
+        entry = by_strategy.setdefault(r.case.strategy, {"cases": 0, **{s: 0 for s in totals}, "_lat": []})
+        entry["cases"] += 1
+        entry[r.status] += 1
+        if r.latency_ms:
+            entry["_lat"].append(r.latency_ms["median"])
+    for entry in by_strategy.values():
+        lat = entry.pop("_lat")
+        entry["latency_ms"] = ({"median": round(statistics.median(lat), 4), "max": round(max(lat), 4),
+                                "total": round(sum(lat), 4)} if lat else {})
+        entry["cases_per_s"] = round(len(lat) / (sum(lat) / 1000), 1) if lat and sum(lat) > 0 else None
+    return {
+        "generated": datetime.datetime.now().isoformat(timespec='seconds'),
+        "python": platform.python_version(),
+        "repeat": repeat,
+        "summary": {"total": len(results), **totals, "ok": totals["fail"] == 0 and totals["error"] == 0},
+        "strategies": by_strategy,
+        "cases": [r.to_dict() for r in results],
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--root", default=VALIDATION_ROOT, help="папка с валидационными данными")
+    ap.add_argument("--report", default="replay_report.json", help="путь к JSON-отчёту")
+    ap.add_argument("--repeat", type=int, default=1, help="повторов расчёта на случай (для времени)")
+    ap.add_argument("--strategy", action="append", choices=sorted(STRATEGIES), help="только эти стратегии")
+    args = ap.parse_args(argv)
+
+    cases = discover_cases(args.root, args.strategy)
+    results = ReplayRunner(args.repeat).run(cases)
+    report = build_report(results, args.repeat)
+    with open(args.report, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print(f"{'Стратегия':<22} | {'случаев':<7} | {'pass':<5} | {'fail':<5} | {'error':<5} | {'xfail':<5} | "
+          f"{'медиана, мс':<11}")
+    print("=" * 80)
+    for name, s in report["strategies"].items():
+        print(f"{name:<22} | {s['cases']:<7} | {s['pass']:<5} | {s['fail']:<5} | {s['error']:<5} | {s['xfail']:<5} | "
+              f"{s['latency_ms'].get('median', 0):<11.3f}")
+    for r in results:
+        if r.status in ("fail", "error", "xpass"):
+            bad = r.error or ", ".join(f"{c['path']}: {c['actual']} != {c['expected']}" for c in r.checks if not c["ok"])
+            print(f"{r.status.upper()}: {r.case.name}: {bad}", file=sys.stderr)
+    print(f"\nОтчёт: {args.report}")
+    return 0 if report["summary"]["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк выгрузки DBF-базы BALANCE: индексы NAME -> записи против линейных просмотров.
+
+Строит синтетическую базу (dbf_synth.make_legacy_db, по умолчанию 300 объектов
+по 20 кривых — ~24 000 записей TEPT) во временной папке, читает таблицы один раз
+и выгружает все объекты двумя способами:
+
+* прежний алгоритм (_extract_scan): на каждый объект просмотр TEPO, дважды TEPP
+  и TEPW, каждой связанной таблицы и всей TEPT для группировки;
+* extract_object по LegacyTables (индексы строятся один раз, извлечение объекта
+  пропорционально числу его записей).
+
+Результаты обоих способов сравниваются. Отдельно замеряются время и пиковая
+память (tracemalloc) чтения TEPT: list(DBF) из OrderedDict против потокового
+TeptCurves.read с упакованными значениями, — и разбор всех групп TEPT в кривые:
+прежний списками против векторного CURVE_PARSER (без кеша и с кешем).
+
+Запуск:  python validation_data/scripts/bench_dbf_export.py [-n 300] [-c 20]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from dbf_synth import make_legacy_db  # noqa: E402
+from read_dbf_for_zone_json import (CURVE_3D_TYPES, CURVE_SHARED_X_TYPES, RELATED_FIELDS,  # noqa: E402
+                                    CURVE_PARSER, LegacyTables, TeptCurves, extract_object, read_dbf)
+
+
+def _clean(record, fields):
+    """Значения числовых полей записи без пустых и нулевых."""
+    raw_vals = [record.get(f) for f in fields]
+    return [v for v in raw_vals if v is not None and v != 0]
+
+
+def _build_curves(name, rows, from_tepw):
+    """Прежний разбор группы TEPT списками: rows = [(NAMU, значения без пустых и нулевых)]."""
+    first_namu = rows[0][0].strip()
+    matrix_values = [values for _, values in rows]
+    if from_tepw or first_namu in CURVE_3D_TYPES:
+        return [{"NAME": name,
+                 "X": matrix_values[0] if len(matrix_values) > 0 else [],
+                 "Y": matrix_values[1] if len(matrix_values) > 1 else [],
+                 "Z": matrix_values[2:] if len(matrix_values) > 2 else []}]
+    if first_namu in CURVE_SHARED_X_TYPES:
+        return [{"NAME": y_namu.strip(), "X": matrix_values[0], "Y": y_vals}
+                for y_namu, y_vals in rows[1:] if y_namu.strip()]
+    if len(matrix_values) == 2:
+        return [{"NAME": name, "X": matrix_values[0], "Y": matrix_values[1]}]
+    if len(matrix_values) == 4:
+        x_part1, y_part1, x_part2, y_part2 = matrix_values
+        return [{"NAME": name, "X": x_part1 + x_part2[1:], "Y": y_part1 + y_part2[1:]}]
+    return [{"NAME": name.strip(), "NAMU": namu, "tab": values} for namu, values in rows] if name.strip() else []
+
+
+def _extract_scan(tables, tept_fields, selected_object):
+    """Прежнее извлечение объекта линейными просмотрами таблиц (эталон для сравнения)."""
+    rec = next(r for r in tables['TEPO'] if r.get('NAME') == selected_object)
+    related_names = {tbl: rec.get(field, '') for tbl, field in RELATED_FIELDS.items()}
+    body = {"TEPO": dict(rec), "TEPP": [], "TEPR": [], "TEPS": [], "TEPW": [], "TEPT": []}
+    for tbl in ['TEPP', 'TEPR', 'TEPS', 'TEPW']:
+        key = related_names.get(tbl)
+        if key:
+            body[tbl] = [dict(r) for r in tables[tbl] if r.get('NAME') == key]
+
+    tepp_target_names, tepw_target_names = set(), set()
+    if related_names['TEPP']:
+        for r in [r for r in tables['TEPP'] if r.get('NAME') == related_names['TEPP']]:
+            for nm in (r.get('NAMET'), r.get('NAMED')):
+                if nm and str(nm).strip():
+                    tepp_target_names.add(nm)
+    if related_names['TEPW']:
+        for r in [r for r in tables['TEPW'] if r.get('NAME') == related_names['TEPW']]:
+            for nm in (r.get('NAME'), r.get('NAMET')):
+                if nm and str(nm).strip():
+                    tepw_target_names.add(nm)
+    all_target_names = tepp_target_names | tepw_target_names
+
+    grouped_tept = defaultdict(list)
+    for r in tables['TEPT']:
+        if r.get('NAME') in all_target_names:
+            grouped_tept[r.get('NAME')].append(r)
+    for name, records in grouped_tept.items():
+        rows = [(r.get('NAMU', ''), _clean(r, tept_fields)) for r in records]
+        body['TEPT'].extend(_build_curves(name, rows, from_tepw=name in tepw_target_names))
+    return {selected_object: body}
+
+
+def measure(func, *args):
+    """(результат, время в с, пиковая память в МБ)."""
+    t0 = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - t0
+    tracemalloc.start()
+    result = func(*args)
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("-n", type=int, default=300, help="число объектов TEPO (по умолчанию 300)")
+    ap.add_argument("-c", type=int, default=20, help="кривых TEPP на объект (по умолчанию 20)")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        n_tept = make_legacy_db(tmp, n_objects=args.n, curves_per_object=args.c)
+        print(f"Синтетическая база: {args.n} объектов, {n_tept} записей TEPT ({time.perf_counter() - t0:.2f} с)")
+
+        tept_path = os.path.join(tmp, "TEPT.DBF")
+        (tept_records, fields), t_list, m_list = measure(read_dbf, tept_path)
+        tept, t_stream, m_stream = measure(TeptCurves.read, tept_path)
+        print(f"{'Чтение TEPT':<28} | {'время, с':<9} | {'пик памяти, МБ':<14}")
+        print("=" * 57)
+        print(f"{'list(DBF), OrderedDict':<28} | {t_list:<9.2f} | {m_list:<14.1f}")
+        print(f"{'TeptCurves.read (поток)':<28} | {t_stream:<9.2f} | {m_stream:<14.1f}\n")
+
+        tables = {tbl: read_dbf(os.path.join(tmp, f"{tbl}.DBF"))[0] for tbl in ['TEPO', 'TEPP', 'TEPR', 'TEPS', 'TEPW']}
+        names = [r['NAME'] for r in tables['TEPO']]
+        tept_fields = [f for f in fields if f not in ('NAME', 'NAMU')]
+
+        t0 = time.perf_counter()
+        scanned = [_extract_scan(dict(tables, TEPT=tept_records), tept_fields, name) for name in names]
+        t_scan = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        legacy = LegacyTables(tables, tept)
+        t_index = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        indexed = [extract_object(legacy, name) for name in names]
+        t_extract = time.perf_counter() - t0
+
+        groups = defaultdict(list)
+        for r in tept_records:
+            groups[r.get('NAME')].append(r)
+        t0 = time.perf_counter()
+        for name, records in groups.items():
+            _build_curves(name, [(r.get('NAMU', ''), _clean(r, tept_fields)) for r in records], False)
+        t_lists = time.perf_counter() - t0
+        CURVE_PARSER.clear()
+        t_parse = []
+        for _ in range(2):
+            t0 = time.perf_counter()
+            for name in groups:
+                tept.curves(name)
+            t_parse.append(time.perf_counter() - t0)
+
+    print(f"{'Способ':<28} | {'всего, с':<9} | {'на объект, мс':<13}")
+    print("=" * 56)
+    print(f"{'линейные просмотры':<28} | {t_scan:<9.2f} | {t_scan / len(names) * 1e3:<13.2f}")
+    print(f"{'индексы (построение)':<28} | {t_index:<9.2f} |")
+    print(f"{'индексы (извлечение)':<28} | {t_extract:<9.2f} | {t_extract / len(names) * 1e3:<13.2f}")
+    print(f"\nУскорение с учётом построения индексов: x{t_scan / (t_index + t_extract):.1f}")
+    print("Результаты совпадают" if scanned == indexed else "ВНИМАНИЕ: результаты различаются")
+
+    print(f"\n{'Разбор ' + str(len(groups)) + ' групп TEPT':<28} | {'всего, мс':<9}")
+    print("=" * 40)
+    print(f"{'списки (прежний)':<28} | {t_lists * 1e3:<9.1f}")
+    print(f"{'NumPy, без кеша':<28} | {t_parse[0] * 1e3:<9.1f}")
+    print(f"{'NumPy, из кеша':<28} | {t_parse[1] * 1e3:<9.1f}")
+
+
+if __name__ == "__main__":
+    main()
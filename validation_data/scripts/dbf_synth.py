@@ -0,0 +1,95 @@
+"""
+Синтетическая DBF-база BALANCE для тестов и бенчмарков выгрузки.
+
+write_dbf пишет минимальный dBase III (поля C и N), которого достаточно для
+dbfread; make_legacy_db строит набор TEPO/TEPP/TEPR/TEPS/TEPT/TEPW с заданным
+числом объектов и кривых всех типов (2D из 2 и 4 строк, shared X, 3D).
+"""
+
+import os
+import random
+import struct
+
+TEPT_VALUE_FIELDS = [f"V{i}" for i in range(1, 21)]
+
+
+def write_dbf(path, fields, records, encoding="cp866"):
+    """Записывает DBF: fields = [(имя, 'C'|'N', длина, знаков после запятой)], records — словари."""
+    record_len = 1 + sum(f[2] for f in fields)
+    header_len = 32 + 32 * len(fields) + 1
+    with open(path, "wb") as f:
+        f.write(struct.pack("<BBBBIHH20x", 0x03, 124, 1, 1, len(records), header_len, record_len))
+        for name, ftype, length, decimals in fields:
+            f.write(struct.pack("<11sc4xBB14x", name.encode("ascii"), ftype.encode("ascii"), length, decimals))
+        f.write(b"\r")
+        for rec in records:
+            f.write(b" ")
+            for name, ftype, length, decimals in fields:
+                value = rec.get(name)
+                if ftype == "N":
+                    text = "" if value is None else f"{value:.{decimals}f}"
+                    f.write(text.rjust(length).encode("ascii"))
+                else:
+                    f.write(str(value or "").ljust(length).encode(encoding))
+        f.write(b"\x1a")
+
+
+def _row(name, namu, values, fields):
+    row = {"NAME": name, "NAMU": namu}
+    row.update(zip(fields, values))
+    return row
+
+
+def make_legacy_db(folder, n_objects=300, curves_per_object=20, points=12, seed=1):
+    """
+    Строит синтетическую базу в folder. Каждый объект ссылается на curves_per_object
+    кривых TEPP и одну 3D-кривую TEPW; записи TEPT разных объектов перемешаны.
+
+    :return: число записей TEPT.
+    """
+    rnd = random.Random(seed)
+    fields = TEPT_VALUE_FIELDS
+    os.makedirs(folder, exist_ok=True)
+
+    def vals(k):
+        return [round(rnd.uniform(0.1, 100.0), 4) for _ in range(k)]
+
+    tepo, tepp, tepr, teps, tepw, groups = [], [], [], [], [], []
+    for i in range(n_objects):
+        obj = f"OBJ{i:04d}"
+        tepo.append({"NAME": obj, "NAMEP": f"P{i:04d}", "NAMER": f"R{i:04d}", "NAMEW": f"W{i:04d}",
+                     "NAMES": f"S{i % 10:04d}", "KIND": i % 7})
+        tepr.append({"NAME": f"R{i:04d}", "R": rnd.uniform(0, 10)})
+        tepw.append({"NAME": f"W{i:04d}", "NAMET": ""})
+        groups.append([_row(f"W{i:04d}", "", vals(points), fields) for _ in range(4)])
+        for j in range(curves_per_object):
+            curve = f"T{i:04d}{j:03d}"
+            tepp.append({"NAME": f"P{i:04d}", "NAMET": curve, "NAMED": "", "EK": rnd.uniform(0.7, 0.9)})
+            kind = j % 4
+            if kind == 0:
+                rows = [_row(curve, "", vals(points), fields) for _ in range(2)]
+            elif kind == 1:
+                rows = [_row(curve, "", vals(points), fields) for _ in range(4)]
+            elif kind == 2:
+                rows = [_row(curve, "U", vals(points), fields)]
+                rows += [_row(curve, f"{curve[-4:]}{k}", vals(points), fields) for k in range(3)]
+            else:
+                rows = [_row(curve, "К", vals(points), fields) for _ in range(5)]
+            groups.append(rows)
+    for i in range(10):
+        teps.append({"NAME": f"S{i:04d}", "S": float(i)})
+    rnd.shuffle(groups)
+    tept = [row for rows in groups for row in rows]
+
+    c, n = (lambda size: ("C", size, 0)), (lambda size, dec: ("N", size, dec))
+    write_dbf(os.path.join(folder, "TEPO.DBF"),
+              [("NAME", *c(10)), ("NAMEP", *c(10)), ("NAMER", *c(10)), ("NAMEW", *c(10)), ("NAMES", *c(10)),
+               ("KIND", *n(4, 0))], tepo)
+    write_dbf(os.path.join(folder, "TEPP.DBF"),
+              [("NAME", *c(10)), ("NAMET", *c(10)), ("NAMED", *c(10)), ("EK", *n(8, 3))], tepp)
+    write_dbf(os.path.join(folder, "TEPR.DBF"), [("NAME", *c(10)), ("R", *n(8, 2))], tepr)
+    write_dbf(os.path.join(folder, "TEPS.DBF"), [("NAME", *c(10)), ("S", *n(8, 2))], teps)
+    write_dbf(os.path.join(folder, "TEPW.DBF"), [("NAME", *c(10)), ("NAMET", *c(10))], tepw)
+    write_dbf(os.path.join(folder, "TEPT.DBF"),
+              [("NAME", *c(10)), ("NAMU", *c(8))] + [(f, *n(12, 4)) for f in fields], tept)
+    return len(tept)
@@ -1,9 +1,73 @@
-from dbfread import DBF
+"""
+Выгрузка объектов из DBF-базы BALANCE (TEPO/TEPP/TEPR/TEPS/TEPT/TEPW) в JSON.
+
+Без аргументов работает как раньше: список объектов TEPO и интерактивный выбор
+одного объекта. Пакетный режим читает каждую DBF один раз, строит индексы
+NAME -> записи и выгружает все (или перечисленные) объекты за один проход,
+при -j > 1 — параллельно в пуле процессов. Кривые TEPT читаются потоком
+(TeptCurves): из каждой записи берутся только NAME, NAMU и числовые поля, значения
+складываются в один упакованный массив float, а не в список OrderedDict.
+Разбор групп TEPT в кривые (classify_group, strip_rows, parse_group) векторный
+и кешируется по содержимому группы в общем CURVE_PARSER; object_curves отдаёт
+кривые объекта массивами NumPy для расчётов без промежуточного JSON.
+
+
+    python read_dbf_for_zone_json.py --all [--dbf-folder DIR] [--out DIR] [-j 4]
+    python read_dbf_for_zone_json.py --objects OBJ1 OBJ2
+
+--format npy (или both) пишет вместо JSON (или вместе с ним) компактную пару:
+OBJ.npy — все значения кривых TEPT подряд одним массивом float64 — и
+OBJ.index.json — записи TEPO/TEPP/TEPR/TEPS/TEPW и срезы [смещение, длина]
+каждой кривой. load_curve_pack отображает .npy в память (mmap) и возвращает
+кривые как представления numpy без копирования.
+
+--incremental ведёт в папке выгрузки манифест export_manifest.json (размер, mtime
+и sha256 каждой DBF, дайджест исходных записей и хеши файлов каждого объекта) и
+выгружает заново только объекты, чьи записи изменились; если DBF не менялись и
+выгрузка цела, таблицы даже не читаются.
+"""
+
+from dbfread import DBF, FieldParser
+import argparse
 import os
 import json
 import datetime
 import decimal
+import hashlib
+import math
+import sys
+from array import array
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+DBF_FOLDER = r"C:/Data_BALANCE"
+
+# --- НАСТРОЙКИ ТИПОВ КРИВЫХ ---
+
+# Тип 1: Явные 3D кривые (по NAMU)
+# C, P, K (лат) и С, К, Р (кир)
+CURVE_3D_TYPES = ['C', 'P', 'K', 'С', 'К', 'Р']
+
+# Тип 2: Общая ось X (Shared X)
+# U (лат)
+CURVE_SHARED_X_TYPES = ['U']
+
+REQUIRED_FILES = ['TEPO.DBF', 'TEPP.DBF', 'TEPR.DBF',
+                  'TEPS.DBF', 'TEPT.DBF', 'TEPW.DBF']
+
+# Поле TEPO со ссылкой на NAME связанной таблицы
+RELATED_FIELDS = {'TEPP': 'NAMEP', 'TEPR': 'NAMER', 'TEPW': 'NAMEW', 'TEPS': 'NAMES'}
+
+EXPORT_FORMATS = ('json', 'npy', 'both')
+
+MANIFEST_FILE = 'export_manifest.json'
+# Меняется при изменении формата выгрузки — манифест прежней версии игнорируется
+MANIFEST_VERSION = 1
+
+# Числовые типы полей DBF, которые попадают в кривые TEPT
+NUMERIC_FIELD_TYPES = ('N', 'F', 'I', 'O', 'Y')
 
 
 def default_serializer(obj):
@@ -15,37 +79,723 @@ def default_serializer(obj):
     raise TypeError(f"Type {type(obj)} not serializable")
 
 
-def load_dbf_data():
-    """Загружает связанные DBF-файлы и сохраняет результат в JSON."""
-    dbf_folder = r"C:/Data_BALANCE"
+def read_dbf(path):
+    """Читает DBF целиком (cp866, при ошибке декодирования — cp1251). Возвращает (записи, имена полей)."""
+    try:
+        dbf = DBF(path, encoding='cp866')
+        return list(dbf), [f.name for f in dbf.fields]
+    except UnicodeDecodeError:
+        dbf = DBF(path, encoding='cp1251')
+        return list(dbf), [f.name for f in dbf.fields]
+
+
+def index_by_name(records):
+    """NAME -> список записей в исходном порядке (важен для семантики строк X/Y/Z)."""
+    index = defaultdict(list)
+    for rec in records:
+        index[rec.get('NAME')].append(rec)
+    return dict(index)
+
+
+class TeptCurves:
+    """
+    Таблица TEPT в упакованном виде: значения числовых полей всех записей подряд
+    в одном array('d') (пустое поле — NaN), NAMU по записям и индекс NAME -> номера
+    записей в исходном порядке (важен для семантики строк X/Y/Z).
+
+    :ivar fields: числовые поля TEPT (кроме NAME и NAMU) в порядке таблицы.
+    :ivar order: {NAME: номер первой записи} — порядок кривых в выгрузке.
+    """
+
+    def __init__(self, fields=(), int_fields=()):
+        self.fields = list(fields)
+        self.int_fields = np.array(tuple(int_fields) or (False,) * len(self.fields), dtype=bool)
+        self.values = array('d')
+        self.namu = []
+        self.order = {}
+        self._rows = {}
+        self._digests = {}
+        self._packs = {}
+        self._digest_salt = repr((self.fields, self.int_fields.tolist())).encode('utf-8')
+        self._stripped = None
+
+    def __len__(self):
+        return len(self.namu)
+
+    def append(self, name, namu, values):
+        row = len(self.namu)
+        self.values.extend(values)
+        self.namu.append(sys.intern(namu or ''))
+        rows = self._rows.get(name)
+        if rows is None:
+            self._rows[name] = rows = array('l')
+            self.order[name] = row
+        rows.append(row)
+        self._digests.pop(name, None)
+        self._packs.pop(name, None)
+        self._stripped = None
+
+    def _layout(self):
+        """
+        Значения без пустых и нулевых, переложенные по группам: строки каждой группы NAME
+        подряд (в исходном порядке). Строится одним векторным проходом по всей таблице.
+
+        :return: (значения float64 и маска целых (или None) — bytes, границы строк,
+            {NAME: (первая, последняя + 1) строка}); срез bytes — уже собственная копия участка.
+        """
+        if self._stripped is None:
+            order = np.fromiter((row for rows in self._rows.values() for row in rows), dtype=np.intp, count=len(self))
+            pool = np.frombuffer(self.values, dtype=np.float64).reshape(len(self), len(self.fields))
+            flat, bounds, ints = strip_matrix(pool[order], self.int_fields)
+            spans, start = {}, 0
+            for name, rows in self._rows.items():
+                spans[name] = (start, start + len(rows))
+                start += len(rows)
+            self._stripped = (flat.tobytes(), bounds, None if ints is None else ints.tobytes(), spans)
+        return self._stripped
+
+    def _pack(self, name):
+        """
+        Группа NAME одной собственной копией её участка _layout: (NAMU, границы строк от
+        начала группы, значения bytes, маски целых bytes или None). Кортеж — точный ключ
+        кеша разбора, bytes — буфер массивов кривых (_unpack): запись кеша не удерживает
+        таблицу и не дублирует данные группы.
+        """
+        pack = self._packs.get(name)
+        if pack is None:
+            flat, bounds, ints, spans = self._layout()
+            lo, hi = spans.get(name, (0, 0))
+            base, end = bounds[lo], bounds[hi]
+            namu = self.namu
+            pack = (tuple([namu[row] for row in self._rows.get(name, ())]),
+                    tuple([b - base for b in bounds[lo:hi + 1]]),
+                    flat[base * 8:end * 8],
+                    None if ints is None else ints[base:end])
+            self._packs[name] = pack
+        return pack
+
+    def _group(self, name):
+        """(NAMU, строки без пустых и нулевых значений) группы NAME."""
+        return _unpack(self._pack(name))
+
+    def rows(self, name):
+        """Записи NAME: [(NAMU, значения без пустых и нулевых)]; целые поля DBF — int."""
+        namus, rows = self._group(name)
+        return [(namu, values_list(v, ints)) for namu, (v, ints) in zip(namus, rows)]
+
+    def curves(self, name, from_tepw=False, parser=None):
+        """Кривые группы NAME (массивы float64) и маски целых значений; разбор через общий кеш."""
+        if name not in self._rows:
+            return [], None
+        pack = self._pack(name)
+        return (parser or CURVE_PARSER).parse(name, lambda: _unpack(pack), from_tepw, key=pack)
+
+    def digest(self, name):
+        """
+        Дайджест записей NAME (NAMU и значения) для инкрементальной выгрузки. Считается
+        только по запросу: кеш разбора использует сам упакованный участок группы (_pack).
+        """
+        digest = self._digests.get(name)
+        if digest is None:
+            namus, cuts, values, ints = self._pack(name)
+            h = hashlib.blake2b(self._digest_salt, digest_size=16)
+            h.update(f"{chr(0).join(namus)}\1{cuts}\1".encode('utf-8'))
+            h.update(values)
+            if ints is not None:
+                h.update(ints)
+            self._digests[name] = digest = h.hexdigest()
+        return digest
+
+    @classmethod
+    def read(cls, path):
+        """Читает TEPT потоком (cp866, при ошибке декодирования — cp1251)."""
+        try:
+            return cls._read(path, 'cp866')
+        except UnicodeDecodeError:
+            return cls._read(path, 'cp1251')
+
+    @classmethod
+    def _read(cls, path, encoding):
+        # raw=True: dbfread только нарезает запись на байты, разбираем лишь нужные поля
+        dbf = DBF(path, encoding=encoding, raw=True, recfactory=list)
+        parse = FieldParser(dbf).parse
+        pos = {f.name: i for i, f in enumerate(dbf.fields)}
+        if 'NAME' not in pos:
+            return cls()
+        name_field = (pos['NAME'], dbf.fields[pos['NAME']])
+        namu_field = (pos['NAMU'], dbf.fields[pos['NAMU']]) if 'NAMU' in pos else None
+        numeric = [(i, f) for i, f in enumerate(dbf.fields)
+                   if f.name not in ('NAME', 'NAMU') and f.type in NUMERIC_FIELD_TYPES]
+        store = cls([f.name for _, f in numeric],
+                    [f.type == 'I' or (f.type == 'N' and f.decimal_count == 0) for _, f in numeric])
+        nan = math.nan
+        for items in dbf:
+            values = [parse(f, items[i][1]) for i, f in numeric]
+            store.append(parse(name_field[1], items[name_field[0]][1]),
+                         parse(namu_field[1], items[namu_field[0]][1]) if namu_field else '',
+                         [nan if v is None else float(v) for v in values])
+        return store
+
+
+class LegacyTables:
+    """
+    Таблицы DBF-базы, прочитанные один раз, и индексы NAME -> записи.
+
+    :ivar object_names: имена объектов TEPO в порядке таблицы.
+    :ivar index: {таблица: {NAME: [записи]}} для TEPO/TEPP/TEPR/TEPS/TEPW.
+    :ivar tept: кривые TEPT (TeptCurves).
+    """
+
+    def __init__(self, tables, tept):
+        self.object_names = [rec['NAME'] for rec in tables['TEPO'] if 'NAME' in rec]
+        self.index = {tbl: index_by_name(records) for tbl, records in tables.items()}
+        self.tept = tept
+        self._digests = {}
+
+    @property
+    def tept_fields(self):
+        return self.tept.fields
+
+    @property
+    def tept_order(self):
+        return self.tept.order
+
+    @classmethod
+    def load(cls, dbf_folder):
+        if not os.path.exists(dbf_folder):
+            raise FileNotFoundError(f"Папка {dbf_folder} не найдена")
+        for file in REQUIRED_FILES:
+            if not os.path.exists(os.path.join(dbf_folder, file)):
+                raise FileNotFoundError(f"Не найден файл {file}")
+
+        tables = {}
+        tables['TEPO'], _ = read_dbf(os.path.join(dbf_folder, 'TEPO.DBF'))
+        for tbl in ['TEPP', 'TEPR', 'TEPS', 'TEPW']:
+            try:
+                tables[tbl], _ = read_dbf(os.path.join(dbf_folder, f"{tbl}.DBF"))
+            except Exception as e:
+                print(f"Ошибка загрузки {tbl}: {e}")
+                tables[tbl] = []
+        try:
+            tept = TeptCurves.read(os.path.join(dbf_folder, 'TEPT.DBF'))
+        except Exception as e:
+            print(f"Ошибка загрузки TEPT: {e}")
+            tept = TeptCurves()
+        return cls(tables, tept)
 
-    # --- НАСТРОЙКИ ТИПОВ КРИВЫХ ---
+    def records(self, tbl, name):
+        return self.index[tbl].get(name, [])
 
-    # Тип 1: Явные 3D кривые (по NAMU)
-    # C, P, K (лат) и С, К, Р (кир)
-    CURVE_3D_TYPES = ['C', 'P', 'K', 'С', 'К', 'Р']
+    def digest(self, tbl, name):
+        """Дайджест записей NAME таблицы tbl (кешируется)."""
+        key = (tbl, name)
+        if key not in self._digests:
+            if tbl == 'TEPT':
+                self._digests[key] = self.tept.digest(name)
+            else:
+                data = json.dumps(self.records(tbl, name), ensure_ascii=False, default=default_serializer)
+                self._digests[key] = hashlib.blake2b(data.encode('utf-8'), digest_size=16).hexdigest()
+        return self._digests[key]
+
+
+# Типы групп TEPT (classify_group)
+CURVE_XYZ = 'xyz'            # 3D: строка 1 = X, строка 2 = Y, остальные = Z
+CURVE_SHARED_X = 'shared_x'  # семейство: строка 1 = общий X, остальные = Y с именем в NAMU
+CURVE_2D = '2d'              # 2 строки: X, Y
+CURVE_2D_JOINED = '2d_joined'  # 4 строки: X1, Y1, X2, Y2, склеиваются без первой точки второй части
+CURVE_TAB = 'tab'            # нестандартная группа: строки выгружаются как есть
+
+_EMPTY = np.empty(0)
+_EMPTY.flags.writeable = False
+_EMPTY_INTS = np.zeros(0, dtype=bool)
+_EMPTY_INTS.flags.writeable = False
+
+
+def classify_group(first_namu, rows_count, from_tepw=False):
+    """Тип группы TEPT по NAMU первой строки, числу строк и источнику имени."""
+    # ПРИОРИТЕТ 1: Если имя из TEPW - это 3D кривая (X, Y, Z), даже если NAMU пустое
+    if from_tepw or first_namu in CURVE_3D_TYPES:
+        return CURVE_XYZ
+    if first_namu in CURVE_SHARED_X_TYPES:
+        return CURVE_SHARED_X
+    # Универсальная обработка 2 или 4 строки, остальное — fallback
+    return {2: CURVE_2D, 4: CURVE_2D_JOINED}.get(rows_count, CURVE_TAB)
+
+
+def strip_matrix(matrix, int_fields=None):
+    """
+    Отбрасывает пустые (NaN) и нулевые значения матрицы (записи x числовые поля)
+    одной векторной операцией.
+
+    :param int_fields: булев массив «поле DBF целое» (или None).
+    :return: (значения подряд, границы строк [0, ..., n], маска целых значений или None);
+        значения строки i — flat[bounds[i]:bounds[i + 1]]. Массивы только для чтения.
+    """
+    keep = (matrix != 0) & ~np.isnan(matrix)
+    flat = matrix[keep]
+    flat.flags.writeable = False
+    bounds = [0] + np.cumsum(keep.sum(axis=1)).tolist()
+    ints = None
+    if int_fields is not None and int_fields.any():
+        ints = np.broadcast_to(int_fields, matrix.shape)[keep] & (np.mod(flat, 1) == 0)
+        ints.flags.writeable = False
+    return flat, bounds, ints
+
+
+def strip_rows(matrix, int_fields=None):
+    """Строки матрицы без пустых и нулевых значений: [(значения float64, маска целых или None)]."""
+    flat, bounds, ints = strip_matrix(matrix, int_fields)
+    return [(flat[a:b], None if ints is None else ints[a:b]) for a, b in zip(bounds, bounds[1:])]
+
+
+def _join(a, b):
+    """X1 + X2[1:] (значения или маски)."""
+    out = np.concatenate([a, b[1:]])
+    out.flags.writeable = False
+    return out
+
+
+def _build_curves(kind, name, namus, rows, empty):
+    """Кривые группы типа kind по строкам одного вида: значения или маски целых."""
+    if kind == CURVE_XYZ:
+        return [{"NAME": name, "X": rows[0] if rows else empty, "Y": rows[1] if len(rows) > 1 else empty,
+                 "Z": rows[2:]}]
+    if kind == CURVE_SHARED_X:
+        return [{"NAME": namu.strip(), "X": rows[0], "Y": y}
+                for namu, y in zip(namus[1:], rows[1:]) if namu.strip()]
+    if kind == CURVE_2D:
+        return [{"NAME": name, "X": rows[0], "Y": rows[1]}]
+    if kind == CURVE_2D_JOINED:
+        x1, y1, x2, y2 = rows
+        return [{"NAME": name, "X": _join(x1, x2), "Y": _join(y1, y2)}]
+    current_name = name.strip()
+    return [{"NAME": current_name, "NAMU": namu, "tab": row} for namu, row in zip(namus, rows)] \
+        if current_name else []
+
+
+def _unpack(pack):
+    """Упакованная группа (TeptCurves._pack) -> (NAMU, строки) массивами только для чтения поверх её bytes."""
+    namus, cuts, values, ints = pack
+    values = np.frombuffer(values)
+    masks = None if ints is None else np.frombuffer(ints, dtype=bool)
+    return list(namus), [(values[a:b], None if masks is None else masks[a:b]) for a, b in zip(cuts, cuts[1:])]
+
+
+def parse_group(name, namus, rows, from_tepw=False):
+    """
+    Группа TEPT одного NAME -> (кривые, маски целых значений или None).
+
+    :param rows: строки группы из strip_rows: [(значения, маска целых или None)].
+    :return: кривые — словари как в JSON-выгрузке, но X/Y/tab — массивы float64, Z —
+        список массивов; маски повторяют их структуру (для восстановления int при
+        выгрузке). X семейства с общей осью — один и тот же массив у всех его кривых.
+    """
+    kind = classify_group(namus[0].strip() if namus else '', len(rows), from_tepw)
+    curves = _build_curves(kind, name, namus, [values for values, _ in rows], _EMPTY)
+    if not rows or rows[0][1] is None:
+        return curves, None
+    return curves, _build_curves(kind, name, namus, [ints for _, ints in rows], _EMPTY_INTS)
+
+
+class CurveParser:
+    """
+    Общий разборщик групп TEPT с кешем по содержимому группы: одна и та же кривая,
+    на которую ссылаются несколько объектов (или повторные загрузки той же базы),
+    разбирается один раз. Ключ — упакованная группа (TeptCurves._pack): словарь хеширует
+    её bytes один раз, а совпадение проверяется точно, без риска коллизий дайджеста.
+    Результаты общие — массивы только для чтения поверх bytes ключа.
+    """
+
+    def __init__(self, maxsize=65536):
+        self.maxsize = maxsize
+        self.hits = self.misses = 0
+        self._cache = {}
+
+    def parse(self, name, load, from_tepw=False, key=None):
+        """
+        parse_group с кешем; load() -> (namus, rows) вызывается только при промахе.
+        Без key (хешируемое содержимое группы) результат не кешируется.
+        """
+        if key is not None:
+            key = (key, name, bool(from_tepw))
+            parsed = self._cache.pop(key, None)
+            if parsed is not None:
+                self._cache[key] = parsed  # в конец: порядок словаря — порядок использования (LRU)
+                self.hits += 1
+                return parsed
+        self.misses += 1
+        parsed = parse_group(name, *load(), from_tepw)
+        if key is not None:
+            self._cache[key] = parsed
+            if len(self._cache) > self.maxsize:
+                del self._cache[next(iter(self._cache))]
+        return parsed
+
+    def clear(self):
+        self._cache.clear()
+        self.hits = self.misses = 0
+
+
+CURVE_PARSER = CurveParser()
+
+
+def values_list(values, ints=None):
+    """Массив значений -> список для JSON; значения целых полей DBF — int."""
+    out = values.tolist()
+    if ints is not None:
+        for i in np.flatnonzero(ints):
+            out[i] = int(out[i])
+    return out
+
+
+def curves_as_lists(curves, masks=None):
+    """Кривые parse_group -> словари со списками (общий X семейства остаётся общим списком)."""
+    memo = {}
+
+    def conv(values, ints):
+        if id(values) not in memo:
+            memo[id(values)] = values_list(values, ints)
+        return memo[id(values)]
+
+    out = []
+    for i, curve in enumerate(curves):
+        mask = masks[i] if masks is not None else {}
+        entry = {}
+        for k, v in curve.items():
+            if k in ('X', 'Y', 'tab'):
+                entry[k] = conv(v, mask.get(k))
+            elif k == 'Z':
+                entry[k] = [conv(z, mask['Z'][j] if mask else None) for j, z in enumerate(v)]
+            else:
+                entry[k] = v
+        out.append(entry)
+    return out
 
-    # Тип 2: Общая ось X (Shared X)
-    # U (лат)
-    CURVE_SHARED_X_TYPES = ['U']
 
-    # --- Проверяем папку и наличие нужных файлов ----------------------------
-    if not os.path.exists(dbf_folder):
-        raise FileNotFoundError(f"Папка {dbf_folder} не найдена")
+def _object_sources(tables, selected_object):
+    """Запись TEPO объекта и {таблица: NAME связанных записей}."""
+    tepo_records = tables.records('TEPO', selected_object)
+    if not tepo_records:
+        raise ValueError(f"Объект '{selected_object}' не найден")
+    rec = tepo_records[0]
+    return rec, {tbl: rec.get(field, '') for tbl, field in RELATED_FIELDS.items()}
 
-    required_files = ['TEPO.DBF', 'TEPP.DBF', 'TEPR.DBF',
-                      'TEPS.DBF', 'TEPT.DBF', 'TEPW.DBF']
-    for file in required_files:
-        if not os.path.exists(os.path.join(dbf_folder, file)):
-            raise FileNotFoundError(f"Не найден файл {file}")
 
-    # --- Загружаем TEPO (список объектов) -----------------------------------
-    try:
-        tepo_table = DBF(os.path.join(dbf_folder, 'TEPO.DBF'), encoding='cp866')
-    except UnicodeDecodeError:
-        tepo_table = DBF(os.path.join(dbf_folder, 'TEPO.DBF'), encoding='cp1251')
+def _curve_targets(tables, tepp_records, tepw_records):
+    """
+    Имена кривых TEPT объекта в порядке первого появления в TEPT и множество имён
+    из TEPW (они всегда выгружаются как 3D).
+    """
+    tepp_target_names = set()
+    tepw_target_names = set()
+    for r in tepp_records:
+        for nm in (r.get('NAMET'), r.get('NAMED')):
+            if nm and str(nm).strip():
+                tepp_target_names.add(nm)
+    # Из TEPW (Эти всегда считаем 3D)
+    for r in tepw_records:
+        for nm in (r.get('NAME'), r.get('NAMET')):
+            if nm and str(nm).strip():
+                tepw_target_names.add(nm)
+    all_target_names = [nm for nm in tepp_target_names | tepw_target_names if nm in tables.tept_order]
+    all_target_names.sort(key=tables.tept_order.get)
+    return all_target_names, tepw_target_names
+
+
+def _object_targets(tables, related_names):
+    return _curve_targets(tables,
+                          tables.records('TEPP', related_names['TEPP']) if related_names['TEPP'] else [],
+                          tables.records('TEPW', related_names['TEPW']) if related_names['TEPW'] else [])
+
+
+def extract_object(tables, selected_object):
+    """Один объект TEPO со связанными записями и кривыми TEPT: {имя объекта: {...}}."""
+    rec, related_names = _object_sources(tables, selected_object)
+
+    body = {"TEPO": dict(rec), "TEPP": [], "TEPR": [], "TEPS": [], "TEPW": [], "TEPT": []}
+    for tbl in ['TEPP', 'TEPR', 'TEPS', 'TEPW']:
+        key = related_names.get(tbl)
+        if key:
+            body[tbl] = [dict(r) for r in tables.records(tbl, key)]
+
+    # --- Формируем TEPT (в порядке первого появления имени в TEPT) ---------
+    target_names, tepw_target_names = _curve_targets(tables, body['TEPP'], body['TEPW'])
+    tpt_out = []
+    for name in target_names:
+        curves, masks = tables.tept.curves(name, from_tepw=name in tepw_target_names)
+        tpt_out.extend(curves_as_lists(curves, masks))
+    body['TEPT'] = tpt_out
+    return {selected_object: body}
+
+
+def object_curves(tables, selected_object):
+    """Кривые TEPT объекта в виде массивов float64 (для расчётов без промежуточного JSON)."""
+    _, related_names = _object_sources(tables, selected_object)
+    target_names, tepw_target_names = _object_targets(tables, related_names)
+    out = []
+    for name in target_names:
+        out.extend(tables.tept.curves(name, from_tepw=name in tepw_target_names)[0])
+    return out
+
+
+def object_digest(tables, selected_object, fmt='json'):
+    """
+    Дайджест всех исходных записей объекта: запись TEPO, связанные записи TEPP/TEPR/TEPS/TEPW
+    и группы TEPT его кривых. Совпадает, только если выгрузка объекта не изменится.
+    """
+    rec, related_names = _object_sources(tables, selected_object)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{fmt}|{','.join(tables.tept_fields)}|{tables.digest('TEPO', selected_object)}".encode('utf-8'))
+    for tbl in ['TEPP', 'TEPR', 'TEPS', 'TEPW']:
+        key = related_names.get(tbl)
+        h.update(f"|{tbl}:{tables.digest(tbl, key) if key else ''}".encode('utf-8'))
+    target_names, tepw_target_names = _object_targets(tables, related_names)
+    for name in target_names:
+        h.update(f"|{name}:{int(name in tepw_target_names)}:{tables.digest('TEPT', name)}".encode('utf-8'))
+    return h.hexdigest()
+
+
+def save_json(result, json_path):
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2, ensure_ascii=False, default=default_serializer)
 
-    object_names = [rec['NAME'] for rec in tepo_table if 'NAME' in rec]
+
+def save_curve_pack(result, out_dir):
+    """
+    Сохраняет объект в виде OBJ.npy (значения кривых TEPT, float64) + OBJ.index.json.
+
+    В индексе вместо списков значений — срезы [смещение, длина] в OBJ.npy; X семейства
+    с общей осью (U) хранится один раз. Возвращает путь к индексу.
+    """
+    (name, body), = result.items()
+    pool, offsets = array('d'), {}
+
+    def put(values):
+        # curves_as_lists отдаёт один и тот же список X всем кривым семейства U
+        key = id(values)
+        if key not in offsets:
+            offsets[key] = [len(pool), len(values)]
+            pool.extend(values)
+        return offsets[key]
+
+    curves = []
+    for curve in body['TEPT']:
+        entry = {k: v for k, v in curve.items() if k not in ('X', 'Y', 'Z', 'tab')}
+        for k in ('X', 'Y', 'tab'):
+            if k in curve:
+                entry[k] = put(curve[k])
+        if 'Z' in curve:
+            entry['Z'] = [put(row) for row in curve['Z']]
+        curves.append(entry)
+
+    data_file = f"{name}.npy"
+    np.save(os.path.join(out_dir, data_file), np.frombuffer(pool, dtype=np.float64) if pool else np.empty(0))
+    index = {"object": name, "data": data_file, **{k: v for k, v in body.items() if k != 'TEPT'}, "TEPT": curves}
+    index_path = os.path.join(out_dir, f"{name}.index.json")
+    save_json(index, index_path)
+    return index_path
+
+
+def load_curve_pack(index_path):
+    """
+    Загружает объект, сохранённый save_curve_pack: {имя объекта: {...}} как у JSON-выгрузки,
+    но X/Y/tab — одномерные массивы, Z — двумерный массив (или список массивов, если
+    после отбрасывания нулей строки разной длины). Все массивы — представления одного
+    отображённого в память OBJ.npy (только чтение), данные не копируются.
+    """
+    with open(index_path, encoding='utf-8') as f:
+        index = json.load(f)
+    # Представление ndarray над memmap: срезы дешевле, память та же
+    pool = np.load(os.path.join(os.path.dirname(index_path), index['data']), mmap_mode='r').view(np.ndarray)
+
+    def view(ref):
+        offset, length = ref
+        return pool[offset:offset + length]
+
+    curves = []
+    for entry in index['TEPT']:
+        curve = dict(entry)
+        for k in ('X', 'Y', 'tab'):
+            if k in entry:
+                curve[k] = view(entry[k])
+        if 'Z' in entry:
+            rows = entry['Z']
+            width = rows[0][1] if rows else 0
+            contiguous = all(n == width and off == rows[0][0] + i * width for i, (off, n) in enumerate(rows))
+            if contiguous:
+                curve['Z'] = view([rows[0][0] if rows else 0, len(rows) * width]).reshape(len(rows), width)
+            else:
+                curve['Z'] = [view(ref) for ref in rows]
+        curves.append(curve)
+    body = {k: v for k, v in index.items() if k not in ('object', 'data')}
+    body['TEPT'] = curves
+    return {index['object']: body}
+
+
+def output_files(name, fmt='json'):
+    """Имена файлов, которые export_object пишет для объекта в формате fmt."""
+    files = []
+    if fmt in ('npy', 'both'):
+        files += [f"{name}.npy", f"{name}.index.json"]
+    if fmt in ('json', 'both'):
+        files.append(f"{name}.json")
+    return files
+
+
+def export_object(tables, name, out_dir, fmt='json'):
+    """Выгружает объект в out_dir в формате fmt (EXPORT_FORMATS); возвращает путь к JSON или индексу."""
+    result = extract_object(tables, name)
+    path = None
+    if fmt in ('npy', 'both'):
+        path = save_curve_pack(result, out_dir)
+    if fmt in ('json', 'both'):
+        path = os.path.join(out_dir, f"{name}.json")
+        save_json(result, path)
+    return path
+
+
+_WORKER_TABLES = None
+
+
+def _init_worker(tables):
+    global _WORKER_TABLES
+    _WORKER_TABLES = tables
+
+
+def _export_in_worker(name, out_dir, fmt):
+    return export_object(_WORKER_TABLES, name, out_dir, fmt)
+
+
+def export_all(tables, out_dir, names=None, jobs=1, fmt='json'):
+    """
+    Выгружает объекты (по умолчанию все из TEPO) в out_dir.
+
+    :param jobs: число процессов; при jobs > 1 таблицы передаются каждому процессу
+        один раз (initializer), объекты распределяются между процессами.
+    :param fmt: 'json', 'npy' (save_curve_pack) или 'both'.
+    :return: ({имя: путь к JSON}, {имя: текст ошибки}).
+    """
+    names = list(tables.object_names if names is None else names)
+    os.makedirs(out_dir, exist_ok=True)
+    done, failed = {}, {}
+    if jobs > 1 and len(names) > 1:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(tables,)) as pool:
+            futures = {name: pool.submit(_export_in_worker, name, out_dir, fmt) for name in names}
+            for name, fut in futures.items():
+                try:
+                    done[name] = fut.result()
+                except Exception as e:
+                    failed[name] = str(e)
+    else:
+        for name in names:
+            try:
+                done[name] = export_object(tables, name, out_dir, fmt)
+            except Exception as e:
+                failed[name] = str(e)
+    return done, failed
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _fingerprint(path, previous=None):
+    """{size, mtime, sha256}; при тех же размере и mtime хеш берётся из прежнего манифеста."""
+    st = os.stat(path)
+    if previous and previous.get('size') == st.st_size and previous.get('mtime') == st.st_mtime_ns:
+        return dict(previous)
+    return {'size': st.st_size, 'mtime': st.st_mtime_ns, 'sha256': file_sha256(path)}
+
+
+def _outputs_intact(out_dir, outputs):
+    for file, digest in outputs.items():
+        path = os.path.join(out_dir, file)
+        if not os.path.exists(path) or file_sha256(path) != digest:
+            return False
+    return bool(outputs)
+
+
+def load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST_FILE), encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest if manifest.get('version') == MANIFEST_VERSION else {}
+
+
+def save_manifest(out_dir, manifest):
+    path = os.path.join(out_dir, MANIFEST_FILE)
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def export_incremental(dbf_folder, out_dir, names=None, jobs=1, fmt='json', force=False):
+    """
+    Выгружает заново только изменившиеся объекты, сверяясь с манифестом в out_dir.
+
+    Объект пропускается, если дайджест его исходных записей (object_digest) совпадает
+    с манифестом и файлы выгрузки на месте с прежними хешами. Если ни одна DBF не
+    изменилась (размер, mtime или sha256), дайджесты не считаются и таблицы не читаются.
+
+    :return: ({имя: путь}, [пропущенные имена], {имя: текст ошибки}).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = load_manifest(out_dir)
+    if manifest.get('format') != fmt:
+        manifest = {}
+    old_files, old_objects = manifest.get('files', {}), manifest.get('objects', {})
+    files = {file: _fingerprint(os.path.join(dbf_folder, file), old_files.get(file)) for file in REQUIRED_FILES}
+    sources_same = not force and all(
+        old_files.get(file, {}).get('sha256') == fp['sha256'] for file, fp in files.items())
+
+    requested = list(manifest.get('object_names', []) if names is None else names)
+    if sources_same and requested and all(
+            name in old_objects and _outputs_intact(out_dir, old_objects[name]['outputs']) for name in requested):
+        manifest['files'] = files
+        save_manifest(out_dir, manifest)
+        return {}, requested, {}
+
+    tables = LegacyTables.load(dbf_folder)
+    names = list(tables.object_names if names is None else names)
+    objects = {name: entry for name, entry in old_objects.items() if name in tables.object_names}
+    stale, skipped, failed, digests = [], [], {}, {}
+    for name in names:
+        try:
+            digests[name] = object_digest(tables, name, fmt)
+        except Exception as e:
+            failed[name] = str(e)
+            objects.pop(name, None)
+            continue
+        entry = objects.get(name)
+        if not force and entry and entry['sources'] == digests[name] and _outputs_intact(out_dir, entry['outputs']):
+            skipped.append(name)
+        else:
+            stale.append(name)
+
+    done, export_failed = export_all(tables, out_dir, stale, jobs=jobs, fmt=fmt)
+    failed.update(export_failed)
+    for name in done:
+        objects[name] = {'sources': digests[name],
+                         'outputs': {file: file_sha256(os.path.join(out_dir, file))
+                                     for file in output_files(name, fmt)}}
+    for name in export_failed:
+        objects.pop(name, None)
+    save_manifest(out_dir, {'version': MANIFEST_VERSION, 'format': fmt, 'files': files,
+                            'object_names': tables.object_names, 'objects': objects})
+    return done, skipped, failed
+
+
+def load_dbf_data(dbf_folder=DBF_FOLDER):
+    """Интерактивный режим: выбор одного объекта TEPO и сохранение его в JSON."""
+    tables = LegacyTables.load(dbf_folder)
+    object_names = tables.object_names
     if not object_names:
         raise ValueError("В таблице TEPO не найдены объекты")
 
@@ -63,205 +813,50 @@ def load_dbf_data():
         except ValueError:
             print("Введите число")
 
-    # --- Ищем запись в TEPO и связанные имена ------------------------------
-    selected_record = None
-    related_names = {}
-    for rec in tepo_table:
-        if rec.get('NAME') == selected_object:
-            selected_record = dict(rec)
-            related_names = {'TEPP': rec.get('NAMEP', ''),
-                             'TEPR': rec.get('NAMER', ''),
-                             'TEPW': rec.get('NAMEW', ''),
-                             'TEPS': rec.get('NAMES', '')}
-            break
-
-    if not selected_record:
-        raise ValueError(f"Объект '{selected_object}' не найден")
-
-    # --- Результирующий словарь --------------------------------------------
-    result = {
-        selected_object: {
-            "TEPO": selected_record,
-            "TEPP": [], "TEPR": [], "TEPS": [], "TEPW": [], "TEPT": []
-        }
-    }
-
-    # --- Загружаем остальные таблицы ---------------------------------------
-    tables, tpt_field_names = {}, []
-    for tbl in ['TEPP', 'TEPR', 'TEPS', 'TEPT', 'TEPW']:
-        path = os.path.join(dbf_folder, f"{tbl}.DBF")
-        try:
-            try:
-                dbf = DBF(path, encoding='cp866')
-            except UnicodeDecodeError:
-                dbf = DBF(path, encoding='cp1251')
-            tables[tbl] = list(dbf)
-
-            if tbl == 'TEPT':
-                # Все поля, кроме NAME и NAMU
-                tpt_field_names = [f.name for f in dbf.fields
-                                   if f.name not in ('NAME', 'NAMU')]
-
-        except Exception as e:
-            print(f"Ошибка загрузки {tbl}: {e}")
-            tables[tbl] = []
-
-    # --- Заполняем связанные списки (TEPP, TEPR, …) -------------------------
-    for tbl in ['TEPP', 'TEPR', 'TEPS', 'TEPW']:
-        key = related_names.get(tbl)
-        if key:
-            result[selected_object][tbl] = [dict(r) for r in tables[tbl]
-                                            if r.get('NAME') == key]
-
-    # --- Собираем имена для поиска в TEPT, разделяя источники --------------
-    tepp_target_names = set()
-    tepw_target_names = set()
-
-    # 1. Из TEPP
-    if related_names['TEPP']:
-        tepp_records = [r for r in tables['TEPP']
-                        if r.get('NAME') == related_names['TEPP']]
-        for r in tepp_records:
-            nt = r.get('NAMET')
-            nd = r.get('NAMED')
-            if nt and str(nt).strip(): tepp_target_names.add(nt)
-            if nd and str(nd).strip(): tepp_target_names.add(nd)
-
-    # 2. Из TEPW (Эти всегда считаем 3D)
-    if related_names['TEPW']:
-        tepw_records = [r for r in tables['TEPW']
-                        if r.get('NAME') == related_names['TEPW']]
-        for r in tepw_records:
-            nm = r.get('NAME')
-            nt = r.get('NAMET')  # На всякий случай
-            if nm and str(nm).strip(): tepw_target_names.add(nm)
-            if nt and str(nt).strip(): tepw_target_names.add(nt)
-
-    # Объединяем для общей фильтрации при загрузке
-    all_target_names = tepp_target_names | tepw_target_names
-
-    # --- Формируем TEPT -----------------------------------------------------
-    if all_target_names:
-        # 1. Группируем записи TEPT по NAME
-        grouped_tept = defaultdict(list)
-        for rec in tables['TEPT']:
-            rec_name = rec.get('NAME')
-            # Фильтруем пустые и ненужные
-            if rec_name and str(rec_name).strip() and rec_name in all_target_names:
-                grouped_tept[rec_name].append(rec)
-
-        tpt_out = []
-
-        # 2. Обрабатываем группы
-        for name, records in grouped_tept.items():
-            if not records:
-                continue
-
-            # Определяем тип.
-            # ПРИОРИТЕТ 1: Если имя из TEPW - это 3D кривая (X, Y, Z), даже если NAMU пустое
-            is_from_tepw = name in tepw_target_names
-
-            first_namu = records[0].get('NAMU', '').strip()
-
-            if is_from_tepw or first_namu in CURVE_3D_TYPES:
-                # === 3D КРИВЫЕ (Из TEPW или по NAMU C, P, K) ===
-                # Структура: строка 1=X, строка 2=Y, остальные=Z
-
-                matrix_values = []
-                for r in records:
-                    raw_vals = [r.get(f) for f in tpt_field_names]
-                    clean_vals = [v for v in raw_vals if v is not None and v != 0]
-                    matrix_values.append(clean_vals)
-
-                x_vals = matrix_values[0] if len(matrix_values) > 0 else []
-                y_vals = matrix_values[1] if len(matrix_values) > 1 else []
-                z_vals = matrix_values[2:] if len(matrix_values) > 2 else []
-
-                tpt_out.append({
-                    "NAME": name,
-                    "X": x_vals,
-                    "Y": y_vals,
-                    "Z": z_vals
-                })
-
-            elif first_namu in CURVE_SHARED_X_TYPES:
-                # === Shared X (U) ===
-                raw_x = [records[0].get(f) for f in tpt_field_names]
-                x_vals = [v for v in raw_x if v is not None and v != 0]
-
-                for y_row in records[1:]:
-                    raw_y = [y_row.get(f) for f in tpt_field_names]
-                    y_vals = [v for v in raw_y if v is not None and v != 0]
-
-                    y_namu = y_row.get('NAMU', '').strip()
-                    if y_namu:
-                        tpt_out.append({
-                            "NAME": y_namu,
-                            "X": x_vals,
-                            "Y": y_vals
-                        })
-
-            else:
-                # === 2D КРИВЫЕ (Все остальные из TEPP) ===
-                # Универсальная обработка 2 или 4 строки
-
-                matrix_values = []
-                for r in records:
-                    raw_vals = [r.get(f) for f in tpt_field_names]
-                    clean_vals = [v for v in raw_vals if v is not None and v != 0]
-                    matrix_values.append(clean_vals)
-
-                rows_count = len(matrix_values)
-
-                if rows_count == 2:
-                    tpt_out.append({
-                        "NAME": name,
-                        "X": matrix_values[0],
-                        "Y": matrix_values[1]
-                    })
-
-                elif rows_count == 4:
-                    x_part1 = matrix_values[0]
-                    y_part1 = matrix_values[1]
-                    x_part2 = matrix_values[2]
-                    y_part2 = matrix_values[3]
-
-                    full_x = x_part1 + x_part2[1:]
-                    full_y = y_part1 + y_part2[1:]
-
-                    tpt_out.append({
-                        "NAME": name,
-                        "X": full_x,
-                        "Y": full_y
-                    })
-
-                else:
-                    # Fallback для странных случаев (не 2 и не 4 строки, и не 3D)
-                    for r in records:
-                        current_name = r.get('NAME', '').strip()
-                        if current_name:
-                            raw_vals = [r.get(f) for f in tpt_field_names]
-                            tab_vals = [v for v in raw_vals if v is not None and v != 0]
-                            tpt_out.append({
-                                "NAME": current_name,
-                                "NAMU": r.get('NAMU', ''),
-                                "tab": tab_vals
-                            })
-
-        result[selected_object]['TEPT'] = tpt_out
-
-    # --- Сохраняем JSON -----------------------------------------------------
+    result = extract_object(tables, selected_object)
     json_path = os.path.join(dbf_folder, f"{selected_object}.json")
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(result, f, indent=2, ensure_ascii=False, default=default_serializer)
+    save_json(result, json_path)
 
     print(f"\nРезультат сохранён в: {json_path}")
     return result
 
 
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Выгрузка объектов DBF-базы BALANCE в JSON")
+    ap.add_argument("--dbf-folder", default=DBF_FOLDER, help=f"папка с DBF (по умолчанию {DBF_FOLDER})")
+    ap.add_argument("--out", default=None, help="папка для JSON (по умолчанию папка DBF)")
+    sel = ap.add_mutually_exclusive_group()
+    sel.add_argument("--all", action="store_true", help="выгрузить все объекты TEPO")
+    sel.add_argument("--objects", nargs="+", metavar="NAME", help="выгрузить перечисленные объекты")
+    ap.add_argument("-j", "--jobs", type=int, default=1, help="число процессов (по умолчанию 1)")
+    ap.add_argument("--format", choices=EXPORT_FORMATS, default='json',
+                    help="json, npy (OBJ.npy + OBJ.index.json) или both (по умолчанию json)")
+    ap.add_argument("--incremental", action="store_true",
+                    help=f"выгружать только изменившиеся объекты (манифест {MANIFEST_FILE} в папке выгрузки)")
+    ap.add_argument("--force", action="store_true", help="с --incremental: выгрузить всё и обновить манифест")
+    args = ap.parse_args(argv)
+
+    if not (args.all or args.objects):
+        load_dbf_data(args.dbf_folder)
+        return 0
+
+    out_dir = args.out or args.dbf_folder
+    skipped = []
+    if args.incremental:
+        done, skipped, failed = export_incremental(args.dbf_folder, out_dir, args.objects, jobs=args.jobs,
+                                                   fmt=args.format, force=args.force)
+    else:
+        tables = LegacyTables.load(args.dbf_folder)
+        done, failed = export_all(tables, out_dir, args.objects, jobs=args.jobs, fmt=args.format)
+    for name, err in failed.items():
+        print(f"Ошибка: {name}: {err}", file=sys.stderr)
+    print(f"Выгружено объектов: {len(done)}, без изменений: {len(skipped)}, ошибок: {len(failed)}")
+    return 1 if failed else 0
+
+
 if __name__ == "__main__":
     try:
-        load_dbf_data()
+        sys.exit(main())
     except Exception as err:
         import traceback
 